@@ -13,6 +13,10 @@ start_time = time.time()
 ############
 force_run = True #set to True if you want to force all trials to run even if they are up to date.
 solver_method = 'CPLEX'
+build_processes = 1 #number of processes used to generate the independent blocks of the model for each trial. 1 generates the blocks serially.
+solver_threads = None #number of threads the solver can use to solve each trial. None uses the solver default.
+write_model_size = False #set to True to write the size and construction time of each model component (see ModelSize.py).
+write_solution_txt = False #set to True to also write the full solution as text for trials with a full solution (see SolutionDump.py). The solution table is always written.
 
 ########################################
 ##load excel data and experiment data  #
@@ -42,13 +46,13 @@ for row in dataset:
     user_sa = rve.f_process_user_sa(exp_data, row)
 
     ##run AFO
-    model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info = afo.exp(solver_method, user_sa, property, trial_name, trial_description, sinp_defaults, uinp_defaults, pinp_defaults, d_rot_info, cat_propn_s1_ks2)
+    model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info = afo.exp(solver_method, user_sa, property, trial_name, trial_description, sinp_defaults, uinp_defaults, pinp_defaults, d_rot_info, cat_propn_s1_ks2, build_processes, solver_threads)
 
     ##tally trials run for print statements
     run += 1
 
     ##save AFO outputs
-    out.f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info)
+    out.f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info, write_model_size, write_solution_txt)
 
     ##determine expected time to completion - trials left multiplied by average time per trial &time for current loop
     trials_to_go = total_trials - run
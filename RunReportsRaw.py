@@ -4,10 +4,10 @@ import os
 import sys
 import multiprocessing
 import glob
+import shutil
 import time
 
 from lib.AfoLogic import ReportFunctions as rfun, relativeFile
-from lib.AfoLogic import ReportControl as rep
 from lib.RawVersion import LoadExp as exp
 from lib.RawVersion import RawVersionReportExtras as rve
 
@@ -31,21 +31,10 @@ except KeyError:  # in case the experiment is not set up with custom report_run
 report_run = report_run.to_frame()
 report_run = report_run.droplevel(1, axis=1)
 
-def f_report(processor, trials, non_exist_trials):
-
-    ##create empty df that are used to stack reports for each trial
-    stacked_reps = rve.f_create_report_dfs(non_exist_trials)
-
-    ##run reports for each trial and stack with other trials
-    for trial_name in trials:
-        ###run
-        lp_vars, r_vals = rfun.load_pkl(trial_name)
-        reports = rep.f_run_report(lp_vars,r_vals, report_run, trial_name)
-        ###stack
-        stacked_reps = rve.f_concat_reports(stacked_reps, reports, report_run, trial_name)
-
-    ##save to excel
-    rve.f_save_reports(report_run, stacked_reps, processor)
+def f_trial_report(trial_name):
+    '''Run the reports for one trial (only the reports that are not cached from a previous report run). Used by the report workers.'''
+    reports = rve.f_run_trial_reports(trial_name, report_run)
+    return trial_name, reports
 
 
 
@@ -71,36 +60,46 @@ if __name__ == '__main__':
     # report array so that the others can still be run. A list of trials that don't exist is the 'non_exist' sheet in report excel.
     trials, non_exist_trials = rfun.f_errors(trial_outdated,trials)
 
-    ##clear the old report.xlsx
-    reports = relativeFile.find(__file__, "./Output", "Report*.xlsx")
-    for f in glob.glob(reports):
-        os.remove(f)
+    ##clear the old report.xlsx and csv report folder - only the outputs this script writes (see rve.f_save_reports)
+    ## so any other files or folders the user has saved in Output are not touched.
+    ### Report*.xlsx also removes the Report{processor}.xlsx workbooks from older multiprocess report runs.
+    for f in glob.glob(relativeFile.find(__file__, "./Output", "Report*.xlsx")):
+        if os.path.isfile(f):
+            os.remove(f)
+    report_folder = relativeFile.find(__file__, "./Output", "Report")
+    if os.path.isdir(report_folder):
+        shutil.rmtree(report_folder)
 
 
     ##print out the reports being run and number of trials
     print('Number of trials to run: ', len(trials))
     print("The following reports will be run: \n", report_run.index[report_run.loc[:,'Run']])
 
-    ##determine the processor for each report
-    ## the upper limit of number of processes (concurrent trials) based on the memory capacity of this machine
+    ##the upper limit of number of processes (concurrent trials) based on the memory capacity of this machine
     try:
         maximum_processes = int(sys.argv[2])  # reads in as string so need to convert to int, the script path is the first value hence take the second.
     except IndexError:  # in case no arg passed to python
         maximum_processes = 1
 
-    ##start multiprocessing
+    ##create empty df that are used to stack reports for each trial
+    stacked_reps = rve.f_create_report_dfs(non_exist_trials)
+
+    ##run reports for each trial and stack with other trials
     ### number of agents (processes) should be min of the num of cpus, number of trials or the user specified limit due to memory capacity
+    ### each agent takes one trial at a time from the queue (so a slow trial doesn't hold up the others) and returns
+    ### the reports to this process which stacks them and writes a single report (so XlCombine is not required).
     agents = min(multiprocessing.cpu_count(), len(trials), maximum_processes)
-    ###set up dataset for f_report
-    args = []
-    for agent in list(range(agents)):
-        start_trial = int(len(trials)/agents * agent)
-        end_trial = int(len(trials)/agents * (agent+1))
-        process_trials = trials[start_trial:end_trial]
-        arg = [agent,process_trials, non_exist_trials]
-        args.append(arg)
-    with multiprocessing.Pool(processes=agents) as pool:
-        pool.starmap(f_report, args)
+    if agents > 1:
+        with multiprocessing.Pool(processes=agents) as pool:
+            for trial_name, reports in pool.imap(f_trial_report, trials, chunksize=1): #imap returns the trials in order
+                stacked_reps = rve.f_concat_reports(stacked_reps, reports, report_run, trial_name)
+    else:
+        for trial_name in trials:
+            trial_name, reports = f_trial_report(trial_name)
+            stacked_reps = rve.f_concat_reports(stacked_reps, reports, report_run, trial_name)
+
+    ##save to excel
+    rve.f_save_reports(report_run, stacked_reps, "")
 
     end = time.time()
     # print("Reports successfully completed")
@@ -52,13 +52,123 @@ from . import CropGrazingPyomo as cgzpy
 from . import SeasonPyomo as zgenpy
 from . import FeedSupplyStock as fsstk
 from . import SaltbushPyomo as slppy
+from . import ModelSize as msize
+
+
+#########################
+#precalcs               #
+#########################
+##blocks of the model that can be generated at the same time. The blocks in the second stage use the nv dict which is
+## populated by the stock block, so they can only start once the first stage is complete. Within a stage the blocks
+## are called in the same order as a serial build. In a parallel build the last block of each stage is generated in the main process.
+precalc_stages = [['zgen', 'rot', 'crop', 'mach', 'fin', 'labfx', 'lab', 'crplab', 'stock'],
+                  ['sup', 'crpgrz', 'slp', 'stub', 'pas']]
+
+def f1_precalc_block(block, params, r_vals, nv, pkl_fs_info, cat_propn_s1_ks2):
+    '''
+    Call the precalcs for one block of the model (e.g. pasture or stock).
+
+    This is the unit of work for a parallel build. In a parallel build the block is generated in a worker process
+    and the populated dicts are returned to the main process where they are merged.
+
+    :return: params and r_vals for the block. Plus nv and pkl_fs_info which are only populated by the stock block.
+    '''
+    if block == 'zgen':
+        zgenpy.season_precalcs(params, r_vals)
+    elif block == 'rot':
+        rotpy.rotation_precalcs(params, r_vals)
+    elif block == 'crop':
+        phspy.crop_precalcs(params, r_vals)
+    elif block == 'mach':
+        macpy.mach_precalcs(params, r_vals)
+    elif block == 'fin':
+        finpy.fin_precalcs(params, r_vals)
+    elif block == 'labfx':
+        lfixpy.labfx_precalcs(params, r_vals)
+    elif block == 'lab':
+        labpy.lab_precalcs(params, r_vals)
+    elif block == 'crplab':
+        lphspy.crplab_precalcs(params, r_vals)
+    elif block == 'stock':
+        spy.stock_precalcs(params, r_vals, nv, pkl_fs_info)
+    elif block == 'sup':
+        suppy.sup_precalcs(params, r_vals, nv)
+    elif block == 'crpgrz':
+        cgzpy.cropgraze_precalcs(params, r_vals, nv)
+    elif block == 'slp':
+        slppy.saltbush_precalcs(params, r_vals, nv)
+    elif block == 'stub':
+        stubpy.stub_precalcs(params, r_vals, nv, cat_propn_s1_ks2)
+    elif block == 'pas':
+        paspy.paspyomo_precalcs(params, r_vals, nv)
+    return params, r_vals, nv, pkl_fs_info
+
+def f1_parallel_build_available():
+    '''
+    Check if the model blocks can be generated in worker processes.
+
+    The workers are forked so that they inherit the inputs (including SA) of the current trial. Fork is not available
+    on windows and a process can not be forked from a daemonic process (e.g. when trials are run in a multiprocessing pool).
+    '''
+    return 'fork' in multiprocessing.get_all_start_methods() and not multiprocessing.current_process().daemon
+
+def f1_precalcs(params, r_vals, nv, pkl_fs_info, cat_propn_s1_ks2, build_processes=1):
+    '''
+    Generate the params and r_vals for each block of the model.
+
+    If build_processes is greater than 1 the independent blocks in each stage are generated concurrently in worker
+    processes and merged into params and r_vals. Otherwise (or if parallel building is not available) the blocks
+    are generated serially in the current process.
+
+    Note: only the precalcs are done in parallel. The pyomo components are constructed serially afterwards because
+    pyomo components belong to a single model and can't be merged from a model built in a different process.
+    '''
+    ##serial build
+    if build_processes <= 1 or not f1_parallel_build_available():
+        for stage in precalc_stages:
+            for block in stage:
+                f1_precalc_block(block, params[block], r_vals[block], nv, pkl_fs_info, cat_propn_s1_ks2)
+        return
+
+    ##parallel build - the pool is created (forked) after the trial inputs have been set.
+    ## The last block of each stage is generated in the main process while the workers generate the other blocks.
+    ## This avoids pickling the stock params which are by far the largest.
+    n_processes = min(build_processes - 1, max(len(stage) for stage in precalc_stages) - 1)
+    with multiprocessing.get_context('fork').Pool(processes=n_processes) as pool:
+        for stage in precalc_stages:
+            results = {block: pool.apply_async(f1_precalc_block, (block, {}, {}, nv, {}, cat_propn_s1_ks2))
+                       for block in stage[:-1]}
+            f1_precalc_block(stage[-1], params[stage[-1]], r_vals[stage[-1]], nv, pkl_fs_info, cat_propn_s1_ks2)
+            ##merge - update the existing dicts so references held by the caller remain valid
+            for block in stage[:-1]:
+                block_params, block_r_vals, block_nv, block_pkl_fs_info = results[block].get()
+                params[block].update(block_params)
+                r_vals[block].update(block_r_vals)
+                nv.update(block_nv)
+                pkl_fs_info.update(block_pkl_fs_info)
+
+
+def f1_var_values(model, v):
+    '''
+    Values of a variable {index: value}.
+
+    Variables indexed by the season sequence tree (s_sequence_node) are expanded to every q and s (None for the q/s
+    that are not a node of the tree) so the reports can reshape them the same as the other axes.
+    '''
+    subsets = list(v.index_set().subsets(expand_all_set_operators=False))
+    if subsets[0] is not model.s_sequence_node:
+        return {s: v[s].value for s in v}
+    index = model.s_sequence_year * model.s_sequence
+    for subset in subsets[1:]:
+        index = index * subset
+    return {s: v[s].value if s in v else None for s in index}
 
 
 #########################
 #Exp loop               #
 #########################
 
-def exp(solver_method, user_data, property, trial_name, trial_description, sinp_defaults, uinp_defaults, pinp_defaults, d_rot_info, cat_propn_s1_ks2):
+def exp(solver_method, user_data, property, trial_name, trial_description, sinp_defaults, uinp_defaults, pinp_defaults, d_rot_info, cat_propn_s1_ks2, build_processes=1, solver_threads=None):
 
     ##can use logger to get status on multiprocessing
     # logger.info('Received {}'.format(row))
@@ -128,25 +238,13 @@ def exp(solver_method, user_data, property, trial_name, trial_description, sinp_
 
     ##call precalcs
     precalc_start = time.time()
-    zgenpy.season_precalcs(params['zgen'],r_vals['zgen'])
-    rotpy.rotation_precalcs(params['rot'],r_vals['rot'])
-    phspy.crop_precalcs(params['crop'],r_vals['crop'])
-    macpy.mach_precalcs(params['mach'],r_vals['mach'])
-    finpy.fin_precalcs(params['fin'],r_vals['fin'])
-    lfixpy.labfx_precalcs(params['labfx'],r_vals['labfx'])
-    labpy.lab_precalcs(params['lab'],r_vals['lab'])
-    lphspy.crplab_precalcs(params['crplab'],r_vals['crplab'])
-    spy.stock_precalcs(params['stock'],r_vals['stock'],nv,pkl_fs_info)
-    suppy.sup_precalcs(params['sup'],r_vals['sup'], nv) #sup must be after stock because it uses nv dict which is populated in stock.py
-    cgzpy.cropgraze_precalcs(params['crpgrz'],r_vals['crpgrz'], nv) #cropgraze must be after stock because it uses nv dict which is populated in stock.py
-    slppy.saltbush_precalcs(params['slp'],r_vals['slp'], nv) #saltbush must be after stock because it uses nv dict which is populated in stock.py
-    stubpy.stub_precalcs(params['stub'],r_vals['stub'], nv, cat_propn_s1_ks2) #stub must be after stock because it uses nv dict which is populated in stock.py
-    paspy.paspyomo_precalcs(params['pas'],r_vals['pas'], nv) #pas must be after stock because it uses nv dict which is populated in stock.py
+    f1_precalcs(params, r_vals, nv, pkl_fs_info, cat_propn_s1_ks2, build_processes)
     precalc_end = time.time()
     print(f'{trial_description}, total time for precalcs: {precalc_end - precalc_start:.2f} finished at {time.ctime()}')
 
     ##call core model function, must call them in the correct order (core must be last)
     pyomocalc_start = time.time()
+    msize.f1_start_construction_log() #record the construction time of each component for the model size summary
     model = pe.ConcreteModel() #create pyomo model - done each loop because memory was being leaked when just deleting and re adding the components.
     crtmod.sets(model, nv) #certain sets have to be updated each iteration of exp - has to be first since other modules use the sets
     zgenpy.f1_seasonpyomo_local(params['zgen'], model) #has to be first since builds params used in other modules
@@ -168,12 +266,13 @@ def exp(solver_method, user_data, property, trial_name, trial_description, sinp_
     bndpy.f1_boundarypyomo_local(params, model)
     pyomocalc_end = time.time()
     print(f'{trial_description}, time for localpyomo: {pyomocalc_end - pyomocalc_start:.2f} finished at {time.ctime()}')
-    profit, obj, trial_infeasible = core.coremodel_all(trial_name, model, solver_method, nv)
+    profit, obj, trial_infeasible = core.coremodel_all(trial_name, model, solver_method, nv, solver_threads)
+    msize.f1_stop_construction_log()
     print(f'{trial_description}, time for corepyomo: {time.time() - pyomocalc_end:.2f} finished at {time.ctime()}')
 
     ##build lp_vars
     variables=model.component_objects(pe.Var, active=True)
-    lp_vars = {str(v):{s:v[s].value for s in v} for v in variables}     #creates dict with variable in it. This is tricky since pyomo returns a generator object
+    lp_vars = {str(v):f1_var_values(model, v) for v in variables}     #creates dict with variable in it. This is tricky since pyomo returns a generator object
     ##store profit and obj
     lp_vars['profit'] = profit
     lp_vars['utility'] = obj
@@ -105,7 +105,7 @@ def f1_boundarypyomo_local(params, model):
                     return model.v_phase_area[q, s, p7, z, r, l] >= rot_lobound[r,l]
                 else:
                     return pe.Constraint.Skip
-            model.con_rotation_lobound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_phases, model.s_lmus, model.s_season_types, rule=rot_lo_bound,
+            model.con_rotation_lobound = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_phases, model.s_lmus, model.s_season_types, rule=rot_lo_bound,
                                                     doc='lo bound for the number of each phase')
 
 
@@ -122,7 +122,7 @@ def f1_boundarypyomo_local(params, model):
                     return model.v_slp_ha[q,s,z,l] == slp_area[l]
                 else:
                     return pe.Constraint.Skip
-            model.con_slp_area_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_lmus, rule=slp_area_bound,
+            model.con_slp_area_bound = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_lmus, rule=slp_area_bound,
                                                     doc='bound for the area of salt land pasture on each lmu')
 
 
@@ -138,7 +138,7 @@ def f1_boundarypyomo_local(params, model):
                     return sum(model.v_tonnes_sb_consumed[q,s,z,p6,f,l] for f in model.s_feed_pools) <= sb_max_consumption_p6[p6]
                 else:
                     return pe.Constraint.Skip
-            model.con_sb_upper_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods,
+            model.con_sb_upper_bound = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_feed_periods,
                                                      model.s_lmus, rule=sb_upper_bound, doc='upper bound for livestock sb consumption')
 
 
@@ -150,7 +150,7 @@ def f1_boundarypyomo_local(params, model):
                     for p6 in model.s_feed_periods) >= 115
                 else:
                     return pe.Constraint.Skip
-            model.con_sup_lo_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, rule=sup_lo_bound, doc='lo bound for livestock sup feed')
+            model.con_sup_lo_bound = pe.Constraint(model.s_sequence_node, model.s_season_types, rule=sup_lo_bound, doc='lo bound for livestock sup feed')
 
         ##bound on supplement per dse
         if sup_per_dse_bnd_inc:
@@ -180,7 +180,7 @@ def f1_boundarypyomo_local(params, model):
                     return wg_dse * p_sup_per_dse_bnd == total_sup * 1000
                 else:
                     return pe.Constraint.Skip
-            model.con_sup_per_dse_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, rule=sup_per_dse_bound,
+            model.con_sup_per_dse_bound = pe.Constraint(model.s_sequence_node, rule=sup_per_dse_bound,
                                                 doc='total supplement fed per dse for the whole year')
 
         ##dam lo bound. (the sheep in a given yr equal total for all dvp divided by the number of dvps in 1 yr)
@@ -225,7 +225,7 @@ def f1_boundarypyomo_local(params, model):
                                ) >= model.p_dams_lobound[t,v,z,g1]
                 else:
                     return pe.Constraint.Skip
-            model.con_dams_lobound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_sale_dams
+            model.con_dams_lobound = pe.Constraint(model.s_sequence_node, model.s_sale_dams
                                                    , model.s_dvp_dams, model.s_season_types, model.s_groups_dams
                                                    , rule=f_dam_lobound, doc='min number of dams')
 
@@ -269,7 +269,7 @@ def f1_boundarypyomo_local(params, model):
                                ) <= model.p_dams_upbound[t,v,z,g1]
                 else:
                     return pe.Constraint.Skip
-            model.con_dams_upbound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_sale_dams
+            model.con_dams_upbound = pe.Constraint(model.s_sequence_node, model.s_sale_dams
                                                    , model.s_dvp_dams, model.s_season_types, model.s_groups_dams
                                                    , rule=f_dam_upbound, doc='max number of dams_tv')
 
@@ -318,7 +318,7 @@ def f1_boundarypyomo_local(params, model):
                                ) >= model.p_offs_lobound[k3,t,v,z,x,g3]
                 else:
                     return pe.Constraint.Skip
-            model.con_offs_lobound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_sale_offs
+            model.con_offs_lobound = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_sale_offs
                                                    , model.s_dvp_offs, model.s_season_types, model.s_gender, model.s_groups_offs
                                                    , rule=f_off_lobound, doc='min number of offs')
 
@@ -365,7 +365,7 @@ def f1_boundarypyomo_local(params, model):
                                ) <= model.p_offs_upbound[k3,t,v,z,x,g3]
                 else:
                     return pe.Constraint.Skip
-            model.con_offs_upbound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_sale_offs
+            model.con_offs_upbound = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_sale_offs
                                                    , model.s_dvp_offs, model.s_season_types, model.s_gender, model.s_groups_offs
                                                    , rule=f_off_upbound, doc='max number of offs')
 
@@ -397,7 +397,7 @@ def f1_boundarypyomo_local(params, model):
                                ) <= model.p_prog_upbound[k3,t,x,g2]
                 else:
                     return pe.Constraint.Skip
-            model.con_prog_upbound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs
+            model.con_prog_upbound = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs
                                                    , model.s_sale_prog, model.s_gender, model.s_groups_prog
                                                    , rule=f_prog_upbound, doc='max number of prog')
 
@@ -419,7 +419,7 @@ def f1_boundarypyomo_local(params, model):
                        == total_dams_scanned
                 else:
                     pe.Constraint.Skip
-            model.con_total_dams_scanned = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, rule=f_total_dams_scanned, doc='total dams scanned')
+            model.con_total_dams_scanned = pe.Constraint(model.s_sequence_node, model.s_season_types, rule=f_total_dams_scanned, doc='total dams scanned')
 
         ##force 5yo dam retention - fix a proportion of dams at 6yo scanning dvp.
         ###build bound if turned on
@@ -447,7 +447,7 @@ def f1_boundarypyomo_local(params, model):
                               if pe.value(model.p_mask_dams[k28,t,v,w8,z,g1]) == 1 and v in scan6_v)
                 else:
                     return pe.Constraint.Skip
-            model.con_retention_5yo_dams = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, rule=retention_5yo_dams, doc='force retention of 5yo dams')
+            model.con_retention_5yo_dams = pe.Constraint(model.s_sequence_node, model.s_season_types, rule=retention_5yo_dams, doc='force retention of 5yo dams')
 
         ##bound to fix the proportion of dams being mated - Proportion of mated dams relative to total dams, optimised across the w axis
         ###this bound does not count the number of females that are transferred to offs.
@@ -472,7 +472,7 @@ def f1_boundarypyomo_local(params, model):
                                for a in model.s_wean_times for n in model.s_nut_dams for w8 in model.s_lw_dams
                                for i in model.s_tol for y in model.s_gen_merit_dams
                                if pe.value(model.p_mask_dams[k2,t,v,w8,z,g1]) == 1) * (1 - model.p_prop_dams_mated[v,z,g1])
-            model.con_propn_dams_mated = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dvp_dams, model.s_season_types, model.s_groups_dams, rule=f_propn_dams_mated,
+            model.con_propn_dams_mated = pe.Constraint(model.s_sequence_node, model.s_dvp_dams, model.s_season_types, model.s_groups_dams, rule=f_propn_dams_mated,
                                                        doc='proportion of dams mated')
 
         ##bound to fix the proportion of dams being mated - Proportion fixed optimised across the w axis
@@ -497,7 +497,7 @@ def f1_boundarypyomo_local(params, model):
                                for t in model.s_sale_dams for a in model.s_wean_times for n in model.s_nut_dams
                                for i in model.s_tol for y in model.s_gen_merit_dams
                                if pe.value(model.p_mask_dams[k2,t,v,w8,z,g1]) == 1) * (1 - model.p_prop_dams_mated[v,z,g1])
-            model.con_propn_dams_mated_w = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dvp_dams
+            model.con_propn_dams_mated_w = pe.Constraint(model.s_sequence_node, model.s_dvp_dams
                                                 , model.s_lw_dams, model.s_season_types, model.s_groups_dams
                                                 , rule=f_propn_dams_mated_w, doc='proportion of dams mated with w set')
 
@@ -538,7 +538,7 @@ def f1_boundarypyomo_local(params, model):
                                         ) * (1-model.p_prop_twice_dry_dams[v,z,i,y,g1])
                 else:
                     return pe.Constraint.Skip
-            model.con_propn_drys_sold = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dvp_dams
+            model.con_propn_drys_sold = pe.Constraint(model.s_sequence_node, model.s_dvp_dams
                                                       , model.s_lw_dams, model.s_season_types, model.s_tol
                                                       , model.s_gen_merit_dams, model.s_groups_dams, rule=f_propn_drys_sold
                                                       , doc='proportion of dry dams sold each year')
@@ -570,7 +570,7 @@ def f1_boundarypyomo_local(params, model):
                 else:
                     return pe.Constraint.Skip
 
-            model.con_retention_drys = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dvp_dams, model.s_season_types, model.s_tol, model.s_groups_dams, rule=f_retention_drys,
+            model.con_retention_drys = pe.Constraint(model.s_sequence_node, model.s_dvp_dams, model.s_season_types, model.s_tol, model.s_groups_dams, rule=f_retention_drys,
                                                        doc='force the retention of drys until other dams are sold')
 
         ##SR - this can't set the sr on an actual pasture but it means different pastures provide a different level of carry capacity although nothing fixes sheep to that pasture
@@ -605,7 +605,7 @@ def f1_boundarypyomo_local(params, model):
                     return dse == rhs_dse
                 else:
                     return pe.Constraint.Skip
-            model.con_SR_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, rule=SR_bound,
+            model.con_SR_bound = pe.Constraint(model.s_sequence_node, rule=SR_bound,
                                                 doc='stocking rate bound for each feed period')
 
 
@@ -627,7 +627,7 @@ def f1_boundarypyomo_local(params, model):
                            == landuse_area_bound[k])
                 else:
                     return pe.Constraint.Skip
-            model.con_landuse_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_landuses, model.s_season_types, rule=k_bound, doc='bound on total pasture area')
+            model.con_landuse_bound = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_landuses, model.s_season_types, rule=k_bound, doc='bound on total pasture area')
 
         ##total pasture area - hence also total crop area
         ###build bound if turned on
@@ -643,7 +643,7 @@ def f1_boundarypyomo_local(params, model):
                             == total_pas_area)
                 else:
                     return pe.Constraint.Skip
-            model.con_pas_bound = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, rule=pas_bound,doc='bound on total pasture area')
+            model.con_pas_bound = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_season_types, rule=pas_bound,doc='bound on total pasture area')
 
 
 
@@ -29,14 +29,18 @@ from . import StockPyomo as stkpy
 from . import MVF as mvf
 from . import Sensitivity as sen
 from . import Finance as fin
+from . import Functions as fun
 from . import CropGrazingPyomo as cgzpy
 from . import SaltbushPyomo as slppy
 from . import relativeFile
 
-def coremodel_all(trial_name, model, method, nv):
+def coremodel_all(trial_name, model, method, nv, solver_threads=None):
     '''
     Wraps all of the core model into a function so it can be run multiple times in a loop
 
+    :param solver_threads: number of threads the solver can use. None uses the solver default. For HiGHS more than one
+                           thread also switches on the parallel dual simplex.
+
     Returns
     -------
     None.
@@ -119,13 +123,19 @@ def coremodel_all(trial_name, model, method, nv):
     if method=="CPLEX" and not shutil.which("cplex") == None:
         ##solve with cplex if it exists
         solver = pe.SolverFactory('cplex')
+        if solver_threads:
+            solver.options['threads'] = solver_threads
         solver_result = solver.solve(model, warmstart=True, tee=True)  # tee=True for solver output - may be useful for troubleshooting, currently warmstart doesnt do anything (could only get it to work for MIP)
     elif method=="HiGHS": #todo this doesnt work yet.
         # solver = appsi.solvers.Highs()
         solver = pe.SolverFactory('appsi_highs')
+        if solver_threads:
+            solver.highs_options = {'threads': solver_threads, 'parallel': 'on' if solver_threads > 1 else 'off'}
         solver_result = solver.solve(model)
     elif method=="cbc":
         solver = pe.SolverFactory('cbc')
+        if solver_threads:
+            solver.options['threads'] = solver_threads
         solver_result = solver.solve(model, tee=True) #tee=True will print out solver information
     elif method=="ipopt":
         solver = pe.SolverFactory('ipopt')
@@ -145,7 +155,7 @@ def coremodel_all(trial_name, model, method, nv):
         utility = pe.value(model.utility)
         profit = pe.value(sum((model.v_terminal_wealth[q,s,z,c1] + model.v_minroe[q,s,p7_end,z] + model.v_asset_cost[q,s,p7_end,z])
                                        * model.p_season_prob_qsz[q,s,z] * model.p_prob_c1[c1]
-                                       for q in model.s_sequence_year for s in model.s_sequence for c1 in model.s_c1
+                                       for q, s in model.s_sequence_node for c1 in model.s_c1
                                        for z in model.s_season_types))
     except ValueError:
         utility = 0
@@ -199,7 +209,7 @@ def f_con_labour_fixed_anyone(model):
                    + model.p_super_labour[p,z] + model.p_tax_labour[p,z] + model.p_bas_labour[p,z] <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_fixed_anyone = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['any'],model.s_season_types,
+    model.con_labour_fixed_anyone = pe.Constraint(model.s_sequence_node, model.s_labperiods,['any'],model.s_season_types,
                                                   rule=labour_fixed_casual,
                                                   doc='link between labour supply and requirement by fixed jobs for casual and above')
 
@@ -215,7 +225,7 @@ def f_con_labour_fixed_manager(model):
                         model.p_learn_labour * model.v_learn_allocation[q,s,p]) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_fixed_manager = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['mngr'],model.s_season_types,
+    model.con_labour_fixed_manager = pe.Constraint(model.s_sequence_node, model.s_labperiods,['mngr'],model.s_season_types,
                                                    rule=labour_fixed_manager,
                                                    doc='link between labour supply and requirement by fixed jobs for manager')
 
@@ -231,7 +241,7 @@ def f_con_labour_phase_anyone(model):
                 q,s,p,w,z] + lphspy.f_mach_labour_anyone(model,q,s,p,z) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_crop_anyone = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['any'],model.s_season_types,
+    model.con_labour_crop_anyone = pe.Constraint(model.s_sequence_node, model.s_labperiods,['any'],model.s_season_types,
                                                  rule=labour_crop_anyone,
                                                  doc='link between labour supply and requirement by crop jobs for all labour sources')
 
@@ -247,7 +257,7 @@ def f_con_labour_phase_perm(model):
                 model,q,s,p,z) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_crop_perm = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['perm'],model.s_season_types,rule=labour_crop_perm,
+    model.con_labour_crop_perm = pe.Constraint(model.s_sequence_node, model.s_labperiods,['perm'],model.s_season_types,rule=labour_crop_perm,
                                                doc='link between labour supply and requirement by crop jobs for perm and manager labour sources')
 
 
@@ -262,7 +272,7 @@ def f_con_labour_sheep_anyone(model):
                    model.v_sheep_labour_manager[q,s,p,w,z] + suppy.f_sup_labour(model,q,s,p,z) + stkpy.f_stock_labour_anyone(model,q,s,p,z) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_sheep_anyone = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['any'],model.s_season_types,rule=labour_sheep_cas,
+    model.con_labour_sheep_anyone = pe.Constraint(model.s_sequence_node, model.s_labperiods,['any'],model.s_season_types,rule=labour_sheep_cas,
                                                   doc='link between labour supply and requirement by sheep jobs for all labour sources')
 
 
@@ -277,7 +287,7 @@ def f_con_labour_sheep_perm(model):
                 model,q,s,p,z) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_sheep_perm = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['perm'],model.s_season_types,rule=labour_sheep_perm,
+    model.con_labour_sheep_perm = pe.Constraint(model.s_sequence_node, model.s_labperiods,['perm'],model.s_season_types,rule=labour_sheep_perm,
                                                 doc='link between labour supply and requirement by sheep jobs for perm labour sources')
 
 
@@ -291,7 +301,7 @@ def f_con_labour_sheep_manager(model):
             return - model.v_sheep_labour_manager[q,s,p,w,z] + stkpy.f_stock_labour_manager(model,q,s,p,z) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_sheep_manager = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,['mngr'],model.s_season_types,
+    model.con_labour_sheep_manager = pe.Constraint(model.s_sequence_node, model.s_labperiods,['mngr'],model.s_season_types,
                                                    rule=labour_sheep_manager,
                                                    doc='link between labour supply and requirement by sheep jobs for manager labour sources')
 
@@ -327,7 +337,7 @@ def f_con_harv_stub_nap_cons(model):
                        for f in model.s_feed_pools) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_harv_stub_nap_cons = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods,model.s_season_types,rule=harv_stub_nap_cons,
+    model.con_harv_stub_nap_cons = pe.Constraint(model.s_sequence_node, model.s_feed_periods,model.s_season_types,rule=harv_stub_nap_cons,
                                                  doc='limit stubble and nap consumption in the period harvest occurs')
 
 
@@ -354,7 +364,7 @@ def f_con_harv_stub_nap_cons(model):
 #         else:
 #             return pe.Param.Skip
 #
-#     model.con_cropresidue_a = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_crops, model.s_season_types, rule=cropresidue_a,
+#     model.con_cropresidue_a = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_crops, model.s_season_types, rule=cropresidue_a,
 #                                         doc='Total stubble at harvest. Provides Cat A at harvest.')
 
 
@@ -394,7 +404,7 @@ def f_con_phasesow(model):
             return - sum(model.v_contractseeding_ha[q,s,z,p5,k,l] * model.p_contractseeding_occur[p5,z] * model.p_sow_prov[p7,p5,z,k] for p5 in model.s_labperiods) \
                    - sum(model.v_seeding_machdays[q,s,z,p5,k,l] * model.p_seeding_rate[k,l] * model.p_sow_prov[p7,p5,z,k] for p5 in model.s_labperiods) \
                    + phspy.f_phasesow_req(model,q,s,p7,k,l,z) == 0
-    model.con_phasesow = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_landuses, model.s_lmus,model.s_season_types,rule=sow_link,
+    model.con_phasesow = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_landuses, model.s_lmus,model.s_season_types,rule=sow_link,
                                       doc='link between mach sow provide and rotation crop sow require')
 
 
@@ -415,7 +425,7 @@ def f_con_phasesow(model):
 #         else:
 #             return -model.v_seeding_pas[p5,k,l,z] + paspy.f_passow(model,p5,k,l,z) <= 0
 #
-#     model.con_passow = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods,model.s_landuses,model.s_lmus,model.s_season_types,
+#     model.con_passow = pe.Constraint(model.s_sequence_node, model.s_labperiods,model.s_landuses,model.s_lmus,model.s_season_types,
 #                                      rule=passow_link,doc='link between mach sow provide and rotation pas sow require')
 
 
@@ -425,10 +435,11 @@ def f_con_harv(model):
     farmer labour and machinery or contract services.
     '''
     ##Transfer unharvested grain in case a season node occurs between two harvest periods. The harvest requirement needs to uncluster to the new seasons.
+    l_p7 = list(model.s_season_periods)
+    p7_end = l_p7[-1]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def harv(model,q,s,p7,k,s2,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1]  # need the activity level from last feed period
-        p7_end = l_p7[-1]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last feed period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return (-macpy.f_harv_supply(model,q,s,p7,k,z9)
                     + sum(model.v_use_biomass[q,s,p7,z9,k,l,s2] * model.p_biomass2product[k,l,s2] #adjust with biomass2product because harv dv are based on grain yield not biomass
@@ -439,7 +450,7 @@ def f_con_harv(model):
                     <= 0)
         else:
             return pe.Constraint.Skip
-    model.con_harv = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_crops, ['Harv'], model.s_season_types, rule=harv,doc='harvest constraint')
+    model.con_harv = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_crops, ['Harv'], model.s_season_types, rule=harv,doc='harvest constraint')
 
 
 def f_con_makehay(model):
@@ -448,10 +459,11 @@ def f_con_makehay(model):
     by contract services.
     '''
     ##Transfer unharvested grain in case a season node occurs between two harvest periods. The harvest requirement needs to uncluster to the new seasons.
+    l_p7 = list(model.s_season_periods)
+    p7_end = l_p7[-1]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def hay(model,q,s,p7,s2,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last feed period
-        p7_end = l_p7[-1]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last feed period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return (-model.v_hay_made[q,s,z9] * model.p_hay_made_prov[p7,z9]
                        + sum(model.v_use_biomass[q,s,p7,z9,k,l,s2] * model.p_biomass2product[k,l,s2]
@@ -462,7 +474,7 @@ def f_con_makehay(model):
                    <= 0)
         else:
             return pe.Constraint.Skip
-    model.con_makehay = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, ['Bale'], model.s_season_types,rule=hay,doc='make hay constraint')
+    model.con_makehay = pe.Constraint(model.s_sequence_node, model.s_season_periods, ['Bale'], model.s_season_types,rule=hay,doc='make hay constraint')
 
 
 def f_con_biomass_transfer(model):
@@ -475,11 +487,12 @@ def f_con_biomass_transfer(model):
     ##Must pass between p7 because need to transfer penalties through the season
 
     ##combines rotation yield, on-farm sup feed and yield penalties from untimely sowing and crop grazing. Then passes to cashflow constraint.
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    p7_end = l_p7[-1]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def biomass_transfer(model,q,s,p7,k,l,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last feed period
-        p7_start = l_p7[0]
-        p7_end = l_p7[-1]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last feed period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return -phspy.f_rotation_biomass(model,q,s,p7,k,l,z9) + macpy.f_late_seed_penalty(model,q,s,p7,k,l,z9) \
                    + cgzpy.f_grazecrop_biomass_penalty(model,q,s,p7,k,l,z9) \
@@ -492,7 +505,7 @@ def f_con_biomass_transfer(model):
                    + sum(model.v_use_biomass[q,s,p7,z9,k,l,s2] for s2 in model.s_biomass_uses) * 1000 <= 0
         else:
             return pe.Constraint.Skip
-    model.con_biomass_transfer = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_crops,
+    model.con_biomass_transfer = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_crops,
                                                model.s_lmus, model.s_season_types,rule=biomass_transfer, doc='constrain biomass transfer')
 
 
@@ -515,11 +528,12 @@ def f_con_product_transfer(model):
     ## be in different p7 to harvest
 
     ##combines rotation yield, on-farm sup feed and yield penalties from untimely sowing and crop grazing. Then passes to cashflow constraint.
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    p7_end = l_p7[-1]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def product_transfer(model,q,s,p7,g,k,s2,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last feed period
-        p7_start = l_p7[0]
-        p7_end = l_p7[-1]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last feed period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return -phspy.f_rotation_product(model,q,s,p7,g,k,s2,z9) \
                    + sum(model.v_sup_con[q,s,z9,k,g,f,p6] * model.p_sup_s2[k,s2] * model.p_a_p6_p7[p7,p6,z9] * 1000
@@ -533,7 +547,7 @@ def f_con_product_transfer(model):
                    - model.v_buy_product[q,s,p7,z9,k,s2,g] * model.p_buy_product_prov[p7,z9] * 1000 + model.v_sell_product[q,s,p7,z9,k,s2,g] * 1000 <= 0
         else:
             return pe.Constraint.Skip
-    model.con_product_transfer = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_grain_pools,
+    model.con_product_transfer = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_grain_pools,
                                                model.s_crops,model.s_biomass_uses,model.s_season_types,rule=product_transfer,
                                              doc='constrain grain transfer between rotation and sup feeding')
 
@@ -563,7 +577,7 @@ def f_con_poc_available(model):
                 model.v_poc[q,s,v,f,l,z] for v in model.s_feed_pools) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_poc_available = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods,model.s_lmus,model.s_season_types,rule=poc,
+    model.con_poc_available = pe.Constraint(model.s_sequence_node, model.s_feed_periods,model.s_lmus,model.s_season_types,rule=poc,
                                             doc='constraint between poc available and consumed')
 
 
@@ -581,7 +595,7 @@ def f_con_link_understory_saltbush_consumption(model):
                          for d in model.s_dry_groups) == 0
         else:
             return pe.Constraint.Skip
-    model.con_link_understory_saltbush_consumption = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types,
+    model.con_link_understory_saltbush_consumption = pe.Constraint(model.s_sequence_node, model.s_season_types,
                                                                    model.s_feed_periods,model.s_feed_pools, model.s_lmus,rule=link_us_sb,
                                                                    doc='link between the consumption of understory and saltbush')
 
@@ -598,15 +612,15 @@ def f_con_link_pasture_supplement_consumption(model,nv):
     len_nv = nv['len_nv']
     nv_is_not_confinement_f = np.full(len_nv, True)
     nv_is_not_confinement_f[-1] = np.logical_not(nv['confinement_inc']) #if confinement is included the last nv pool is confinement.
-    l_f = list(model.s_feed_pools)
+    d_f = fun.f1_position_index(list(model.s_feed_pools))[0]
     def link_pas_sup(model,q,s,z,p6,f):
-        f_idx = l_f.index(f)
+        f_idx = d_f[f]
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p6z[p6,z]) and nv_is_not_confinement_f[f_idx] and uinp.supfeed['i_sup_selectivity_included']:
             return - (paspy.f_pas_me2(model,q,s,p6,f,z) + stubpy.f_cropresidue_me(model,q,s,p6,f,z)) * model.p_max_sup_selectivity[p6,z] \
                    + suppy.f_sup_me(model,q,s,p6,f,z) * (1-model.p_max_sup_selectivity[p6,z]) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_link_pasture_supplement_consumption = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types,
+    model.con_link_pasture_supplement_consumption = pe.Constraint(model.s_sequence_node, model.s_season_types,
                                                                    model.s_feed_periods,model.s_feed_pools,rule=link_pas_sup,
                                                                    doc='link between the consumption of paddock feed and supplement when trail feeding.')
 
@@ -634,7 +648,7 @@ def f_con_me(model):
                    + stkpy.f_stock_me(model,q,s,p6,f,z) - mvf.f_mvf_me(model,q,s,p6,f) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_me = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods,model.s_feed_pools,model.s_season_types,rule=me,
+    model.con_me = pe.Constraint(model.s_sequence_node, model.s_feed_periods,model.s_feed_pools,model.s_season_types,rule=me,
                                  doc='constraint between me available and consumed')
 
 
@@ -657,7 +671,7 @@ def f_con_vol(model):
                    + mvf.f_mvf_vol(model,q,s,p6,f) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_vol = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods,model.s_feed_pools,model.s_season_types,rule=vol,
+    model.con_vol = pe.Constraint(model.s_sequence_node, model.s_feed_periods,model.s_feed_pools,model.s_season_types,rule=vol,
                                   doc='constraint between me available and consumed')
 
 
@@ -666,9 +680,11 @@ def f_con_cashflow(model):
     Tallies all cashflow in each period and transfers to the next period. Season periods exist so that a transfer can
     exist between parent and child seasons.
     '''
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def cashflow(model,q,s,c1,p7,z9):
-        p7_start = list(model.s_season_periods)[0]
-        p7_prev = list(model.s_season_periods)[list(model.s_season_periods).index(p7) - 1]  # previous cashperiod - have to convert to a list first because indexing of an ordered set starts at 1
+        p7_prev = d_p7_prev[p7]  # previous cashperiod
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return ((-f1_grain_income(model,q,s,p7,z9,c1) + phspy.f_rotation_cost(model,q,s,p7,z9) + labpy.f_labour_cost(model,q,s,p7,z9)
                     + macpy.f_mach_cost(model,q,s,p7,z9) + suppy.f_sup_cost(model,q,s,p7,z9) + model.p_overhead_cost[p7,z9] + slppy.f_saltbush_cost(model,q,s,z9,p7)
@@ -678,7 +694,7 @@ def f_con_cashflow(model):
                           for z8 in model.s_season_types)) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_cashflow_transfer = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_c1, model.s_season_periods, model.s_season_types,rule=cashflow,
+    model.con_cashflow_transfer = pe.Constraint(model.s_sequence_node, model.s_c1, model.s_season_periods, model.s_season_types,rule=cashflow,
                                                 doc='transfer of cashflow between periods')
 
 def f1_start_asset_value(model,q,s,p7,z):
@@ -710,8 +726,10 @@ def f_con_totalcap_within(model):
     them back after peak debt or in SQ start the following year understocked.
     
      '''
+    l_p7 = list(model.s_season_periods)
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def total_cap_within(model,q,s,c0,p7,z9):
-        p7_prev = list(model.s_season_periods)[list(model.s_season_periods).index(p7) - 1]  # previous cashperiod - have to convert to a list first because indexing of an ordered set starts at 1
+        p7_prev = d_p7_prev[p7]  # previous cashperiod
         if pe.value(model.p_mask_childz_within_season[p7,z9]) and pe.value(model.p_wyear_inc_qs[q,s]):
             return (-f1_grain_wc(model,q,s,c0,p7,z9) + phspy.f_rotation_wc(model,q,s,c0,p7,z9) + labpy.f_labour_wc(model,q,s,c0,p7,z9) + slppy.f_saltbush_wc(model,q,s,z9,c0,p7)
                     + macpy.f_mach_wc(model,q,s,c0,p7,z9) + suppy.f_sup_wc(model,q,s,c0,p7,z9) + model.p_overhead_wc[c0,p7,z9]
@@ -723,7 +741,7 @@ def f_con_totalcap_within(model):
                          for z8 in model.s_season_types)) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_totalcap_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_enterprises, model.s_season_periods, model.s_season_types,rule=total_cap_within,
+    model.con_totalcap_within = pe.Constraint(model.s_sequence_node, model.s_enterprises, model.s_season_periods, model.s_season_types,rule=total_cap_within,
                                        doc='working capital transfer within year')
 
 
@@ -739,9 +757,12 @@ def f_con_totalcap_between(model):
     cashflow became the start then a high expense high income strategy would not trigger the constraint).
 
     '''
+    l_p7 = list(model.s_season_periods)
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def total_cap_between(model,q,s9,c0,p7,z9):
-        p7_prev = list(model.s_season_periods)[list(model.s_season_periods).index(p7) - 1]  # previous cashperiod - have to convert to a list first because indexing of an ordered set starts at 1
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        p7_prev = d_p7_prev[p7]  # previous cashperiod
+        q_prev = d_q_prev[q]
         if pe.value(model.p_mask_childz_between_season[p7,z9]) and pe.value(model.p_wyear_inc_qs[q,s9]):
             return (-f1_grain_wc(model,q,s9,c0,p7,z9) + phspy.f_rotation_wc(model,q,s9,c0,p7,z9) + labpy.f_labour_wc(model,q,s9,c0,p7,z9) + slppy.f_saltbush_wc(model,q,s9,z9,c0,p7)
                     + macpy.f_mach_wc(model,q,s9,c0,p7,z9) + suppy.f_sup_wc(model,q,s9,c0,p7,z9) + model.p_overhead_wc[c0,p7,z9]
@@ -755,16 +776,17 @@ def f_con_totalcap_between(model):
                           for z8 in model.s_season_types for s8 in model.s_sequence if pe.value(model.p_wyear_inc_qs[q_prev,s8])!=0)) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_totalcap_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_enterprises, model.s_season_periods, model.s_season_types,rule=total_cap_between,
+    model.con_totalcap_between = pe.Constraint(model.s_sequence_node, model.s_enterprises, model.s_season_periods, model.s_season_types,rule=total_cap_between,
                                        doc='working capital transfer between years')
 
 
 def f_con_dep(model):
     '''Tallies the depreciation of capital, which is then passed to the objective.'''
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def dep(model,q,s,p7,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last period
-        p7_start = l_p7[0]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return (macpy.f_total_dep(model,q,s,p7,z9) + suppy.f_sup_dep(model,q,s,p7,z9) - model.v_dep[q,s,p7,z9]
                     + sum(model.v_dep[q,s,p7_prev,z8] * model.p_parentz_provwithin_season[p7_prev,z8,z9]
@@ -772,7 +794,7 @@ def f_con_dep(model):
                     <= 0)
         else:
             return pe.Constraint.Skip
-    model.con_dep = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types,rule=dep,
+    model.con_dep = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_season_types,rule=dep,
                                   doc='tallies depreciation from all activities so it can be transferred to objective')
 
 
@@ -780,10 +802,11 @@ def f_con_asset(model):
     '''Tallies the total asset value to ensure that there is a minimum ROI on farm assets. The asset value multiplied
     by opportunity cost on capital is then passed to the objective.
     '''
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def asset_cost(model,q,s,p7,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last period
-        p7_start = l_p7[0]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return (suppy.f_sup_asset(model,q,s,p7,z9) + macpy.f_mach_asset(model,p7) + stkpy.f_stock_asset(model,q,s,p7,z9)) * uinp.finance['opportunity_cost_capital'] \
                    - model.v_asset_cost[q,s,p7,z9] \
@@ -791,16 +814,17 @@ def f_con_asset(model):
                          for z8 in model.s_season_types) * (p7!=p7_start) <= 0 #end doesn't carry over
         else:
             return pe.Constraint.Skip
-    model.con_asset = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types,rule=asset_cost,
+    model.con_asset = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_season_types,rule=asset_cost,
                                     doc='tallies asset from all activities so it can be transferred to objective to represent ROA')
 
 
 def f_con_minroe(model):
     '''Tallies the total expenditure to ensure that there is a minimum ROI on cash expenditure.'''
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #previous p7 - built once rather than l_p7.index() for each row
     def minroe(model,q,s,p7,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last period
-        p7_start = l_p7[0]
+        p7_prev = d_p7_prev[p7]  # need the activity level from last period
         if pe.value(model.p_wyear_inc_qs[q, s]) and pe.value(model.p_mask_season_p7z[p7,z9]):
             return ((phspy.f_rotation_cost(model,q,s,p7,z9) + labpy.f_labour_cost(model,q,s,p7,z9) + macpy.f_mach_cost(model,q,s,p7,z9)
                     + suppy.f_sup_cost(model,q,s,p7,z9) + stkpy.f_stock_cost(model,q,s,p7,z9) + slppy.f_saltbush_cost(model,q,s,z9,p7))
@@ -810,7 +834,7 @@ def f_con_minroe(model):
                           for z8 in model.s_season_types) * (p7 != p7_start)) <= 0  # end doesn't carry over
         else:
             return pe.Constraint.Skip
-    model.con_minroe = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types,rule=minroe,
+    model.con_minroe = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_season_types,rule=minroe,
                                      doc='tallies total expenditure to ensure minimum roe is met')
 
 
@@ -859,19 +883,33 @@ def f_objective(model):
 
     '''
 
+    ##tiny penalty on all variables with positive bounds (ie variables that can be negative e.g. terminal_wealth are excluded).
+    ## This puts a small neg number into the objective which stops cplex selecting variables that don't contribute to
+    ## the objective (cplex selects variables to remove slack on constraints).
+    ## The variables are summed once into v_var_penalty which is then included in each terminal wealth row (rather
+    ## than summing every variable in each row). The penalty can be switched off with SA.
+    inc_var_penalty = fun.f_sa(True, sen.sav['inc_var_penalty'], 5)
+    variables = [v for v in model.component_objects(pe.Var,active=True)
+                 if v._rule_bounds._initializer.val[0] is not None and v._rule_bounds._initializer.val[0]>=0] #note; _rule_bounds.val[0] is the lower bound of each variable
+    model.v_var_penalty = pe.Var(bounds=(0,None), doc='sum of all variables with positive bounds - used to apply a tiny penalty in the objective')
+    def var_penalty(model):
+        if inc_var_penalty:
+            return model.v_var_penalty - pe.quicksum(v[idx] for v in variables for idx in v) == 0
+        else:
+            return model.v_var_penalty == 0
+    model.con_var_penalty = pe.Constraint(rule=var_penalty, doc='tallies all variables with positive bounds so a tiny penalty can be included in the objective.')
+
     ##terminal wealth transfer constraint - combine cashflow with depreciation, MINROE and asset value
-    variables = model.component_objects(pe.Var,active=True)
     p7_end = list(model.s_season_periods)[-1]
     def terminal_wealth(model,q,s,z,c1):
         if pe.value(model.p_wyear_inc_qs[q,s]):
             return (model.v_terminal_wealth[q,s,z,c1] - model.v_credit[q,s,c1,p7_end,z] + model.v_debit[q,s,c1,p7_end,z] # have to include debit otherwise model selects lots of debit to increase credit, hence can't just maximise credit.
                     + model.v_dep[q,s,p7_end,z] + model.v_minroe[q,s,p7_end,z] + model.v_asset_cost[q,s,p7_end,z]
                     - model.v_tradevalue[q, s, p7_end, z]
-                    + 0.00001 * sum(sum(v[idx] for idx in v) for v in variables
-                                       if v._rule_bounds._initializer.val[0] is not None and v._rule_bounds._initializer.val[0]>=0)) <=0 #all variables with positive bounds (ie variables that can be negative e.g. terminal_wealth are excluded) put a small neg number into objective. This stop cplex selecting variables that don't contribute to the objective (cplex selects variables to remove slack on constraints).
-        else:                                                                                                  #note; _rule_bounds.val[0] is the lower bound of each variable
+                    + 0.00001 * model.v_var_penalty) <=0
+        else:
             return pe.Constraint.Skip
-    model.con_terminal_wealth = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_c1, rule=terminal_wealth,
+    model.con_terminal_wealth = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_c1, rule=terminal_wealth,
                                      doc='tallies up terminal wealth so it can be transferred to the utility function.')
 
     ##terminal wealth at each segment
@@ -896,7 +934,7 @@ def f_objective(model):
     p_tw_points = dict(zip(keys_u, tw_points))
     p_utility = dict(zip(keys_u, utility_u))
     model.s_utility_points = pe.Set(initialize=keys_u, doc='utility segments')
-    model.v_utility_points = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_c1, model.s_utility_points, bounds = (0, None), doc = 'propn of utility from each segment')
+    model.v_utility_points = pe.Var(model.s_sequence_node, model.s_season_types, model.s_c1, model.s_utility_points, bounds = (0, None), doc = 'propn of utility from each segment')
     model.p_tw_points = pe.Param(model.s_utility_points, initialize=p_tw_points, default = 0.0, doc='terminal wealth at the beginning of each segment')
     model.p_utility = pe.Param(model.s_utility_points, initialize=p_utility, default = 0.0, doc='utility provided by each level of terminal wealth')
 
@@ -906,7 +944,7 @@ def f_objective(model):
                                                             for u in model.s_utility_points) <=0
         else:
             return pe.Constraint.Skip
-    model.con_terminal_wealth_transfer = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_c1, rule=terminal_wealth_transfer,
+    model.con_terminal_wealth_transfer = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_c1, rule=terminal_wealth_transfer,
                                      doc='transfers terminal wealth to utility')
 
     def utility_propn(model,q,s,z,c1):
@@ -914,13 +952,13 @@ def f_objective(model):
             return sum(model.v_utility_points[q,s,z,c1,u] for u in model.s_utility_points) ==1
         else:
             return pe.Constraint.Skip
-    model.con_utility_segment_propn = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_c1, rule=utility_propn,
+    model.con_utility_segment_propn = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_c1, rule=utility_propn,
                                      doc='ensures terminal wealth points tally to 1. Required to stop utility function being unbounded.')
 
     ##objective function (maximise utility)
     return sum(sum(model.v_utility_points[q,s,z,c1,u] * model.p_utility[u] for u in model.s_utility_points)
                * model.p_season_prob_qsz[q,s,z] * model.p_prob_c1[c1]
-               for q in model.s_sequence_year for s in model.s_sequence for c1 in model.s_c1 for z in model.s_season_types)
+               for q, s in model.s_sequence_node for c1 in model.s_c1 for z in model.s_season_types)
 
 
 
@@ -27,6 +27,8 @@ from . import StructuralInputs as sinp
 from . import PropertyInputs as pinp
 from . import Periods as per
 from . import SeasonalFunctions as zfun
+from . import Sensitivity as sen
+from . import Functions as fun
 
 
 '''
@@ -57,6 +59,17 @@ def sets(model, nv):
     len_s = np.power(len_z, len_q - 1)
     model.s_sequence = Set(initialize=np.array(['s%s' % i for i in range(len_s)]), doc='season sequences')
 
+    ##season sequence tree - the active q,s combinations. Variables and constraints are indexed by the tree nodes
+    ## rather than every q and s so the model only grows with the number of nodes.
+    ## The node indexing can be switched off with SA which builds every q and s (used to check the node indexing
+    ## doesn't change the solution - see SequenceNodeTest.py).
+    inc_node_index = fun.f_sa(True, sen.sav['inc_node_index'], 5)
+    if inc_node_index:
+        l_qs_node = zfun.f_sequence_nodes(keys=True)
+    else:
+        l_qs_node = [(q, s) for q in model.s_sequence_year for s in model.s_sequence]
+    model.s_sequence_node = Set(initialize=l_qs_node, dimen=2, doc='season sequence tree nodes (q, s)')
+
     #######################
     #price                #
     #######################
@@ -10,6 +10,7 @@ import pyomo.environ as pe
 
 # AFO modules
 from . import PropertyInputs as pinp
+from . import Functions as fun
 from . import CropGrazing as cgz
 
 
@@ -30,11 +31,11 @@ def f1_cropgrazepyomo_local(params,model):
     ############
     # variable #
     ############
-    model.v_tonnes_crop_consumed = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_pools, model.s_crops, model.s_feed_periods,
+    model.v_tonnes_crop_consumed = pe.Var(model.s_sequence_node, model.s_feed_pools, model.s_crops, model.s_feed_periods,
                                           model.s_labperiods, model.s_season_types,  model.s_lmus,bounds=(0,None),
                                           doc='tonnes of crop consumed by livestock in a p6 that was sown in a p5 (p5 axis tracks when the crop being grazed was sown)')
 
-    model.v_tonnes_crop_transfer = pe.Var(model.s_sequence_year, model.s_sequence, model.s_crops, model.s_lmus, model.s_feed_periods, model.s_labperiods, model.s_season_types,
+    model.v_tonnes_crop_transfer = pe.Var(model.s_sequence_node, model.s_crops, model.s_lmus, model.s_feed_periods, model.s_labperiods, model.s_season_types,
                                           bounds=(0,None), doc='tonnes of crop DM transferred to next feed period (p5 axis tracks when the crop being grazed was sown)')
 
     #########
@@ -76,6 +77,11 @@ def f1_cropgrazepyomo_local(params,model):
                                      initialize=params['crop_vol_kp6p5zl'], default=0, mutable=False,
                                      doc='Volume required to consume 1t of crop grazing for each time of sowing (p5 period)')
 
+    ##map each row of the core constraints to the non-zero keys (see fun.f1_sparse_index)
+    model.si_cropgraze_biomass_penalty = fun.f1_sparse_index(model.p_cropgraze_biomass_penalty, (0,2)) #row is (k,z)
+    model.si_crop_md = fun.f1_sparse_index(model.p_crop_md, (2,0,4)) #row is (p6,f,z)
+    model.si_crop_vol = fun.f1_sparse_index(model.p_crop_vol, (2,0,4))
+
     ###################################
     #call local constraints           #
     ###################################
@@ -93,8 +99,9 @@ def f_con_crop_DM_transfer(model):
 
     Note: there is no corresponding 'between' constraint because there is no carry over across the break.
     '''
+    d_p6_prev = fun.f1_position_index(list(model.s_feed_periods))[1]
     def crop_DM_transfer(model,q,s,k,l,p6,p5,z9):
-        p6s = list(model.s_feed_periods)[list(model.s_feed_periods).index(p6) - 1]  #previous feedperiod - have to convert to a list first because indexing of an ordered set starts at 1
+        p6s = d_p6_prev[p6]  #previous feedperiod
         if pe.value(model.p_wyear_inc_qs[q, s]) and model.p_crop_DM_required[k,p6,p5,z9]!=0:
             return - sum(model.v_contractseeding_ha[q,s,z8,p5,k,l] * model.p_can_sow[p5,z9,k] * model.p_crop_DM_provided[k,p6,p5,z8,l,z9]
                          + model.v_seeding_machdays[q,s,z8,p5,k,l] * model.p_seeding_rate[k,l] * model.p_can_sow[p5,z9,k] * model.p_crop_DM_provided[k,p6,p5,z8,l,z9]
@@ -118,7 +125,7 @@ def f_con_crop_DM_transfer(model):
         #      + sum(model.p_crop_DM_reduction[k,p6,p5,z9,l] * model.p_seeding_rate[k,l] * model.v_seeding_machdays[z9,p5,k,l]
         #            for p5 in model.s_labperiods for l in model.s_lmus) <=0
 
-    model.con_crop_DM_transfer = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_crops, model.s_lmus, model.s_feed_periods, model.s_labperiods, model.s_season_types, rule=crop_DM_transfer,
+    model.con_crop_DM_transfer = pe.Constraint(model.s_sequence_node, model.s_crops, model.s_lmus, model.s_feed_periods, model.s_labperiods, model.s_season_types, rule=crop_DM_transfer,
                                                 doc='transfer FOO from the grazing grazing 1ha activity to the consumption activity')
 
 
@@ -135,7 +142,8 @@ def f_grazecrop_biomass_penalty(model,q,s,p7,k,l,z):
     Used in global constraint (con_grain_transfer). See CorePyomo
     '''
     return sum(model.v_tonnes_crop_consumed[q,s,f,k,p6,p5,z,l] * model.p_cropgraze_biomass_penalty[k,p6,z] * model.p_a_p6_p7[p7,p6,z] * 1000
-               for f in model.s_feed_pools for p6 in model.s_feed_periods for p5 in model.s_labperiods)
+               for _,p6,_ in model.si_cropgraze_biomass_penalty.get((k,z), ()) if pe.value(model.p_a_p6_p7[p7,p6,z]) != 0
+               for f in model.s_feed_pools for p5 in model.s_labperiods)
 
 # def f_grazecrop_stubble_penalty(model,q,s,p7,k,z):
 #     '''
@@ -159,7 +167,7 @@ def f_grazecrop_me(model,q,s,p6,f,z):
     Used in global constraint (con_me). See CorePyomo
     '''
     return sum(model.v_tonnes_crop_consumed[q,s,f,k,p6,p5,z,l] * model.p_crop_md[f,k,p6,p5,z,l]
-               for k in model.s_crops for l in model.s_lmus for p5 in model.s_labperiods)
+               for _,k,_,p5,_,l in model.si_crop_md.get((p6,f,z), ()))
 
 
 
@@ -171,4 +179,4 @@ def f_grazecrop_vol(model,q,s,p6,f,z):
     Used in global constraint (con_vol). See CorePyomo
     '''
     return sum(model.v_tonnes_crop_consumed[q,s,f,k,p6,p5,z,l] * model.p_crop_vol[f,k,p6,p5,z,l]
-               for k in model.s_crops for l in model.s_lmus for p5 in model.s_labperiods)
+               for _,k,_,p5,_,l in model.si_crop_vol.get((p6,f,z), ()))
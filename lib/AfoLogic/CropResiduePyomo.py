@@ -7,6 +7,7 @@ author: young
 import pyomo.environ as pe
 
 #AFO modules
+from . import Functions as fun
 from . import CropResidue as stub
 from . import PropertyInputs as pinp
 
@@ -28,21 +29,21 @@ def f1_stubpyomo_local(params, model):
     # variable         #
     ###################
     ##stubble consumption
-    model.v_stub_con = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods, model.s_feed_pools,
+    model.v_stub_con = pe.Var(model.s_sequence_node, model.s_season_types, model.s_feed_periods, model.s_feed_pools,
                               model.s_crops, model.s_stub_cat, model.s_biomass_uses, bounds=(0.0,None),
                               doc='consumption of 1t of stubble')
     ##stubble transfer
-    model.v_stub_transfer = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods,
+    model.v_stub_transfer = pe.Var(model.s_sequence_node, model.s_season_types, model.s_feed_periods,
                                    model.s_crops, model.s_stub_cat, model.s_biomass_uses, bounds=(0.0,None),
                                    doc='transfer of 1t of stubble to following period - 1t of stubble at the start of the period that is not consumed but is decayed')
 
-    # model.v_stub_harv = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_season_types, model.s_crops, bounds=(0.0,None),
+    # model.v_stub_harv = pe.Var(model.s_sequence_node, model.s_feed_periods, model.s_season_types, model.s_crops, bounds=(0.0,None),
     #                                doc='total stubble at harvest. Used to transfer to stubble constraint')
 
-    # model.v_stub_debit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_season_periods, model.s_crops, bounds=(0,None),
+    # model.v_stub_debit = pe.Var(model.s_sequence_node, model.s_season_types, model.s_season_periods, model.s_crops, bounds=(0,None),
     #                             doc='tonnes of total stub in debt (will need to be provided from harvest)')
 
-    # model.v_stub_credit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_crops, model.s_stub_cat, model.s_season_types, bounds=(0,None),
+    # model.v_stub_credit = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_crops, model.s_stub_cat, model.s_season_types, bounds=(0,None),
     #                             doc='tonnes of total stub in credit (can be used for feeding)')
 
 
@@ -61,6 +62,10 @@ def f1_stubpyomo_local(params, model):
 
     model.p_stub_vol = pe.Param(model.s_feed_pools, model.s_feed_periods, model.s_season_types, model.s_crops, model.s_stub_cat, initialize=params['vol'],
                                 default = 0.0, mutable=False, doc='amount of intake volume required by 1t of each stubble category for each crop')
+
+    ##map each row of con_me/con_vol (p6,f,z) to the non-zero keys (see fun.f1_sparse_index)
+    model.si_stub_md = fun.f1_sparse_index(model.p_stub_md, (1,0,2))
+    model.si_stub_vol = fun.f1_sparse_index(model.p_stub_vol, (1,0,2))
     
     model.p_a_prov = pe.Param(model.s_feed_periods, model.s_season_types, model.s_crops, model.s_stub_cat, model.s_biomass_uses, initialize=params['cat_a_prov'],
                              default = 0.0, mutable=False, doc='cat A stubble provided at harvest from 1t of stubble')
@@ -99,10 +104,12 @@ def f_con_cropresidue_within(model):
     '''
     ##stubble transfer from category to category and period to period
     ##s2 required because cat propn can vary across s2
+    d_sc_prev = fun.f1_position_index(list(model.s_stub_cat))[1] #previous stubble cat - used to transfer from current cat to the next
+    d_p6_prev = fun.f1_position_index(list(model.s_feed_periods))[1]
     def cropresidue_transfer_within(model,q,s,p6,z9,k,sc,s2):
         if pe.value(model.p_mask_childz_within_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s]) and pe.value(model.p_stub_transfer_req[p6,z9,k]): #p_stub_transfer_req included to remove constraints when stubble doesn't exist
-            sc_prev = list(model.s_stub_cat)[list(model.s_stub_cat).index(sc)-1] #previous stubble cat - used to transfer from current cat to the next, list is required because indexing of an ordered set starts at 1 which means index of 0 chucks error
-            p6_prev = list(model.s_feed_periods)[list(model.s_feed_periods).index(p6)-1] #have to convert to a list first because indexing of an ordered set starts at 1
+            sc_prev = d_sc_prev[sc]
+            p6_prev = d_p6_prev[p6]
             return  - sum(model.v_stub_transfer[q,s,z8,p6_prev,k,sc,s2] * model.p_stub_transfer_prov[p6_prev,z8,k]
                           * model.p_parentz_provwithin_fp[p6_prev,z8,z9] for z8 in model.s_season_types)  \
                     - sum(model.v_use_biomass[q,s,p7,z9,k,l,s2] * model.p_a_p6_p7[p7,p6,z9] * model.p_biomass2residue[k,l,s2]
@@ -113,7 +120,7 @@ def f_con_cropresidue_within(model):
                           for f in model.s_feed_pools) <=0
         else:
             return pe.Constraint.Skip
-    model.con_cropresidue_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_season_types,
+    model.con_cropresidue_within = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_season_types,
                                              model.s_crops, model.s_stub_cat, model.s_biomass_uses, rule=cropresidue_transfer_within, doc='stubble transfer between feed periods and stubble transfer between categories.')
 
 
@@ -124,11 +131,14 @@ def f_con_cropresidue_between(model):
     '''
     ##stubble transfer from category to category and period to period
     ##s2 required because cat propn can vary across s2
+    d_sc_prev = fun.f1_position_index(list(model.s_stub_cat))[1] #previous stubble cat - used to transfer from current cat to the next
+    d_p6_prev = fun.f1_position_index(list(model.s_feed_periods))[1]
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def cropresidue_transfer_between(model,q,s9,p6,z9,k,sc,s2):
         if pe.value(model.p_mask_childz_between_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s9]) and pe.value(model.p_stub_transfer_req[p6,z9,k]): #p_stub_transfer_req included to remove constraints when stubble doesn't exist
-            sc_prev = list(model.s_stub_cat)[list(model.s_stub_cat).index(sc)-1] #previous stubble cat - used to transfer from current cat to the next, list is required because indexing of an ordered set starts at 1 which means index of 0 chucks error
-            p6_prev = list(model.s_feed_periods)[list(model.s_feed_periods).index(p6)-1] #have to convert to a list first because indexing of an ordered set starts at 1
-            q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+            sc_prev = d_sc_prev[sc]
+            p6_prev = d_p6_prev[p6]
+            q_prev = d_q_prev[q]
             return  - sum(model.v_stub_transfer[q_prev,s8,z8,p6_prev,k,sc,s2] * model.p_stub_transfer_prov[p6_prev,z8,k]
                           * model.p_parentz_provbetween_fp[p6_prev,z8,z9]
                           * (model.p_sequence_prov_qs8zs9[q_prev,s8,z8,s9] + model.p_endstart_prov_qsz[q_prev,s8,z8])
@@ -141,7 +151,7 @@ def f_con_cropresidue_between(model):
                           for f in model.s_feed_pools) <=0
         else:
             return pe.Constraint.Skip
-    model.con_cropresidue_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_season_types,
+    model.con_cropresidue_between = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_season_types,
                                               model.s_crops, model.s_stub_cat, model.s_biomass_uses, rule=cropresidue_transfer_between, doc='stubble transfer between feed periods and stubble transfer between categories.')
 
 
@@ -170,7 +180,7 @@ def f_cropresidue_me(model,q,s,p6,f,z):
     Used in global constraint (con_me). See CorePyomo
     '''
     return sum(model.v_stub_con[q,s,z,p6,f,k,sc,s2] * model.p_stub_md[f,p6,z,k,sc]
-               for k in model.s_crops for sc in model.s_stub_cat for s2 in model.s_biomass_uses)
+               for _,_,_,k,sc in model.si_stub_md.get((p6,f,z), ()) for s2 in model.s_biomass_uses)
     
 ##stubble vol
 def f_cropresidue_vol(model,q,s,p6,f,z):
@@ -180,4 +190,4 @@ def f_cropresidue_vol(model,q,s,p6,f,z):
     Used in global constraint (con_vol). See CorePyomo
     '''
     return sum(model.v_stub_con[q,s,z,p6,f,k,sc,s2] * model.p_stub_vol[f,p6,z,k,sc]
-               for k in model.s_crops for sc in model.s_stub_cat for s2 in model.s_biomass_uses)
\ No newline at end of file
+               for _,_,_,k,sc in model.si_stub_vol.get((p6,f,z), ()) for s2 in model.s_biomass_uses)
\ No newline at end of file
@@ -564,6 +564,7 @@ def f1_pkl_feedsupply(lp_vars,r_vals,pkl_fs_info):
         sire_numbers_qsg0 = stock_vars['sire_numbers_qsg0'].astype('float32')
         dams_numbers_qsk2tvanwziy1g1 = stock_vars['dams_numbers_qsk2tvanwziy1g1'].astype('float32')
         offs_numbers_qsk3k5tvnwziaxyg3 = stock_vars['offs_numbers_qsk3k5tvnwziaxyg3'].astype('float32')
+        rfun.f1_clear_trial_cache() #don't hold the reshaped variables until the next trial
         ###add singleton axis to line up with generator
         dams_numbers_qsk2tva1e1b1nwzida0e0b0xyg1 = dams_numbers_qsk2tvanwziy1g1[...,na,na,:,:,:,:,na,na,na,na,na,:,:]
         offs_numbers_qsk3k5tva1e1b1nwzida0e0b0xyg3 = offs_numbers_qsk3k5tvnwziaxyg3[...,na,na,na,:,:,:,:,na,:,na,na,:,:,:]
@@ -123,8 +123,19 @@ def f_cashflow_allocation(date_incurred,enterprise=None,z_pos=-1, c0_inc=False,
     :param z_pos: axis position of z (must be negative e.g. reference from the end).
     :param c0_inc: boolean stating if c0 axis is included in date_incurred
     :param is_phase_cost: boolean stating if the cost is related to v_phase.
+    :return: cashflow allocation (p7 in pos 0) and wc allocation (c0 in pos 0, p7 in pos 1). Both are broadcast to the
+             shape of date_incurred, so many items can be allocated in one call by passing an array of dates.
     '''
+    ##the same dates are allocated by multiple modules (e.g. seeding and harvest both use the labour period dates)
+    ## so the allocation is stored in the period registry for the trial (keyed by the date and the allocation args).
+    date_incurred = np.asarray(date_incurred)
+    key = ('c0_alloc', date_incurred.shape, date_incurred.dtype.str, date_incurred.tobytes(), enterprise, z_pos,
+           c0_inc, is_phase_cost)
+    return per.f1_stored_period(key, lambda: f1_cashflow_allocation(date_incurred, enterprise, z_pos, c0_inc, is_phase_cost))
 
+
+def f1_cashflow_allocation(date_incurred, enterprise, z_pos, c0_inc, is_phase_cost):
+    '''Calculate the cashflow and wc allocation - see f_cashflow_allocation.'''
     ##inputs
     rate = uinp.finance['i_interest']
     cashflow_date_c0 = per.f_cashflow_date()
@@ -29,21 +29,21 @@ def f1_finpyomo_local(params, model):
     #variables #
     ############
     ##terminal welth used in utility function
-    model.v_terminal_wealth = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_c1, bounds = (-2000000, 20000000), doc = 'profit minus depreciation, minroe and asset cost')
+    model.v_terminal_wealth = pe.Var(model.s_sequence_node, model.s_season_types, model.s_c1, bounds = (-2000000, 20000000), doc = 'profit minus depreciation, minroe and asset cost')
     ##credit for a given time period (time period defined by cashflow set)
-    model.v_credit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_c1, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net positive cashflow in a given period')
+    model.v_credit = pe.Var(model.s_sequence_node, model.s_c1, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net positive cashflow in a given period')
     ##debit for a given time period (time period defined by cashflow set)
-    model.v_debit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_c1, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net negative cashflow in a given period')
+    model.v_debit = pe.Var(model.s_sequence_node, model.s_c1, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net negative cashflow in a given period')
     ##working capital credit for a given time period (time period defined by cashflow set)
-    model.v_wc_credit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_enterprises, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net positive working capital in a given period')
+    model.v_wc_credit = pe.Var(model.s_sequence_node, model.s_enterprises, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net positive working capital in a given period')
     ##working capital for a given time period (time period defined by cashflow set)
-    model.v_wc_debit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_enterprises, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net negative working capital in a given period')
+    model.v_wc_debit = pe.Var(model.s_sequence_node, model.s_enterprises, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'amount of net negative working capital in a given period')
     ##dep
-    model.v_dep = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'transfers total dep to objective')
+    model.v_dep = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'transfers total dep to objective')
     ##dep
-    model.v_asset_cost = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'transfers total opportunity cost of asset to objective to represent minimum ROA')
+    model.v_asset_cost = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'transfers total opportunity cost of asset to objective to represent minimum ROA')
     ##minroe
-    model.v_minroe = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'total expenditure, used to ensure min return is met')
+    model.v_minroe = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, bounds = (0.0, None), doc = 'total expenditure, used to ensure min return is met')
 
     ####################
     #params            #
@@ -77,5 +77,5 @@ def f_con_capital_limit(params, model):
             return model.v_wc_debit[q,s,c0,p7,z] <= params['capital_limit']
         else:
             return pe.Constraint.Skip
-    model.con_capital_limit = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_enterprises, model.s_season_periods, model.s_season_types, rule=capital_limit, doc='capital limit')
+    model.con_capital_limit = pe.Constraint(model.s_sequence_node, model.s_enterprises, model.s_season_periods, model.s_season_types, rule=capital_limit, doc='capital limit')
 
@@ -792,50 +792,90 @@ def f1_make_r_val(r_vals, param, name, maskz8=None, z_pos=0, shape=None):
 
 def f1_make_pyomo_dict(param, index, loop_axis_pos=None, index_loop_axis_pos=None, dtype='float32'):
     '''
-    Convert numpy array into dict for pyomo. A loop can be used to reduce memory if required.
-
-    0 values are removed to reduce time (when creating the param in pyomo) and space.
-
-    :param param: numpy array
-    :param index: list of index arrays
-    :param loop_axis_pos: optional: position of axis that is being looped on (arg not required if no loop)
-    :param index_loop_axis_pos: optional: position of axis that is being looped on in the index array (arg not required if no loop)
+    Convert numpy array into dict for pyomo.
+
+    0 values are removed to reduce time (when creating the param in pyomo) and space. The keys are built directly
+    from the positions of the non-zero values (rather than building the cartesian product of the whole index and
+    then masking it) so the time and memory scale with the number of non-zero values. This means the loop which
+    was used to reduce memory for some big params is no longer required.
+
+    :param param: numpy array - singleton axes that are not in the index are ignored.
+    :param index: list of index arrays (one for each axis in the index).
+    :param loop_axis_pos: optional: legacy arg from when a loop was used to reduce memory. If provided the values are
+                          converted to dtype (as they were in the loop).
+    :param index_loop_axis_pos: optional: legacy arg - not required.
     :return: dict for pyomo
     '''
-    ##build in loop to reduce memory for some big params
-    if loop_axis_pos:
-        param_masked = np.array([],dtype=dtype)
-        index_masked = np.array([])
-        for i in range(param.shape[loop_axis_pos]):
-            ###mask out values=0
-            param_cut = f_dynamic_slice(param, loop_axis_pos, start=i, stop=i+1)
-            mask = param_cut != 0
-            param_masked = np.concatenate([param_masked,param_cut[mask]],0).astype(dtype)  # applying the mask does the raveling and squeezing of singleton axis
-            mask = mask.ravel() #needs to be 1d to mask the index
-            ###build index
-            ####adjust if the position given is negative (e.g. cant use pos=-1)
-            if index_loop_axis_pos<0:
-                index_loop_axis_pos = len(index) + index_loop_axis_pos
-            index_cut = [index[x] if x != index_loop_axis_pos else index[x][i:i+1] for x in range(len(index))]
-            index_cut = cartesian_product_simple_transpose(index_cut)
-            index_masked = np.vstack([index_masked,index_cut[mask,:]]) if index_masked.size else index_cut[mask,:]
-    else:
-        ###mask out values=0
-        mask = param!=0
-        ###build index
-        index = cartesian_product_simple_transpose(index)
-        ###mask param and index
-        param_masked = param[mask]  # applying the mask does the raveling and squeezing of array
-        mask = mask.ravel() #needs to be 1d to mask the index
-        index_masked = index[mask,:]
+    ##keys have a common dtype (e.g. if some index arrays are str all the keys are str)
+    try:
+        key_dtype = np.result_type(*index)
+    except TypeError:
+        key_dtype = 'U25'
+    index = [np.asarray(i, dtype=key_dtype) for i in index]
 
     ##error check - index and param should be same length but zip() doesn't throw error if they are different length
-    if len(index_masked) != len(param_masked):
+    shape = tuple(len(i) for i in index)
+    if np.size(param) != np.prod(shape):
         raise exc.ParamError('''Index and param must be the same length''')
 
-    ##make index a tuple and zip with param and make dict
-    tup = tuple(map(tuple,index_masked))
-    return dict(zip(tup, param_masked))
+    ##mask out values=0 - the position of each non-zero value on each axis is used to select the keys
+    param = np.asarray(param).reshape(shape) #remove the singleton axes that are not in the index (and handle pandas)
+    idx_nonzero = np.nonzero(param)
+    param_masked = param[idx_nonzero]
+    if loop_axis_pos:
+        param_masked = param_masked.astype(dtype)
+
+    ##make the key tuples and zip with param and make dict
+    keys = zip(*[i[idx].tolist() for i, idx in zip(index, idx_nonzero)])
+    return dict(zip(keys, param_masked.tolist()))
+
+def f1_df2np(df, keys):
+    '''
+    Convert a pandas param to a numpy array with an axis for each key array.
+
+    The df is stacked so that the index levels then the column levels are the axes and it is reindexed to the
+    cartesian product of the keys (missing values are 0). Used to move a param out of pandas so that it can be
+    combined with numpy broadcasting and converted to a pyomo dict (f1_make_pyomo_dict) with only the non-zero values.
+
+    :param df: pandas DataFrame or Series.
+    :param keys: list of key arrays - one for each index and column level (in order).
+    :return: numpy array with shape (len(k) for k in keys).
+    '''
+    if isinstance(df, pd.DataFrame):
+        df = df.stack(list(range(df.columns.nlevels)))
+    shape = tuple(len(k) for k in keys)
+    return df.reindex(pd.MultiIndex.from_product(keys)).fillna(0).values.reshape(shape)
+
+def f1_sparse_index(param, row_pos):
+    '''
+    Map each row of a pyomo param to the keys of its non-zero values.
+
+    The map is built once from the values stored in the param (the dicts from f1_make_pyomo_dict only hold the
+    non-zero values) so that the constraint rules only loop over the non-zero terms of a row rather than the
+    cartesian product of the sets with a pe.value() != 0 check on each combination.
+
+    :param param: pyomo param.
+    :param row_pos: positions of the param index that make up the row key (the sets indexing the constraint).
+    :return: dict {row key: [full param key]}. Rows with no non-zero values are not included so use .get(row, ()).
+    '''
+    sparse_index = {}
+    for key, value in param.sparse_items():
+        if pe.value(value) != 0:
+            row = tuple(key[pos] for pos in row_pos)
+            sparse_index.setdefault(row, []).append(key)
+    return sparse_index
+
+def f1_position_index(l):
+    '''
+    Position and previous element of each element of a list (replaces the O(n) l.index() in constraint rules).
+
+    :param l: list (e.g. list of a pyomo set).
+    :return: dict {element: position} and dict {element: previous element}. The previous element of the first
+             element is the last element (same as l[l.index(x) - 1]).
+    '''
+    d_pos = {x: t for t, x in enumerate(l)}
+    d_prev = {x: l[t - 1] for t, x in enumerate(l)}
+    return d_pos, d_prev
 
 def write_variablesummary(model, row, exp_data, obj, option=0, property_id=''):
     '''
@@ -859,12 +899,12 @@ def write_variablesummary(model, row, exp_data, obj, option=0, property_id=''):
     file.write('{0} profit: {1}\n'.format(exp_data.index[row][3],obj))  # the second line is profit
     for v in model.component_objects(pe.Var,active=True):
         file.write("Variable %s\n" % v)  # \n makes new line
-        for index in v:
-            try:
-                if v[index].value > 0.0001 or v[index].value < -0.0001:
-                    file.write("   %s %s\n" % (index,v[index].value))
-            except:
-                pass
+        ###values extracted in one go and filtered with numpy (variables without a value are nan so they are not written)
+        indexes = list(v.keys())
+        values = [d.value for d in v.values()]
+        np_values = np.array([np.nan if x is None else x for x in values], dtype=float)
+        active = np.flatnonzero(np.abs(np_values) > 0.0001)
+        file.write("".join(["   %s %s\n" % (indexes[i], values[i]) for i in active]))
     file.close()
 
 
@@ -28,7 +28,7 @@ def f1_labfxpyomo_local(params, model):
     ############
     # variables #
     ############
-    model.v_learn_allocation = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods,
+    model.v_learn_allocation = pe.Var(model.s_sequence_node, model.s_labperiods,
                                    bounds=(0,1), doc='proportion of learning done each labour period')
 
     #########
@@ -55,7 +55,7 @@ def f1_labfxpyomo_local(params, model):
         else:
             return pe.Constraint.Skip
 
-    model.con_labour_learn_period = pe.Constraint(model.s_sequence_year, model.s_sequence, rule = labour_learn_period, doc='constrains the allocation of labour learn to a total of 1')
+    model.con_labour_learn_period = pe.Constraint(model.s_sequence_node, rule = labour_learn_period, doc='constrains the allocation of labour learn to a total of 1')
 
 
 
@@ -36,6 +36,14 @@ from . import RotationPhases as rps
 na = np.newaxis
 
 ##general
+def f1_keys_rzl():
+    '''Keys of the rotation phase, season and lmu axes of the phase labour params.'''
+    keys_r = pinp.phases_r.index
+    keys_z = zfun.f_keys_z()
+    lmu_mask = pinp.general['i_lmu_area'] > 0
+    keys_l = pinp.general['i_lmu_idx'][lmu_mask]
+    return keys_r, keys_z, keys_l
+
 def f_p5_p7_allocation():
     '''Allocation of labour in each p5 to each p7 period.'''
     labour_period_p5z = per.f_p_dates_df()
@@ -142,12 +150,6 @@ def f_fert_lab_allocation():
     ##allocate to p7
     alloc_p7p5z = f_p5_p7_allocation()
     alloc_p7p5zn = alloc_p5zn * alloc_p7p5z[...,na]
-    ##put in df
-    keys_z = zfun.f_keys_z()
-    keys_p5 = per.f_p_dates_df().index[:-1]
-    keys_p7 = per.f_season_periods(keys=True)
-    index_p7p5zn = pd.MultiIndex.from_product([keys_p7, keys_p5, keys_z, fert_info.index])
-    alloc_p7p5zn = pd.Series(alloc_p7p5zn.ravel(), index=index_p7p5zn)
     return alloc_p7p5zn
 
 #time/per ha - needs to be multiplied by the number of phases and then added to phases df because the previous phases can effect number of passes and hence time
@@ -161,22 +163,20 @@ def f_fert_app_time_ha():
     This is adjusted for the number of fertiliser applications and allocated into a labour period/s.
     '''
 
+    keys_r, keys_z, keys_l = f1_keys_rzl()
+    keys_n = pinp.crop['fert_info'].index
     ##fert passes - arable (arable area accounted for in passes function)
-    total_passes_rzln = phs.f_fert_passes().stack()
-    ##time taken to cover 1ha while spreading
-    time_ha_n = mac.time_ha().squeeze()
+    total_passes_rzln = fun.f1_df2np(phs.f_fert_passes(), [keys_r, keys_z, keys_l, keys_n])
+    ##time taken to cover 1ha while spreading (nan if the fert is not spread)
+    time_ha_n = np.nan_to_num(mac.time_ha().squeeze().reindex(keys_n).values.astype(float))
     ##adjust fert labour across each labour period
     alloc_p7p5zn = f_fert_lab_allocation()
-    time_p7p5z_n = alloc_p7p5zn.mul(time_ha_n, level=-1).unstack() #time for 1 pass for each chem.
-    ##adjust for passes
-    time_p7p5z_rln = time_p7p5z_n.reindex(total_passes_rzln.unstack(1).index, axis=1, level=2)
-    time_p7p5_rzln = time_p7p5z_rln.unstack().reorder_levels([0,3,1,2], axis=1).sort_index(axis=1)
-    fert_app_time_ha_p7p5_rzln = time_p7p5_rzln.mul(total_passes_rzln.sort_index(), axis=1)
-    fert_app_time_ha_p7p5_rzl = fert_app_time_ha_p7p5_rzln.groupby(axis=1, level=(0,1,2)).sum() #sum fert type
-    fert_app_time_ha_rzlp5p7 = fert_app_time_ha_p7p5_rzl.unstack([1,0]).sort_index()
+    time_p7p5zn = alloc_p7p5zn * time_ha_n #time for 1 pass for each fert.
+    ##adjust for passes and sum fert type
+    fert_app_time_ha_rzlp5p7 = np.einsum('rzln,qpzn->rzlpq', total_passes_rzln, time_p7p5zn)
 
     ##create params for v_phase_change_increase
-    increment_fert_app_time_ha_rzlp5p7 = rps.f_v_phase_increment_adj(fert_app_time_ha_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2)
+    increment_fert_app_time_ha_rzlp5p7 = rps.f_v_phase_increment_adj(fert_app_time_ha_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2,numpy=True)
 
     return fert_app_time_ha_rzlp5p7, increment_fert_app_time_ha_rzlp5p7
 
@@ -194,27 +194,26 @@ def f_fert_app_time_t():
 
 
     '''
+    keys_r, keys_z, keys_l = f1_keys_rzl()
+    keys_n = pinp.crop['fert_info'].index
     ##fert used in each rotation phase
-    fert_total_rzln = phs.f_fert_req().stack().sort_index()/1000 #convert to tonnes
+    fert_total_rzln = fun.f1_df2np(phs.f_fert_req(), [keys_r, keys_z, keys_l, keys_n])/1000 #convert to tonnes
 
     ##time per tonne
     spreader_proportion = pd.DataFrame([pinp.crop['fert_info']['spreader_proportion']])
     conversion = pd.DataFrame([pinp.crop['fert_info']['fert_density']])
     time_n = ((mac.time_cubic() / conversion).mul(spreader_proportion.squeeze(),axis=1)).squeeze()
+    time_n = np.nan_to_num(time_n.reindex(keys_n).values.astype(float))
 
     ##p5 and p7 allocation
     alloc_p7p5zn = f_fert_lab_allocation()
-    time_p7p5z_n = alloc_p7p5zn.mul(time_n, level=-1).unstack() #time for 1 tonne for each fert.
+    time_p7p5zn = alloc_p7p5zn * time_n #time for 1 tonne for each fert.
 
-    ##combine with total phase fert
-    time_p7p5z_rln = time_p7p5z_n.reindex(fert_total_rzln.unstack(1).index, axis=1, level=2)
-    time_p7p5_rzln = time_p7p5z_rln.unstack().reorder_levels([0,3,1,2], axis=1).sort_index(axis=1)
-    fert_app_time_tonne_p7p5_rzln = time_p7p5_rzln.mul(fert_total_rzln.sort_index(), axis=1)
-    fert_app_time_tonne_p7p5_rzl = fert_app_time_tonne_p7p5_rzln.groupby(axis=1, level=(0,1,2)).sum() #sum fert type
-    fert_app_time_tonne_rzlp5p7 = fert_app_time_tonne_p7p5_rzl.unstack([1,0]).sort_index()
+    ##combine with total phase fert and sum fert type
+    fert_app_time_tonne_rzlp5p7 = np.einsum('rzln,qpzn->rzlpq', fert_total_rzln, time_p7p5zn)
 
     ##create params for v_phase_change_increase
-    increment_fert_app_time_tonne_rzlp5p7 = rps.f_v_phase_increment_adj(fert_app_time_tonne_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2)
+    increment_fert_app_time_tonne_rzlp5p7 = rps.f_v_phase_increment_adj(fert_app_time_tonne_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2,numpy=True)
 
     return fert_app_time_tonne_rzlp5p7, increment_fert_app_time_tonne_rzlp5p7
 
@@ -241,14 +240,6 @@ def f_chem_lab_allocation():
     ##allocate to p7
     alloc_p7p5z = f_p5_p7_allocation()
     alloc_p7p5zn = alloc_p5zn * alloc_p7p5z[...,na]
-    
-    ##put in df
-    keys_z = zfun.f_keys_z()
-    keys_p5 = per.f_p_dates_df().index[:-1]
-    keys_p7 = per.f_season_periods(keys=True)
-    index_p7p5zn = pd.MultiIndex.from_product([keys_p7, keys_p5, keys_z, chem_info.index])
-    alloc_p7p5zn = pd.Series(alloc_p7p5zn.ravel(), index=index_p7p5zn)
-
     return alloc_p7p5zn
 
 
@@ -264,22 +255,20 @@ def f_chem_app_time_ha():
 
     ##note arable area accounted for in crop.py
 
+    keys_r, keys_z, keys_l = f1_keys_rzl()
+    keys_n = pinp.crop['chem_info'].index
     ##passes
-    total_passes_rzln = phs.f_chem_application().stack()
+    total_passes_rzln = fun.f1_df2np(phs.f_chem_application(), [keys_r, keys_z, keys_l, keys_n])
     ##time for 1 pass for each chem
     time = mac.spray_time_ha()
     ##adjust fert labour across each labour period
     alloc_p7p5zn = f_chem_lab_allocation()
-    time_p7p5z_n = alloc_p7p5zn.mul(time, level=-1).unstack() #time for 1 pass for each chem.
-    ##adjust for passes
-    time_p7p5z_rln = time_p7p5z_n.reindex(total_passes_rzln.unstack(1).index, axis=1, level=2)
-    time_p7p5_rzln = time_p7p5z_rln.unstack().reorder_levels([0,3,1,2], axis=1).sort_index(axis=1)
-    chem_app_time_p7p5_rzln = time_p7p5_rzln.mul(total_passes_rzln.sort_index(), axis=1)
-    chem_app_time_p7p5_rzl = chem_app_time_p7p5_rzln.groupby(axis=1, level=(0,1,2)).sum() #sum chem type
-    chem_app_time_rzlp5p7 = chem_app_time_p7p5_rzl.unstack([1,0]).sort_index()
+    time_p7p5zn = alloc_p7p5zn * time #time for 1 pass for each chem.
+    ##adjust for passes and sum chem type
+    chem_app_time_rzlp5p7 = np.einsum('rzln,qpzn->rzlpq', total_passes_rzln, time_p7p5zn)
 
     ##create params for v_phase_change_increase
-    increment_chem_app_time_rzlp5p7 = rps.f_v_phase_increment_adj(chem_app_time_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2)
+    increment_chem_app_time_rzlp5p7 = rps.f_v_phase_increment_adj(chem_app_time_rzlp5p7,p7_pos=-1,z_pos=-4,p5_pos=-2,numpy=True)
 
     return chem_app_time_rzlp5p7, increment_chem_app_time_rzlp5p7
 
@@ -372,14 +361,19 @@ def f1_labcrop_params(params,r_vals):
     params['daily_seed_hours'] = pinp.mach['daily_seed_hours']
     params['seeding_helper'] = pinp.labour['seeding_helper']
     params['prep_labour'] = prep_labour.to_dict()
-    params['fert_app_time_t'] = fert_app_time_t.to_dict()
-    params['increment_fert_app_time_t'] = increment_fert_app_time_t.to_dict()
-    params['fert_app_time_ha'] = fert_app_time_ha.to_dict()
-    params['increment_fert_app_time_ha'] = increment_fert_app_time_ha.to_dict()
-    params['chem_app_time_ha'] = chem_app_time_ha.to_dict()
-    params['increment_chem_app_time_ha'] = increment_chem_app_time_ha.to_dict()
-    params['variable_crop_monitor'] = variable_crop_monitor.to_dict()
-    params['increment_variable_crop_monitor'] = increment_variable_crop_monitor.to_dict()
+    ###phase labour params are sparse (most phases only need labour in a few periods) so only the non-zero values are stored
+    keys_r, keys_z, keys_l = f1_keys_rzl()
+    keys_p5 = per.f_p_dates_df().index[:-1]
+    keys_p7 = per.f_season_periods(keys=True)
+    arrays_rzlp5p7 = [keys_r, keys_z, keys_l, keys_p5, keys_p7]
+    params['fert_app_time_t'] = fun.f1_make_pyomo_dict(fert_app_time_t, arrays_rzlp5p7)
+    params['increment_fert_app_time_t'] = fun.f1_make_pyomo_dict(increment_fert_app_time_t, arrays_rzlp5p7)
+    params['fert_app_time_ha'] = fun.f1_make_pyomo_dict(fert_app_time_ha, arrays_rzlp5p7)
+    params['increment_fert_app_time_ha'] = fun.f1_make_pyomo_dict(increment_fert_app_time_ha, arrays_rzlp5p7)
+    params['chem_app_time_ha'] = fun.f1_make_pyomo_dict(chem_app_time_ha, arrays_rzlp5p7)
+    params['increment_chem_app_time_ha'] = fun.f1_make_pyomo_dict(increment_chem_app_time_ha, arrays_rzlp5p7)
+    params['variable_crop_monitor'] = variable_crop_monitor[variable_crop_monitor != 0].to_dict()
+    params['increment_variable_crop_monitor'] = increment_variable_crop_monitor[increment_variable_crop_monitor != 0].to_dict()
     params['fixed_crop_monitor'] = fixed_crop_monitor.to_dict()
     # params['fert_req'] = fert_total.to_dict()
 
@@ -5,6 +5,7 @@ author: young
 import pyomo.environ as pe
 
 #AFO modules
+from . import Functions as fun
 from . import LabourPhase as lphs
 
 
@@ -65,6 +66,19 @@ def f1_labcrppyomo_local(params, model):
 
     model.p_fixed_crop_monitor = pe.Param(model.s_labperiods, model.s_season_types, initialize= params['fixed_crop_monitor'], default = 0.0, mutable=False, doc='fixed time required for crop monitoring (hr/period)')
 
+    ################
+    #sparse index  #
+    ################
+    ##map each row of the labour constraints to the non-zero keys of the phase labour params (see fun.f1_sparse_index)
+    model.si_fert_app_hour_tonne = fun.f1_sparse_index(model.p_fert_app_hour_tonne, (3,1)) #row is (p5,z)
+    model.si_increment_fert_app_hour_tonne = fun.f1_sparse_index(model.p_increment_fert_app_hour_tonne, (3,1))
+    model.si_fert_app_hour_ha = fun.f1_sparse_index(model.p_fert_app_hour_ha, (3,1))
+    model.si_increment_fert_app_hour_ha = fun.f1_sparse_index(model.p_increment_fert_app_hour_ha, (3,1))
+    model.si_chem_app_lab = fun.f1_sparse_index(model.p_chem_app_lab, (3,1))
+    model.si_increment_chem_app_lab = fun.f1_sparse_index(model.p_increment_chem_app_lab, (3,1))
+    model.si_variable_crop_monitor = fun.f1_sparse_index(model.p_variable_crop_monitor, (1,2)) #row is (p5,z)
+    model.si_increment_variable_crop_monitor = fun.f1_sparse_index(model.p_increment_variable_crop_monitor, (1,2))
+
 
 ###################################
 #functions for core model         #
@@ -82,17 +96,17 @@ def f_mach_labour_anyone(model,q,s,p,z):
     harv_labour = sum(model.v_harv_hours[q,s,z,p,k] * (1 + model.p_harv_helper[k]) for k in model.s_crops)
     prep_labour = model.p_prep_pack[p,z]
     fert_t_time = sum(model.v_phase_area[q,s,p7,z,r,l]*model.p_fert_app_hour_tonne[r,z,l,p,p7]
-                      + model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_fert_app_hour_tonne[r,z,l,p,p7]
-                      for r in model.s_phases for l in model.s_lmus for p7 in model.s_season_periods
-                      if pe.value(model.p_fert_app_hour_tonne[r,z,l,p,p7]) != 0 or pe.value(model.p_increment_fert_app_hour_tonne[r,z,l,p,p7]) != 0)
+                      for r,_,l,_,p7 in model.si_fert_app_hour_tonne.get((p,z), ())) \
+                  + sum(model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_fert_app_hour_tonne[r,z,l,p,p7]
+                        for r,_,l,_,p7 in model.si_increment_fert_app_hour_tonne.get((p,z), ()))
     fert_ha_time = sum(model.v_phase_area[q,s,p7,z,r,l]*model.p_fert_app_hour_ha[r,z,l,p,p7]
-                       + model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_fert_app_hour_ha[r,z,l,p,p7]
-                       for r in model.s_phases for l in model.s_lmus for p7 in model.s_season_periods
-                       if pe.value(model.p_fert_app_hour_ha[r,z,l,p,p7]) != 0 or pe.value(model.p_increment_fert_app_hour_ha[r,z,l,p,p7]) != 0)
+                       for r,_,l,_,p7 in model.si_fert_app_hour_ha.get((p,z), ())) \
+                   + sum(model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_fert_app_hour_ha[r,z,l,p,p7]
+                         for r,_,l,_,p7 in model.si_increment_fert_app_hour_ha.get((p,z), ()))
     chem_time = sum(model.v_phase_area[q,s,p7,z,r,l]*model.p_chem_app_lab[r,z,l,p,p7]
-                    + model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_chem_app_lab[r,z,l,p,p7]
-                    for r in model.s_phases for l in model.s_lmus for p7 in model.s_season_periods
-                    if pe.value(model.p_chem_app_lab[r,z,l,p,p7]) != 0 or pe.value(model.p_increment_chem_app_lab[r,z,l,p,p7]) != 0)
+                    for r,_,l,_,p7 in model.si_chem_app_lab.get((p,z), ())) \
+                + sum(model.v_phase_change_increase[q,s,p7,z,r,l]*model.p_increment_chem_app_lab[r,z,l,p,p7]
+                      for r,_,l,_,p7 in model.si_increment_chem_app_lab.get((p,z), ()))
     return seed_labour + harv_labour + prep_labour + fert_t_time + fert_ha_time + chem_time
 
 
@@ -106,9 +120,9 @@ def f_mach_labour_perm(model,q,s,p5,z):
     '''
     fixed_monitor_time = model.p_fixed_crop_monitor[p5,z]
     variable_monitor_time = sum(model.p_variable_crop_monitor[p7,p5,z,r] * model.v_phase_area[q,s,p7,z,r,l]
-                                + model.p_increment_variable_crop_monitor[p7,p5,z,r] * model.v_phase_change_increase[q,s,p7,z,r,l]
-                                for r in model.s_phases for l in model.s_lmus for p7 in model.s_season_periods
-                                if pe.value(model.p_variable_crop_monitor[p7,p5,z,r]) != 0 or pe.value(model.p_increment_variable_crop_monitor[p7,p5,z,r]) != 0)
+                                for p7,_,_,r in model.si_variable_crop_monitor.get((p5,z), ()) for l in model.s_lmus) \
+                            + sum(model.p_increment_variable_crop_monitor[p7,p5,z,r] * model.v_phase_change_increase[q,s,p7,z,r,l]
+                                  for p7,_,_,r in model.si_increment_variable_crop_monitor.get((p5,z), ()) for l in model.s_lmus)
     return variable_monitor_time + fixed_monitor_time
 
 
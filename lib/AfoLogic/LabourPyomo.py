@@ -46,7 +46,7 @@ def f1_labpyomo_local(params, model):
     ############
 
     # Amount of casual. Casual labour can be optimised for each period
-    model.v_quantity_casual = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, bounds=(0,None),
+    model.v_quantity_casual = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_season_types, bounds=(0,None),
                                   doc='number of casual labour used in each labour period')
 
     # Amount of permanent labour.
@@ -61,9 +61,9 @@ def f1_labpyomo_local(params, model):
                                    doc='number of manager/owner labour used in each labour period')
 
     # Casual supervision
-    model.v_casualsupervision_perm = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, bounds=(0,None),
+    model.v_casualsupervision_perm = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_season_types, bounds=(0,None),
                                          doc='hours of perm labour used for supervision of casual')
-    model.v_casualsupervision_manager = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, bounds=(0,None),
+    model.v_casualsupervision_manager = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_season_types, bounds=(0,None),
                                             doc='hours of manager labour used for supervision of casual')
 
     # Perm supervision
@@ -72,49 +72,49 @@ def f1_labpyomo_local(params, model):
 
     # manager pool
     # Period allocation for manager holidays.
-    model.v_manager_holiday_allocation = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, bounds=(0,1),
+    model.v_manager_holiday_allocation = pe.Var(model.s_sequence_node, model.s_labperiods, bounds=(0,1),
                                       doc='Manager holiday allocation')
 
     # Period allocation for perm holidays.
-    model.v_perm_holiday_allocation = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, bounds=(0,1),
+    model.v_perm_holiday_allocation = pe.Var(model.s_sequence_node, model.s_labperiods, bounds=(0,1),
                                       doc='perm holiday allocation')
 
     # labour for sheep activities (this variable transfers labour from source to sink)
-    model.v_sheep_labour_manager = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_sheep_labour_manager = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                        doc='manager labour used by sheep activities in each labour period for each different worker level')
 
     # labour for rotation phase activities (this variable transfers labour from source to sink)
-    model.v_phase_labour_manager = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_phase_labour_manager = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                       doc='manager labour used by crop activities in each labour period for each different worker level')
 
     # labour for fixed activities (this variable transfers labour from source to sink)
-    model.v_fixed_labour_manager = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_fixed_labour_manager = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                        doc='manager labour used by fixed activities in each labour period for each different worker level')
 
     # permanent pool
     # labour for sheep activities (this variable transfers labour from source to sink)
-    model.v_sheep_labour_permanent = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_sheep_labour_permanent = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                          doc='permanent labour used by sheep activities in each labour period for each different worker level')
 
     # labour for rotation phase activities (this variable transfers labour from source to sink)
-    model.v_phase_labour_permanent = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_phase_labour_permanent = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                         doc='permanent labour used by crop activities in each labour period for each different worker level')
 
     # labour for fixed activities (this variable transfers labour from source to sink)
-    model.v_fixed_labour_permanent = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_fixed_labour_permanent = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                          doc='permanent labour used by fixed activities in each labour period for each different worker level')
 
     # casual pool
     # labour for sheep activities (this variable transfers labour from source to sink)
-    model.v_sheep_labour_casual = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_sheep_labour_casual = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                       doc='casual labour used by sheep activities in each labour period for each different worker level')
 
     # labour for rotation phase activities (this variable transfers labour from source to sink)
-    model.v_phase_labour_casual = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_phase_labour_casual = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                      doc='casual labour used by crop activities in each labour period for each different worker level')
 
     # labour for fixed activities (this variable transfers labour from source to sink)
-    model.v_fixed_labour_casual = pe.Var(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
+    model.v_fixed_labour_casual = pe.Var(model.s_sequence_node, model.s_labperiods, model.s_worker_levels, model.s_season_types, bounds=(0,None),
                                       doc='casual labour used by fixed activities in each labour period for each different worker level')
 
 
@@ -177,7 +177,7 @@ def f_con_casual_bounds(model):
             return  (model.p_casual_lower[p,z], model.v_quantity_casual[q,s,p,z], model.p_casual_upper[p,z]) #pyomos way of: lower <= x <= upper
         else:
             return pe.Constraint.Skip
-    model.con_casual_bounds = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule = casual_labour_availability, doc='bounds the casual labour in each period')
+    model.con_casual_bounds = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule = casual_labour_availability, doc='bounds the casual labour in each period')
 
 def f_con_casual_supervision(model):
     '''
@@ -191,7 +191,7 @@ def f_con_casual_supervision(model):
             return -model.v_casualsupervision_manager[q,s,p,z] - model.v_casualsupervision_perm[q,s,p,z] + (model.p_casual_supervision[p,z] * model.v_quantity_casual[q,s,p,z]) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_casual_supervision = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule = transfer_casual_supervision, doc='casual require supervision from perm or manager')
+    model.con_casual_supervision = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule = transfer_casual_supervision, doc='casual require supervision from perm or manager')
 
 def f_con_perm_supervision(model):
     '''
@@ -211,7 +211,7 @@ def f_manager_holiday_allocation(model):
             return -sum(model.v_manager_holiday_allocation[q,s,p5] for p5 in model.s_labperiods) <= -1 * model.v_quantity_manager
         else:
             return pe.Constraint.Skip
-    model.con_manager_holiday_allocation = pe.Constraint(model.s_sequence_year, model.s_sequence, rule=manager_holiday_allocation, doc='allocates manager holiday to each labour period')
+    model.con_manager_holiday_allocation = pe.Constraint(model.s_sequence_node, rule=manager_holiday_allocation, doc='allocates manager holiday to each labour period')
 
 def f_perm_holiday_allocation(model):
     '''Optimise the timing of perm holidays.'''
@@ -220,7 +220,7 @@ def f_perm_holiday_allocation(model):
             return -sum(model.v_perm_holiday_allocation[q,s,p5] for p5 in model.s_labperiods) <= -1 * model.v_quantity_perm
         else:
             return pe.Constraint.Skip
-    model.con_perm_holiday_allocation = pe.Constraint(model.s_sequence_year, model.s_sequence, rule=perm_holiday_allocation, doc='allocates perm holiday to each labour period')
+    model.con_perm_holiday_allocation = pe.Constraint(model.s_sequence_node, rule=perm_holiday_allocation, doc='allocates perm holiday to each labour period')
 
 def f_con_labour_transfer_manager(model):
     '''Transfer manager labour to livestock, cropping, fixed and supervising activities.'''
@@ -232,7 +232,7 @@ def f_con_labour_transfer_manager(model):
             + sum(model.v_sheep_labour_manager[q,s,p,w,z] + model.v_phase_labour_manager[q,s,p,w,z] + model.v_fixed_labour_manager[q,s,p,w,z] for w in model.s_worker_levels)  <= 0
         else:
             return pe.Constraint.Skip
-    model.con_labour_transfer_manager = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule = labour_transfer_manager, doc='labour from manager to sheep and crop and fixed')
+    model.con_labour_transfer_manager = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule = labour_transfer_manager, doc='labour from manager to sheep and crop and fixed')
 
 def f_con_labour_transfer_permanent(model):
     '''Transfer permanent labour to livestock, cropping, fixed and supervising activities.'''
@@ -244,7 +244,7 @@ def f_con_labour_transfer_permanent(model):
             + sum(model.v_sheep_labour_permanent[q,s,p,w,z] + model.v_phase_labour_permanent[q,s,p,w,z] + model.v_fixed_labour_permanent[q,s,p,w,z] for w in model.s_worker_levels if w in sinp.general['worker_levels'][0:-1]) <= 0 #if statement just to remove unnecessary activities from lp output
         else:
             return pe.Constraint.Skip
-    model.con_labour_transfer_permanent = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule = labour_transfer_permanent, doc='labour from permanent staff to sheep and crop and fixed')
+    model.con_labour_transfer_permanent = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule = labour_transfer_permanent, doc='labour from permanent staff to sheep and crop and fixed')
 
 def f_con_labour_transfer_casual(model):
     '''Transfer casual labour to livestock, cropping and fixed activities.'''
@@ -255,7 +255,7 @@ def f_con_labour_transfer_casual(model):
                 + sum(model.v_sheep_labour_casual[q,s,p,w,z] + model.v_phase_labour_casual[q,s,p,w,z] + model.v_fixed_labour_casual[q,s,p,w,z] for w in model.s_worker_levels if w in sinp.general['worker_levels'][0])  <= 0  #if statement just to remove unnecessary activities from lp output
         else:
             return pe.Constraint.Skip
-    model.con_labour_transfer_casual = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule = labour_transfer_casual, doc='labour from casual staff to sheep and crop and fixed')
+    model.con_labour_transfer_casual = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule = labour_transfer_casual, doc='labour from casual staff to sheep and crop and fixed')
 
 
 
@@ -22,21 +22,21 @@ def f1_machpyomo_local(params, model):
     #variable  #
     ############
     #number of seeding days in each period on each crop and lmu
-    model.v_seeding_machdays = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_labperiods, model.s_landuses, model.s_lmus, bounds=(0,None), doc='number of days of seeding')
+    model.v_seeding_machdays = pe.Var(model.s_sequence_node, model.s_season_types, model.s_labperiods, model.s_landuses, model.s_lmus, bounds=(0,None), doc='number of days of seeding')
     #number of ha seeded using contractor
-    model.v_contractseeding_ha = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_labperiods,
+    model.v_contractseeding_ha = pe.Var(model.s_sequence_node, model.s_season_types, model.s_labperiods,
                                         model.s_landuses, model.s_lmus, bounds=(0,None), doc='number of ha contract seeding for each crop')
     #number of hours harvesting for each crop - there is a constraint to limit this to the hours available in the harvest period
-    model.v_harv_hours = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_labperiods,
+    model.v_harv_hours = pe.Var(model.s_sequence_node, model.s_season_types, model.s_labperiods,
                                 model.s_crops, bounds=(0,None), doc='number of hours of harvesting')
     #number of contract hours harvesting for each crop
-    model.v_contractharv_hours = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_labperiods, model.s_crops, bounds=(0,None), doc='number of contract hours of harvesting')
+    model.v_contractharv_hours = pe.Var(model.s_sequence_node, model.s_season_types, model.s_labperiods, model.s_crops, bounds=(0,None), doc='number of contract hours of harvesting')
     #tonnes of crop yield that is unharvested (used to transfer between phase periods)
-    model.v_unharvested_yield = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_crops, model.s_season_types, bounds=(0,None), doc='tonnes of crop yield that is unharvested (used to transfer between phase periods)')
+    model.v_unharvested_yield = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_crops, model.s_season_types, bounds=(0,None), doc='tonnes of crop yield that is unharvested (used to transfer between phase periods)')
     #tonnes of hay made
-    model.v_hay_made = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, bounds=(0,None), doc='tonnes of hay made')
+    model.v_hay_made = pe.Var(model.s_sequence_node, model.s_season_types, bounds=(0,None), doc='tonnes of hay made')
     #tonnes of hay ready to be bailed
-    model.v_hay_tobe_made = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, bounds=(0,None), doc='tonnes of hay ready to be bailed')
+    model.v_hay_tobe_made = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, bounds=(0,None), doc='tonnes of hay ready to be bailed')
 
 
     #########
@@ -125,7 +125,7 @@ def f_con_seed_period_days(model):
             model.p_seed_days[p,z] * model.p_number_seeding_gear * model.p_seeding_occur
         else:
             return pe.Constraint.Skip
-    model.con_seed_period_days = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule=seed_period_days, doc='constrain the number of seeding days per seed period')
+    model.con_seed_period_days = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule=seed_period_days, doc='constrain the number of seeding days per seed period')
 
 def f_con_harv_hours_limit(model):
     '''
@@ -140,7 +140,7 @@ def f_con_harv_hours_limit(model):
             return sum(model.v_harv_hours[q,s,z,p,k] for k in model.s_crops) <= model.p_harv_hrs_max[p,z] * model.p_number_harv_gear
         else:
             return pe.Constraint.Skip
-    model.con_harv_hours_limit = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_labperiods, model.s_season_types, rule=harv_hours_limit, doc='constrain the number of hours of harvest x crop gear can provide')
+    model.con_harv_hours_limit = pe.Constraint(model.s_sequence_node, model.s_labperiods, model.s_season_types, rule=harv_hours_limit, doc='constrain the number of hours of harvest x crop gear can provide')
 
 # def f_con_sow_supply(model):
 #     '''
@@ -0,0 +1,152 @@
+'''
+Model size telemetry.
+
+Records the size of each pyomo Var, Param and Constraint so the cost of building the model can be tracked between
+trials and between code versions. For each component the following is recorded:
+
+    - construct_time: seconds taken by pyomo to construct the component (captured from the pyomo construction timer).
+    - indices: size of the index set of the component.
+    - stored: number of entries actually stored in the component (e.g. a Param with a default only stores the
+              values it was initialised with).
+    - nonzeros: Param - number of stored values that are not 0.
+                Constraint - number of matrix coefficients (variables in the constraint bodies).
+                Var - number of matrix coefficients in the variable columns.
+                The coefficients are only counted if requested because it requires walking every constraint body
+                (nan otherwise).
+    - memory: approximate bytes held by the component and its stored data objects.
+
+Only the stored data is looked at so the summary is quick to make even if the index sets are large. The
+construction timer is started before the model is built (in AfoInit.exp) and the size summary is saved next to
+the other outputs (in SaveOutputs) if write_model_size is set in RunAfoRaw. To compare two trials or two code
+versions use f_diff_model_size or run from the command line::
+
+    python -m lib.AfoLogic.ModelSize "Output/Model size - a.csv" "Output/Model size - b.csv"
+
+@author: young
+'''
+import logging
+import sys
+import numpy as np
+import pandas as pd
+import pyomo.environ as pe
+from pyomo.core.expr.current import identify_variables
+
+##construction time of each component in the current model {component name: seconds}
+d_construct_time = {}
+
+
+class _ConstructionHandler(logging.Handler):
+    '''Logging handler that stores the time pyomo reports when each component is constructed.'''
+    def emit(self, record):
+        timer = record.msg
+        try:
+            name = timer.obj.name
+            d_construct_time[name] = d_construct_time.get(name, 0) + timer.timer
+        except AttributeError: #some other message sent to the construction logger
+            pass
+
+_handler = _ConstructionHandler()
+_construction_logger = logging.getLogger('pyomo.common.timing.construction')
+
+
+def f1_start_construction_log():
+    '''Reset the construction times and start recording. Called before the pyomo model is created.'''
+    d_construct_time.clear()
+    if _handler not in _construction_logger.handlers:
+        _construction_logger.addHandler(_handler)
+    _construction_logger.setLevel(logging.INFO)
+
+
+def f1_stop_construction_log():
+    '''Stop recording construction times.'''
+    _construction_logger.removeHandler(_handler)
+    _construction_logger.setLevel(logging.NOTSET)
+
+
+def f1_stored_data(component):
+    '''Dict of the data stored in a component (only the entries that exist - not the whole index set).'''
+    if component.is_indexed():
+        return component._data
+    return {None: component}
+
+
+def f1_memory(component):
+    '''Approximate bytes held by a component and its stored data objects.'''
+    memory = sys.getsizeof(component)
+    if component.is_indexed():
+        data = f1_stored_data(component)
+        memory += sys.getsizeof(data) + sum(sys.getsizeof(c) for c in data.values())
+    return memory
+
+
+def f1_index_size(component):
+    '''Size of the index set of a component (1 if the component is not indexed).'''
+    if component.is_indexed():
+        return len(component.index_set())
+    return 1
+
+
+def f_model_size(model, coefficients=False):
+    '''
+    Summarise the size of each Var, Param and Constraint in the model.
+
+    :param model: pyomo model (after it has been built).
+    :param coefficients: if True the matrix coefficients of each Constraint and Var are counted (walks every
+                         constraint body so it is slow for big models).
+    :return: DataFrame with one row per component and columns type, construct_time, indices, stored, nonzeros, memory.
+    '''
+    ##count the coefficients of each constraint and the number of coefficients in each var
+    d_con_nz = {}
+    d_var_nz = {}
+    if coefficients:
+        for c in model.component_objects(pe.Constraint, active=True):
+            nz = 0
+            for con in c.values():
+                for v in identify_variables(con.body, include_fixed=False):
+                    nz += 1
+                    var_name = v.parent_component().name
+                    d_var_nz[var_name] = d_var_nz.get(var_name, 0) + 1
+            d_con_nz[c.name] = nz
+
+    rows = []
+    for ctype, name in ((pe.Var, 'Var'), (pe.Param, 'Param'), (pe.Constraint, 'Constraint')):
+        for c in model.component_objects(ctype, active=True):
+            data = f1_stored_data(c)
+            if ctype is pe.Param:
+                nz = sum(1 for value in data.values() if pe.value(value) != 0)
+            elif not coefficients:
+                nz = np.nan
+            elif ctype is pe.Constraint:
+                nz = d_con_nz[c.name]
+            else:
+                nz = d_var_nz.get(c.name, 0)
+            rows.append((c.name, name, d_construct_time.get(c.name, 0), f1_index_size(c), len(data), nz, f1_memory(c)))
+    model_size = pd.DataFrame(rows, columns=['component', 'type', 'construct_time', 'indices', 'stored', 'nonzeros', 'memory'])
+    return model_size.set_index('component')
+
+
+def f_diff_model_size(path_a, path_b):
+    '''
+    Compare two model size summaries (e.g. two trials or the same trial run with two code versions).
+
+    :param path_a: path to the first model size csv.
+    :param path_b: path to the second model size csv.
+    :return: DataFrame with the value from each summary and the change (b - a) for each component. Components only
+             in one summary are included with nan for the other. Sorted by the change in construction time.
+    '''
+    size_a = pd.read_csv(path_a, index_col=0)
+    size_b = pd.read_csv(path_b, index_col=0)
+    cols = ['construct_time', 'indices', 'stored', 'nonzeros', 'memory']
+    ##summaries written before stored was recorded don't have that column
+    size_a = size_a.reindex(columns=size_a.columns.union(cols))
+    size_b = size_b.reindex(columns=size_b.columns.union(cols))
+    diff = pd.concat([size_a[cols], size_b[cols], size_b[cols] - size_a[cols]], axis=1, keys=['a', 'b', 'change'])
+    diff[('type', '')] = size_b['type'].combine_first(size_a['type'])
+    return diff.sort_values(('change', 'construct_time'), ascending=False, key=abs)
+
+
+if __name__ == '__main__':
+    pd.set_option('display.width', 200)
+    diff = f_diff_model_size(sys.argv[1], sys.argv[2])
+    print(diff.groupby(('type', '')).sum(numeric_only=True).T) #totals for each component type
+    print(diff.head(int(sys.argv[3]) if len(sys.argv) > 3 else 30))
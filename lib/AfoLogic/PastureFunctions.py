@@ -108,18 +108,26 @@ def f_germination(i_germination_std_zt, i_germ_scalar_lzt, i_germ_scalar_p6zt
     '''
     #todo currently all germination occurs in period 0, however, other code handles germination in other periods if the inputs & this code are changed
     germ_scalar_rt = np.zeros(rt,dtype = 'float64')
-    for t, pasture in enumerate(pastures):
-        phase_germresow_df['germ_scalar']=0 #set default to 0
-        ###loop through each combo of landuses and pastures (i_phase_germ), then check which rotations fall into each germ category. Then populate the rot phase df with the necessary germination param.
-        for ix_row in i_phase_germ_dict[pasture].index:
-            ix_bool = pd.Series(data=True,index=range(len(phase_germresow_df)))
-            for ix_col in range(i_phase_germ_dict[pasture].shape[1]-1):    #-1 because one of the cols is germ
-                c_set = sinp.landuse[i_phase_germ_dict[pasture].iloc[ix_row,ix_col]]
-                ix_bool &= phase_germresow_df.loc[:,ix_col].reset_index(drop=True).isin(c_set) #had to drop index so that it would work (just said false when the index was different between series)
-            ### maps the relevant germ scalar and resown bool to the rotation phase
-            phase_germresow_df.loc[list(ix_bool),'germ_scalar'] = i_phase_germ_dict[pasture].iloc[ix_row, -1]  #have to make bool into a list for some reason it doesn't like a series
-        ### Convert germ and resow into a numpy - each pasture goes in a different slice
-        germ_scalar_rt[:,t] = phase_germresow_df['germ_scalar'].to_numpy()    # extract the germ_scalar from the dataframe
+    ##the germ rules (a landuse set for each yr of the history and a germ scalar) for all pastures are matched against the
+    ## phases in one pass using a landuse membership matrix (phase landuse x rule landuse set).
+    l_germ_rules = [i_phase_germ_dict[pasture].values for pasture in pastures]
+    germ_rules_uy = np.concatenate([rules[:, :-1] for rules in l_germ_rules]) #-1 because one of the cols is germ
+    germ_scalar_u = np.concatenate([rules[:, -1] for rules in l_germ_rules]).astype('float64')
+    rule_t_u = np.concatenate([np.full(len(rules), t) for t, rules in enumerate(l_germ_rules)])
+    phases_ry = phase_germresow_df.loc[:, list(range(germ_rules_uy.shape[1]))].values
+    phase_codes, phase_ix_ry = np.unique(phases_ry, return_inverse=True)
+    rule_codes, rule_ix_uy = np.unique(germ_rules_uy, return_inverse=True)
+    phase_ix_ry = phase_ix_ry.reshape(phases_ry.shape)
+    rule_ix_uy = rule_ix_uy.reshape(germ_rules_uy.shape)
+    member_k_k = sinp.f1_landuse_membership(phase_codes, rule_codes)
+    match_ru = np.ones((len(phases_ry), len(germ_rules_uy)), dtype=bool)
+    for y in range(germ_rules_uy.shape[1]):
+        match_ru &= member_k_k[np.ix_(phase_ix_ry[:, y], rule_ix_uy[:, y])]
+    ##if a phase matches multiple rules the last rule is used (the same as when the rules were applied in order) and phases that match no rule have 0 germination
+    last_rule_ru = np.where(match_ru, np.arange(len(germ_rules_uy)), -1)
+    for t in range(len(pastures)):
+        last_rule_r = np.max(last_rule_ru[:, rule_t_u == t], axis=1, initial=-1)
+        germ_scalar_rt[:, t] = np.where(last_rule_r >= 0, germ_scalar_u[last_rule_r], 0)
 
     ## germination on the arable area of pasture paddocks based on std germ, rotation scalar, lmu scalar and distribution across periods
     arable_germination_p6lrzt = i_germination_std_zt                 \
@@ -740,35 +748,29 @@ def f1_calc_foo_profile(germination_p6lzt, dry_decay_p6zt, length_of_periods_fzt
     grn_foo_end_p6lzt     = np.zeros(p6lzt, dtype = 'float64')
     dry_foo_start_p6lzt   = np.zeros(p6lzt, dtype = 'float64')
     dry_foo_end_p6lzt     = np.zeros(p6lzt, dtype = 'float64')
-    pgr_daily_lt          = np.zeros((n_lmu, n_pasture_types), dtype=float)  #only required if using the ## loop on lmu. The boolean filter method creates the array
 
-    index_t = np.arange(n_pasture_types)
-    ## loop through the feed periods and calculate the foo at the start of each period
+    ## loop through the feed periods and calculate the foo at the start of each period. Each period depends on the
+    ## previous period but the lmu, season and pasture type are all calculated at once.
     for f in range(n_feed_periods):
-        grn_foo_start_p6lzt[f,:,:,:] = germination_p6lzt[f,:,:,:] + grn_foo_end_p6lzt[f-1,:,:,:]
-        dry_foo_start_p6lzt[f,:,:,:] = dry_foo_end_p6lzt[f-1,:,:,:]
-        ##loop season
-        for z in range(n_season):
-            ## alternative approach (a1)
-            ## for pgr by creating an index using searchsorted (requires an lmu loop). ^ More readable than other but requires pgr_daily matrix to be predefined
-            for l in [*range(n_lmu)]: #loop through lmu
-                ###find where foo_start fits into the input data
-                o_idx_t = fun.searchsort_multiple_dim(i_fxg_foo_op6lzt[:,f,l,z,:], grn_foo_start_p6lzt[f,l,z,:], axis_a0=1, axis_v0=0, side='left')
-                pgr_daily_lt[l] = (       c_fxg_a_op6lzt[o_idx_t,f,l,z,index_t] #advanced indexing
-                                  +      c_fxg_b_op6lzt[o_idx_t,f,l,z,index_t] #advanced indexing
-                                  * grn_foo_start_p6lzt[f,l,z,:])
-            grn_foo_end_p6lzt[f,:,z,:] = (              grn_foo_start_p6lzt[f,:,z,:]
-                                         * (1 - grn_senesce_startfoo_p6zt[f,z,:])
-                                         +                 pgr_daily_lt
-                                         *         length_of_periods_fzt[f,z,:]
-                                         * (1 -  grn_senesce_pgrcons_p6zt[f,z,:])) \
-                                        * (1 -     i_grn_senesce_eos_p6zt[f,z,:])
-            senescence_l = grn_foo_start_p6lzt[f,:,z,:]  \
-                          +    pgr_daily_lt * length_of_periods_fzt[f,z,:]  \
-                          -  grn_foo_end_p6lzt[f,:,z,:]
-            dry_foo_end_p6lzt[f,:,z,:] = dry_foo_start_p6lzt[f,:,z,:] \
-                                    * (1 - dry_decay_p6zt[f,z,:]) \
-                                    + senescence_l
+        grn_foo_start_p6lzt[f,...] = germination_p6lzt[f,...] + grn_foo_end_p6lzt[f-1,...]
+        dry_foo_start_p6lzt[f,...] = dry_foo_end_p6lzt[f-1,...]
+        ###find where foo_start fits into the input data (same as searchsorted with side='left' because the input foo is sorted)
+        o_idx_lzt = np.sum(i_fxg_foo_op6lzt[:,f,...] < grn_foo_start_p6lzt[f,...], axis=0)
+        pgr_daily_lzt = (np.take_along_axis(c_fxg_a_op6lzt[:,f,...], o_idx_lzt[na,...], axis=0)[0]
+                       + np.take_along_axis(c_fxg_b_op6lzt[:,f,...], o_idx_lzt[na,...], axis=0)[0]
+                       * grn_foo_start_p6lzt[f,...])
+        grn_foo_end_p6lzt[f,...] = (              grn_foo_start_p6lzt[f,...]
+                                   * (1 - grn_senesce_startfoo_p6zt[f,na,...])
+                                   +                 pgr_daily_lzt
+                                   *         length_of_periods_fzt[f,na,...]
+                                   * (1 -  grn_senesce_pgrcons_p6zt[f,na,...])) \
+                                  * (1 -     i_grn_senesce_eos_p6zt[f,na,...])
+        senescence_lzt = grn_foo_start_p6lzt[f,...]  \
+                       +    pgr_daily_lzt * length_of_periods_fzt[f,na,...]  \
+                       -  grn_foo_end_p6lzt[f,...]
+        dry_foo_end_p6lzt[f,...] = dry_foo_start_p6lzt[f,...] \
+                                 * (1 - dry_decay_p6zt[f,na,...]) \
+                                 + senescence_lzt
     return grn_foo_start_p6lzt, dry_foo_start_p6lzt
 
 def f1_update_reseeding_foo(foo_grn_reseeding_p6lrzt, foo_dry_reseeding_p6lrzt,
@@ -5,6 +5,7 @@ author: Young
 from pyomo import environ as pe
 
 ##AFO modules
+from . import Functions as fun
 from . import Pasture as pas
 from . import FeedsupplyFunctions as fsfun
 
@@ -26,24 +27,24 @@ def f1_paspyomo_local(params, model):
     ###################
     # variable         #
     ###################
-    model.v_greenpas_ha = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_pools, model.s_grazing_int,
+    model.v_greenpas_ha = pe.Var(model.s_sequence_node, model.s_feed_pools, model.s_grazing_int,
                                  model.s_foo_levels, model.s_feed_periods,
                                  model.s_lmus, model.s_season_types, model.s_pastures,bounds=(0,None),
                                  doc='hectares grazed each period for each grazing intensity on each soil in each period')
-    model.v_drypas_consumed = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_pools, model.s_dry_groups,
+    model.v_drypas_consumed = pe.Var(model.s_sequence_node, model.s_feed_pools, model.s_dry_groups,
                                      model.s_feed_periods, model.s_season_types, model.s_lmus,
                                      model.s_pastures, bounds=(0,None),
                                      doc='tonnes of low and high quality dry feed consumed by each sheep pool in each feed period')
-    model.v_drypas_transfer = pe.Var(model.s_sequence_year, model.s_sequence, model.s_dry_groups, model.s_feed_periods,
+    model.v_drypas_transfer = pe.Var(model.s_sequence_node, model.s_dry_groups, model.s_feed_periods,
                                      model.s_season_types, model.s_lmus, model.s_pastures, bounds=(0,None),
                                      doc='tonnes of low and high quality dry feed at end of the period transferred to the following periods in each feed period')
-    model.v_nap_consumed = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_pools, model.s_dry_groups,
+    model.v_nap_consumed = pe.Var(model.s_sequence_node, model.s_feed_pools, model.s_dry_groups,
                                   model.s_feed_periods, model.s_season_types, model.s_pastures, bounds=(0,None),
                                   doc='tonnes of low and high quality dry pasture on crop paddocks consumed by each sheep pool in each feed period')
-    model.v_nap_transfer = pe.Var(model.s_sequence_year, model.s_sequence, model.s_dry_groups, model.s_feed_periods,
+    model.v_nap_transfer = pe.Var(model.s_sequence_node, model.s_dry_groups, model.s_feed_periods,
                                   model.s_season_types, model.s_pastures,bounds=(0,None),
                                   doc='tonnes of low and high quality dry pasture on crop paddocks transferred to the following periods in each feed period')
-    model.v_poc = pe.Var(model.s_sequence_year, model.s_sequence, model.s_feed_pools, model.s_feed_periods, model.s_lmus,
+    model.v_poc = pe.Var(model.s_sequence_node, model.s_feed_pools, model.s_feed_periods, model.s_lmus,
                          model.s_season_types, bounds=(0,None),
                          doc='tonnes of poc consumed by each sheep pool in each period on each lmu')
 
@@ -169,8 +170,9 @@ def f_con_greenpas_within(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
     def greenpas(model,q,s,p6,l,z9,t):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
         if pe.value(model.p_mask_childz_within_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s]) and any(model.p_foo_start_grnha[o,p6,l,z9,t] for o in model.s_foo_levels):
             return sum(model.v_phase_area[q,s,p7,z9,r,l] * (-model.p_germination[p7,p6,l,r,z9,t] - model.p_foo_grn_reseeding[p7,p6,l,r,z9,t])
                        for r in model.s_phases for p7 in model.s_season_periods
@@ -185,7 +187,7 @@ def f_con_greenpas_within(model):
         else:
             return pe.Constraint.Skip
     #todo the greenpas (FOO) and pasarea (ha) could be replaced by a grnha constraint that passes area and foo together. Needs a FooB (base level) and reseeding foo removal and addition associated with the reseeding rotation phases
-    model.con_greenpas_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = greenpas, doc='Within seasons - green pasture of each type available on each soil type in each feed period')
+    model.con_greenpas_within = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = greenpas, doc='Within seasons - green pasture of each type available on each soil type in each feed period')
 
 def f_con_greenpas_between(model):
     '''
@@ -195,9 +197,11 @@ def f_con_greenpas_between(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def greenpas(model,q,s9,p6,l,z9,t):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
+        q_prev = d_q_prev[q]
         if pe.value(model.p_mask_childz_between_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s9]) and any(model.p_foo_start_grnha[o,p6,l,z9,t] for o in model.s_foo_levels):
             return sum(model.v_phase_area[q,s9,p7,z9,r,l] * (-model.p_germination[p7,p6,l,r,z9,t] - model.p_foo_grn_reseeding[p7,p6,l,r,z9,t])
                        for r in model.s_phases for p7 in model.s_season_periods
@@ -214,7 +218,7 @@ def f_con_greenpas_between(model):
         else:
             return pe.Constraint.Skip
     #todo the greenpas (FOO) and pasarea (ha) could be replaced by a grnha constraint that passes area and foo together. Needs a FooB (base level) and reseeding foo removal and addition associated with the reseeding rotation phases
-    model.con_greenpas_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = greenpas, doc='Between seasons - green pasture of each type available on each soil type in each feed period')
+    model.con_greenpas_between = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = greenpas, doc='Between seasons - green pasture of each type available on each soil type in each feed period')
 
 def f_con_drypas_within(model):
     '''
@@ -226,8 +230,9 @@ def f_con_drypas_within(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
     def drypas_within(model,q,s,d,p6,z9,l,t):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
         if pe.value(model.p_mask_childz_within_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s]) and (model.p_dry_removal_t[p6,z9,t] != 0 or model.p_dry_transfer_req_t[p6,z9,t] != 0):
             return sum(model.v_phase_area[q,s,p7,z9,r,l] * model.p_foo_dry_reseeding[p7,d,p6,l,r,z9,t]
                        for r in model.s_phases for p7 in model.s_season_periods)   \
@@ -240,7 +245,7 @@ def f_con_drypas_within(model):
                  + model.v_drypas_transfer[q,s,d,p6,z9,l,t] * model.p_dry_transfer_req_t[p6,z9,t] <=0
         else:
             return pe.Constraint.Skip
-    model.con_drypas_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dry_groups, model.s_feed_periods,
+    model.con_drypas_within = pe.Constraint(model.s_sequence_node, model.s_dry_groups, model.s_feed_periods,
                                             model.s_season_types, model.s_lmus, model.s_pastures, rule = drypas_within, doc='Within seasons: High and low quality dry pasture of each type available in each period')
 
 def f_con_drypas_between(model):
@@ -253,9 +258,11 @@ def f_con_drypas_between(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def drypas_between(model,q,s9,d,p6,z9,l,t):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
+        q_prev = d_q_prev[q]
         if pe.value(model.p_mask_childz_between_fp[p6,z9]) and pe.value(model.p_wyear_inc_qs[q,s9]) and (model.p_dry_removal_t[p6,z9,t] != 0 or model.p_dry_transfer_req_t[p6,z9,t] != 0):
             return sum(model.v_phase_area[q,s9,p7,z9,r,l] * model.p_foo_dry_reseeding[p7,d,p6,l,r,z9,t]
                        for r in model.s_phases for p7 in model.s_season_periods)   \
@@ -272,7 +279,7 @@ def f_con_drypas_between(model):
                  + model.v_drypas_transfer[q,s9,d,p6,z9,l,t] * model.p_dry_transfer_req_t[p6,z9,t] <=0
         else:
             return pe.Constraint.Skip
-    model.con_drypas_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dry_groups, model.s_feed_periods,
+    model.con_drypas_between = pe.Constraint(model.s_sequence_node, model.s_dry_groups, model.s_feed_periods,
                                              model.s_season_types, model.s_lmus, model.s_pastures, rule = drypas_between, doc='Between seasons: High and low quality dry pasture of each type available in each period')
 
 def f_con_nappas(model):
@@ -291,8 +298,9 @@ def f_con_nappas(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
     def nappas(model,q,s,d,p6,z9,t):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
         if (model.p_dry_removal_t[p6,z9,t] == 0 and model.p_dry_transfer_req_t[p6,z9,t] == 0) or not pe.value(model.p_wyear_inc_qs[q, s]):
             return pe.Constraint.Skip
         else:
@@ -303,7 +311,7 @@ def f_con_nappas(model):
                    - sum(model.v_nap_transfer[q,s,d,p6_prev,z8,t] * model.p_dry_transfer_prov_t[p6_prev,z8,t]
                          * model.p_parentz_provwithin_fp[p6_prev,z8,z9] for z8 in model.s_season_types)   \
                    + model.v_nap_transfer[q,s,d,p6,z9,t] * model.p_dry_transfer_req_t[p6,z9,t] <=0
-    model.con_nappas = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dry_groups, model.s_feed_periods, model.s_season_types, model.s_pastures, rule = nappas, doc='High and low quality dry pasture of each type available in each period')
+    model.con_nappas = pe.Constraint(model.s_sequence_node, model.s_dry_groups, model.s_feed_periods, model.s_season_types, model.s_pastures, rule = nappas, doc='High and low quality dry pasture of each type available in each period')
 
 def f_con_pasarea(model):
     '''
@@ -317,7 +325,7 @@ def f_con_pasarea(model):
                  + sum(model.v_greenpas_ha[q,s,f,g,o,p6,l,z,t] for f in model.s_feed_pools for g in model.s_grazing_int for o in model.s_foo_levels) <=0
         else:
             return pe.Constraint.Skip
-    model.con_pasarea = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = pasarea, doc='Pasture area row for growth constraint of each type on each soil for each feed period (ha)')
+    model.con_pasarea = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = pasarea, doc='Pasture area row for growth constraint of each type on each soil for each feed period (ha)')
 
 def f_con_erosion(model):
     '''
@@ -336,7 +344,7 @@ def f_con_erosion(model):
                           for r in model.s_phases for p7 in model.s_season_periods if pe.value(model.p_erosion[p7,p6,l,r,z,t]) != 0) <=0
         else:
             return pe.Constraint.Skip
-    model.con_erosion = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = erosion, doc='total pasture available of each type on each soil type in each feed period')
+    model.con_erosion = pe.Constraint(model.s_sequence_node, model.s_feed_periods, model.s_lmus, model.s_season_types, model.s_pastures, rule = erosion, doc='total pasture available of each type on each soil type in each feed period')
 
     
 ###################
@@ -35,11 +35,42 @@ from . import Exceptions as exc
 
 na = np.newaxis
 
+##########################
+#period registry         #
+##########################
+##period definitions for the current trial {period type: value}. The periods are used by nearly every precalc module
+## so each definition is calculated once per trial (rather than rebuilt from the inputs on every call).
+## The registry is cleared in pinp.f1_expand_p6 (after the SA have been applied) so it is rebuilt for each trial.
+d_periods = {}
+
+def f1_reset_periods():
+    '''Clear the period registry. Must be called after the inputs are updated for a new trial.'''
+    d_periods.clear()
+
+def f1_stored_period(period, f_calc):
+    '''
+    Return a period definition from the registry - it is calculated the first time it is requested in the trial.
+
+    :param period: key of the period definition in the registry.
+    :param f_calc: function (no args) that calculates the period definition.
+    :return: a copy of the stored value so the caller can alter it without changing the registry (if f_calc returns
+             a tuple each item is copied).
+    '''
+    if period not in d_periods:
+        d_periods[period] = f_calc()
+    value = d_periods[period]
+    if isinstance(value, tuple):
+        return tuple(v.copy() for v in value)
+    return value.copy()
+
 #############################
 #define dates of cashflow   #
 #############################
 def f_cashflow_date():
     '''cashflow date. Used to calculate interest. Typically this date is just after the main income for the enterprise.'''
+    return f1_stored_period('c0_cashflow', f1_cashflow_date)
+
+def f1_cashflow_date():
     ##create c0 axis
     cash_date = pinp.sheep['i_date_cashflow_stock_i'][pinp.sheep['i_mask_i']]
     date_cashflow_stock = cash_date.mean(keepdims=True).astype(int) #take mean in case multiple tol included
@@ -48,6 +79,9 @@ def f_cashflow_date():
     return cashflow_date_c0
 
 def f_peak_debt_date():
+    return f1_stored_period('c0_peakdebt', f1_peak_debt_date)
+
+def f1_peak_debt_date():
     date_peakdebt_stock = pinp.sheep['i_date_peakdebt_stock_i'][pinp.sheep['i_mask_i']]
     date_peakdebt_stock = date_peakdebt_stock.mean(keepdims=True).astype(int) #take mean in case multiple tol included
     date_peakdebt_crop = np.array([pinp.crop['i_date_peakdebt_crop']])
@@ -61,6 +95,9 @@ def f_peak_debt_date():
 #function to determine seeding start - starts a specified number of days after season break
 #also used in mach sheet
 def f_wet_seeding_start_date():
+    return f1_stored_period('wet_seeding_start', f1_wet_seeding_start_date)
+
+def f1_wet_seeding_start_date():
     seeding_after_season_start_z = zfun.f_seasonal_inp(pinp.period['seeding_after_season_start'], numpy=True, axis=0)
     seeding_after_season_start_z = seeding_after_season_start_z
     season_break_z = zfun.f_seasonal_inp(pinp.general['i_break'], numpy=True)
@@ -93,6 +130,10 @@ def f_period_end_date(start, length):
 
 
 def f_p_dates_df():
+    '''Labour period (p5) dates.'''
+    return f1_stored_period('p5', f1_p_dates_df)
+
+def f1_p_dates_df():
     periods = pinp.period['i_dsp_lp']
     ##make df
     index = ['P%02d' % i for i in range(len(periods))]
@@ -236,6 +277,22 @@ def f_feed_periods(option=0):
         a_p6std_p6z = fun.searchsort_multiple_dim(fp_std_p6z, fp_p6z, 1, 1, side='right')-1
         return a_p6std_p6z[:-1,:] #drop the last period since that is just the end of the final fp (not a real period)
 
+    ###fp dates with z axis handled (stored in the period registry)
+    fp_p6z = f1_stored_period('p6', f1_feed_period_dates)
+
+    ### return array of fp dates
+    if option==0:
+        return fp_p6z
+
+    ### return length
+    if option==1:
+        fp_len = (fp_p6z[1:,:] - fp_p6z[:-1,:])
+        return fp_len
+
+
+def f1_feed_period_dates():
+    '''Feed period (p6) dates after the season mask is applied.'''
+    fp_p6z = pinp.period['i_dsp_fp_date']
     ###handle z axis
     fp_p6z = zfun.f_seasonal_inp(fp_p6z, numpy=True, axis=1)
 
@@ -247,15 +304,7 @@ def f_feed_periods(option=0):
             pass
         else:
             raise exc.FeedPeriodError('''Season nodes are not all included in feed periods''')
-
-    ### return array of fp dates
-    if option==0:
-        return fp_p6z
-
-    ### return length
-    if option==1:
-        fp_len = (fp_p6z[1:,:] - fp_p6z[:-1,:])
-        return fp_len
+    return fp_p6z
 
 
 #################
@@ -266,6 +315,18 @@ def f_season_periods(keys=False):
     :param keys: Boolean if True this returns the m keys
     :param periods: Boolean if True this returns the m period dates
     '''
+    date_season_node_p7z = f1_stored_period('p7', f1_season_period_dates)
+    len_p7 = date_season_node_p7z.shape[0] - 1  # minus one because end date is not a period
+
+    ##return keys if wanted
+    if keys:
+        keys_p7 = np.array(['zm%s' % i for i in range(len_p7)]) #this is zm because if it were p7 then it gets confusing once the period number is added e.g. p70 (p7[0])
+        return keys_p7
+    else:
+        return date_season_node_p7z
+
+def f1_season_period_dates():
+    '''Season period (p7) dates including the end date of the last period.'''
     date_node_zp7 = zfun.f_seasonal_inp(pinp.general['i_date_node_zm'],numpy=True,axis=0)
     ##if steady state then p7 axis is singleton (start and finish at the break of season).
     ## all node are included even in steady state model if user overwrites.
@@ -280,14 +341,6 @@ def f_season_periods(keys=False):
         end_zp7 = date_node_zp7[:,0:1] + 364  # increment the first date by 1yr so it becomes the end date for the last period
         date_season_node_p7z = np.concatenate([date_node_zp7,end_zp7],
                                             axis=1).T  # put p7 in pos 0 because that how the allocation function requires
-
-    len_p7 = date_season_node_p7z.shape[0] - 1  # minus one because end date is not a period
-
-    ##return keys if wanted
-    if keys:
-        keys_p7 = np.array(['zm%s' % i for i in range(len_p7)]) #this is zm because if it were p7 then it gets confusing once the period number is added e.g. p70 (p7[0])
-        return keys_p7
-    else:
-        return date_season_node_p7z
+    return date_season_node_p7z
 
 
@@ -79,7 +79,6 @@ from . import Finance as fin
 from . import Mach as mac
 from . import RotationPhases as rps
 from . import Sensitivity as sen
-from . import relativeFile
 
 ####################
 #general functions #
@@ -88,9 +87,8 @@ from . import relativeFile
 na = np.newaxis
 
 def f1_sim_inputs(sheet=None, index=None, header=None):
-    ###build path this way so the file can be access even if AFO is run from another directory eg readthedocs or web app.
-    property = pinp.general['i_property_id']
-    return pd.read_excel(relativeFile.findExcel("SimInputs_{0}.xlsx".format(property)), sheet_name=sheet, index_col=index, header=header, engine='openpyxl')
+    ##SimInputs is cached - it is only read from excel when it changes (see pinp.f1_sim_inputs)
+    return pinp.f1_sim_inputs(sheet=sheet, index=index, header=header)
 
 
 def f1_mask_lmu(df, axis):
@@ -1106,6 +1104,16 @@ includes
 -seed cost
 -crop insurance cost
 '''
+def f1_keys_rlc0p7z():
+    '''Keys of the rotation phase, lmu, enterprise, season period and season axes of the rotation cost params.'''
+    keys_r = pinp.phases_r.index
+    lmu_mask = pinp.general['i_lmu_area'] > 0
+    keys_l = pinp.general['i_lmu_idx'][lmu_mask]
+    keys_c0 = sinp.general['i_enterprises_c0']
+    keys_p7 = per.f_season_periods(keys=True)
+    keys_z = zfun.f_keys_z()
+    return keys_r, keys_l, keys_c0, keys_p7, keys_z
+
 def f1_rot_cost(r_vals):
     '''collates all the rotation costs'''
 
@@ -1115,20 +1123,23 @@ def f1_rot_cost(r_vals):
     insurance_cost, insurance_wc = f_insurance(r_vals)
     phase_stubble_cost, phase_stubble_wc = f_phase_stubble_cost(r_vals)
 
-    #note if any array has dtype object then pandas throws error (No axis named 1 for object type Series)
-    cost_rl_p7z = pd.concat([fert_cost, chem_cost, seedcost, insurance_cost, phase_stubble_cost],axis=1).groupby(axis=1,level=(0,1)).sum()
-    wc_rl_c0p7z = pd.concat([fert_wc, chem_wc, seedwc, insurance_wc, phase_stubble_wc],axis=1).groupby(axis=1,level=(0,1,2)).sum()
+    ##convert to numpy and sum the costs - each cost only has the phases/lmus that incur the cost (missing are 0)
+    keys_r, keys_l, keys_c0, keys_p7, keys_z = f1_keys_rlc0p7z()
+    cost_rlp7z = sum(fun.f1_df2np(cost, [keys_r, keys_l, keys_p7, keys_z])
+                     for cost in [fert_cost, chem_cost, seedcost, insurance_cost, phase_stubble_cost])
+    wc_rlc0p7z = sum(fun.f1_df2np(wc, [keys_r, keys_l, keys_c0, keys_p7, keys_z])
+                     for wc in [fert_wc, chem_wc, seedwc, insurance_wc, phase_stubble_wc])
 
-    ##stack
-    cost_p7zlr = cost_rl_p7z.unstack([1,0]).sort_index()
-    wc_c0p7zlr = wc_rl_c0p7z.unstack([1,0]).sort_index()
+    ##put in param order
+    cost_p7zlr = np.transpose(cost_rlp7z, (2,3,1,0))
+    wc_c0p7zlr = np.transpose(wc_rlc0p7z, (2,3,4,1,0))
 
     ##create params for v_phase_change_increase
     ## costs for v_phase_change_increase activities are incurred in the season period when the activity is selected
     ## however the interest is calculated as if the cost was incurred at the normal time (this is because interest
     ## is calculated for each separate cost in the functions above).
-    increment_cost_p7zlr = rps.f_v_phase_increment_adj(cost_p7zlr,p7_pos=-4,z_pos=-3)
-    increment_wc_c0p7zlr = rps.f_v_phase_increment_adj(wc_c0p7zlr,p7_pos=-4,z_pos=-3)
+    increment_cost_p7zlr = rps.f_v_phase_increment_adj(cost_p7zlr,p7_pos=-4,z_pos=-3,numpy=True)
+    increment_wc_c0p7zlr = rps.f_v_phase_increment_adj(wc_c0p7zlr,p7_pos=-4,z_pos=-3,numpy=True)
 
     return cost_p7zlr, increment_cost_p7zlr, wc_c0p7zlr, increment_wc_c0p7zlr
 
@@ -1274,10 +1285,12 @@ def f1_crop_params(params,r_vals):
     params['phase_sow_req'] = phasesow_req.to_dict()
     params['sow_prov'] = sow_prov_p7p5zk.to_dict()
     params['can_sow_p5zk'] = can_sow_p5zk.to_dict()
-    params['rot_cost'] = cost.to_dict()
-    params['increment_rot_cost'] = increment_cost.to_dict()
-    params['rot_wc'] = wc.to_dict()
-    params['increment_rot_wc'] = increment_wc.to_dict()
+    ###rotation costs are sparse (most phases only incur costs in a few periods) so only the non-zero values are stored
+    keys_r, keys_l, keys_c0, keys_p7, keys_z = f1_keys_rlc0p7z()
+    params['rot_cost'] = fun.f1_make_pyomo_dict(cost, [keys_p7, keys_z, keys_l, keys_r])
+    params['increment_rot_cost'] = fun.f1_make_pyomo_dict(increment_cost, [keys_p7, keys_z, keys_l, keys_r])
+    params['rot_wc'] = fun.f1_make_pyomo_dict(wc, [keys_c0, keys_p7, keys_z, keys_l, keys_r])
+    params['increment_rot_wc'] = fun.f1_make_pyomo_dict(increment_wc, [keys_c0, keys_p7, keys_z, keys_l, keys_r])
     params['rot_biomass'] = biomass.to_dict()
     params['biomass2product_kls2'] = biomass2product_kls2.to_dict()
 
@@ -11,6 +11,7 @@ import pyomo.environ as pe
 import timeit
 
 #AFO modules
+from . import Functions as fun
 from . import Phase as phs
 from . import PropertyInputs as pinp
 
@@ -32,22 +33,22 @@ def f1_croppyomo_local(params, model):
     ############
     # variable #
     ############
-    model.v_use_biomass = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, model.s_biomass_uses, bounds=(0,None),
+    model.v_use_biomass = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, model.s_biomass_uses, bounds=(0,None),
                                 doc='tonnes of biomass in each use category')
 
-    model.v_sell_product = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
+    model.v_sell_product = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
                                 doc='tonnes of grain/baled product in each pool sold')
 
-    model.v_product_debit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
+    model.v_product_debit = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
                                 doc='tonnes of grain/baled product in debt (will need to be purchased or provided from harvest)')
 
-    model.v_product_credit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
+    model.v_product_credit = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
                                 doc='tonnes of grain/baled product in credit (can be used for sup feeding or sold)')
 
-    model.v_biomass_debit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, bounds=(0,None),
+    model.v_biomass_debit = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, bounds=(0,None),
                                 doc='tonnes of grain in debt (will need to be purchased or provided from harvest)')
 
-    model.v_biomass_credit = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, bounds=(0,None),
+    model.v_biomass_credit = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_lmus, bounds=(0,None),
                                 doc='tonnes of grain in credit (can be used for sup feeding or sold)')
 
     #########
@@ -89,6 +90,17 @@ def f1_croppyomo_local(params, model):
 
     model.p_can_sow = pe.Param(model.s_labperiods, model.s_season_types, model.s_landuses, initialize=params['can_sow_p5zk'], default = 0.0, doc='mask used to stop model sowing to get poc or crop grazing.')
 
+    ################
+    #sparse index  #
+    ################
+    ##map each row of the core constraints to the non-zero keys of the rotation params (see fun.f1_sparse_index)
+    model.si_rotation_biomass = fun.f1_sparse_index(model.p_rotation_biomass, (1,2,3,4)) #row is (k,l,z,p7)
+    model.si_phasesow_req = fun.f1_sparse_index(model.p_phasesow_req, (1,2)) #row is (k,l)
+    model.si_rotation_cost = fun.f1_sparse_index(model.p_rotation_cost, (0,1)) #row is (p7,z)
+    model.si_increment_rotation_cost = fun.f1_sparse_index(model.p_increment_rotation_cost, (0,1))
+    model.si_rotation_wc = fun.f1_sparse_index(model.p_rotation_wc, (0,1,2)) #row is (c0,p7,z)
+    model.si_increment_rotation_wc = fun.f1_sparse_index(model.p_increment_rotation_wc, (0,1,2))
+
 
 #######################################################################################################################################################
 #######################################################################################################################################################
@@ -108,7 +120,7 @@ def f_rotation_biomass(model,q,s,p7,k,l,z):
     Used in global constraint (con_biomass_transfer). See CorePyomo
     '''
     return sum(model.p_rotation_biomass[r,k,l,z,p7]*model.v_phase_area[q,s,p7,z,r,l]
-               for r in model.s_phases if pe.value(model.p_rotation_biomass[r,k,l,z,p7]) != 0)
+               for r,_,_,_,_ in model.si_rotation_biomass.get((k,l,z,p7), ()))
 
 
 ##############
@@ -137,9 +149,9 @@ def f_phasesow_req(model,q,s,p7,k,l,z):
 
     Used in global constraint (con_sow). See CorePyomo
     '''
-    if any(model.p_phasesow_req[r,k,l] for r in model.s_phases):
-        return sum(model.p_phasesow_req[r,k,l]*model.v_phase_change_increase[q,s,p7,z,r,l] for r in model.s_phases
-                   if pe.value(model.p_phasesow_req[r,k,l]) != 0)
+    if (k,l) in model.si_phasesow_req:
+        return sum(model.p_phasesow_req[r,k,l]*model.v_phase_change_increase[q,s,p7,z,r,l]
+                   for r,_,_ in model.si_phasesow_req[k,l])
     else:
         return 0
 
@@ -155,9 +167,9 @@ def f_rotation_cost(model,q,s,p7,z):
     Used in objective. See CorePyomo
     '''
     return sum(model.p_rotation_cost[p7,z,l,r]*model.v_phase_area[q,s,p7,z,r,l]
-               + model.p_increment_rotation_cost[p7,z,l,r]*model.v_phase_change_increase[q,s,p7,z,r,l]
-               for r in model.s_phases for l in model.s_lmus
-                   if pe.value(model.p_rotation_cost[p7,z,l,r]) != 0 or pe.value(model.p_increment_rotation_cost[p7,z,l,r]) != 0)
+               for _,_,l,r in model.si_rotation_cost.get((p7,z), ())) \
+           + sum(model.p_increment_rotation_cost[p7,z,l,r]*model.v_phase_change_increase[q,s,p7,z,r,l]
+                 for _,_,l,r in model.si_increment_rotation_cost.get((p7,z), ()))
 
 def f_rotation_wc(model,q,s,c0,p7,z):
     '''
@@ -166,9 +178,9 @@ def f_rotation_wc(model,q,s,c0,p7,z):
     Used in global constraint (con_workingcap). See CorePyomo
     '''
     return sum(model.p_rotation_wc[c0,p7,z,l,r]*model.v_phase_area[q,s,p7,z,r,l]
-               + model.p_increment_rotation_wc[c0,p7,z,l,r]*model.v_phase_change_increase[q,s,p7,z,r,l]
-               for r in model.s_phases for l in model.s_lmus
-                   if pe.value(model.p_rotation_wc[c0,p7,z,l,r]) != 0 or pe.value(model.p_increment_rotation_wc[c0,p7,z,l,r]) != 0)
+               for _,_,_,l,r in model.si_rotation_wc.get((c0,p7,z), ())) \
+           + sum(model.p_increment_rotation_wc[c0,p7,z,l,r]*model.v_phase_change_increase[q,s,p7,z,r,l]
+                 for _,_,_,l,r in model.si_increment_rotation_wc.get((c0,p7,z), ()))
 
 
 
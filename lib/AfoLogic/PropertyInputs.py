@@ -17,6 +17,7 @@ import pickle as pkl
 import os.path
 import numpy as np
 import pandas as pd
+from pandas.io.parsers import TextParser
 import copy
 import sys
 
@@ -381,6 +382,9 @@ def f1_expand_p6():
     ##have to import it here since sen.py imports this module
     from . import Periods as per
 
+    ##clear the period registry so the periods are rebuilt from the inputs for this trial
+    per.f1_reset_periods()
+
     ###get association between the input fp and the node adjusted fp
     a_p6std_p6z = per.f_feed_periods(option=2)
     a_p6std_zp6 = a_p6std_p6z.T
@@ -455,6 +459,64 @@ def f1_expand_p6():
 
 
 
+##############
+#SimInputs   #
+##############
+##SimInputs for this process {'path': pkl path, 'mtime': excel mtime, 'sheets': {sheet: raw df}, 'tables': {(sheet, index, header): df}}
+d_sim_inputs = {}
+
+def f1_sim_inputs(sheet=None, index=None, header=None):
+    '''
+    Read a table from SimInputs_{property}.xlsx.
+
+    SimInputs is large so every sheet is converted once to pkl_SimInputs_{property}.pkl (the same as the other inputs,
+    the pickle is only rebuilt if the excel file is newer). The sheets are stored as read (no index or header) and
+    each table is built from its sheet with the parser pd.read_excel uses, so the table is the same as reading it
+    from excel. The sheets and tables are also kept in memory so later trials in the same process don't need to load
+    the pickle again.
+
+    :param sheet: sheet name.
+    :param index: index_col passed to the parser (same as pd.read_excel).
+    :param header: header passed to the parser (same as pd.read_excel).
+    :return: copy of the table (so the cached version can't be altered).
+    '''
+    ###build path this way so the file can be access even if AFO is run from another directory eg readthedocs or web app.
+    property = general['i_property_id']
+    xl_path = relativeFile.findExcel("SimInputs_{0}.xlsx".format(property))
+    pkl_path = relativeFile.findExcel("pkl_SimInputs_{0}.pkl".format(property))
+    xl_mtime = os.path.getmtime(xl_path)
+
+    ##load the sheets - from the pickle if the excel file hasn't changed since it was written, else from excel
+    if d_sim_inputs.get('path') != pkl_path or d_sim_inputs.get('mtime') != xl_mtime:
+        d_sim_inputs.clear()
+        try:
+            if os.path.getmtime(pkl_path) > xl_mtime:
+                with open(pkl_path, "rb") as f:
+                    sheets = pkl.load(f)['sheets']
+            else:
+                sheets = None
+        except (FileNotFoundError, EOFError, KeyError, TypeError, pkl.UnpicklingError): #KeyError/TypeError if the pickle is an old format
+            sheets = None
+        if sheets is None:
+            print('Reading SimInputs from Excel', end=' ', flush=True)
+            sheets = pd.read_excel(xl_path, sheet_name=None, header=None, dtype=object, engine='openpyxl')
+            ###written to a temp file then renamed so another process (e.g. trials run in parallel) never reads a partial
+            ### file. Each process writes every sheet so it doesn't matter which process writes last.
+            tmp_path = "{0}.{1}".format(pkl_path, os.getpid())
+            with open(tmp_path, "wb") as f:
+                pkl.dump({'sheets': sheets}, f, protocol=pkl.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pkl_path)
+            print('- finished')
+        d_sim_inputs.update({'path': pkl_path, 'mtime': xl_mtime, 'sheets': sheets, 'tables': {}})
+
+    ##build the table from the sheet
+    tables = d_sim_inputs['tables']
+    key = (sheet, repr(index), repr(header)) #repr because index and header can be lists
+    if key not in tables:
+        tables[key] = TextParser(d_sim_inputs['sheets'][sheet].values.tolist(), index_col=index, header=header).read()
+    return tables[key].copy()
+
+
 ##############
 #phases      #
 ##############
@@ -491,10 +553,7 @@ def f1_phases(d_rot_info):
         base_yields = crop['yields']
     else:
         ### Simulation version
-        ###build path this way so the file can be access even if AFO is run from another directory eg readthedocs or web app.
-        property = general['i_property_id']
-        xl_path = relativeFile.findExcel("SimInputs_{0}.xlsx".format(property))
-        base_yields = pd.read_excel(xl_path, sheet_name='Yield', index_col=0, header=0, engine='openpyxl')
+        base_yields = f1_sim_inputs(sheet='Yield', index=0, header=0)
     ###if the rotations don't match inputs then rerun rotation generation.
     if len(phases_r) != len(base_yields) or any(base_yields.index!=phases_r.index):
         from . import RotGeneration
@@ -519,10 +578,7 @@ def f1_phases(d_rot_info):
     if crop['user_crop_rot']:
         rot_mask_r = crop['i_user_rot_inc_r']
     else:
-        ###build path this way so the file can be access even if AFO is run from another directory eg readthedocs or web app.
-        property = general['i_property_id']
-        xl_path = relativeFile.findExcel("SimInputs_{0}.xlsx".format(property))
-        rot_mask_r = pd.read_excel(xl_path, sheet_name='RotMask', index_col=0, header=0, engine='openpyxl').squeeze().values
+        rot_mask_r = f1_sim_inputs(sheet='RotMask', index=0, header=0).squeeze().values
 
     ##apply mask
     phases_r = phases_r.loc[rot_mask_r,:]
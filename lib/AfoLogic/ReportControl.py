@@ -12,9 +12,10 @@ properties. For example, they can specify which axes to report in the table (as
 and which to average or another example. The user can also specify report options. For example, what type of profit
 (e.g. is asset opportunity cost included or not) they want to use in the profit by area curve.
 
-To run execute this module with optional args <exp group> <processor number> <report number> <excel display mode>. 
+To run execute this module with optional args <exp group> <processor number> <report number> <excel display mode> <output format>.
 If no arguments are passed, all exp groups are reported, 1 processor is used, the 'default' report group is run
-and rows/cols that contain only 0's are collapsed when written to excel.
+and rows/cols that contain only 0's are collapsed when written to excel. The output format is either xlsx or csv
+(a folder of csv files which is much quicker to write). If args are passed the default output format is csv.
 
 The trials to report are controlled in exp.xl.
 The reports to run for a given report number are controlled in exp.xl.
@@ -55,8 +56,12 @@ from . import relativeFile
 #todo Reports to add:
 # 1. todo add a second mortality report that the weighted average mortality for the animals selected (to complement the current report that is mortality for each w axis)
 
-def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None):
-    '''Function to wrap ReportControl.py so that multiprocessing can be used.'''
+def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None, clear_cache = True):
+    '''Function to wrap ReportControl.py so that multiprocessing can be used.
+
+    :param clear_cache: clear the intermediate results at the end. Set to False if more reports are going to be run for
+                        the same trial (the intermediate results are always cleared when a new trial is reported).
+    '''
     # print('Start processor: {0}'.format(processor))
     # print('Start trials: {0}'.format(trials))
 
@@ -65,6 +70,7 @@ def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None):
     lp_vars_inc = False
 
     reports ={}
+
     ##handle infeasible trials
     if infeasible is None:
         infeasible_path = relativeFile.find(__file__, "../../Output/infeasible", f"{trial_name}.txt")
@@ -74,9 +80,9 @@ def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None):
             infeasible = False
     if infeasible == True:
         reports["infeasible"] = pd.DataFrame([trial_name]).rename_axis('Trial')
-        lp_vars = fun.f_clean_dict(lp_vars)  # if a trial is infeasible or doesn't solve all the lp values are None. This function converts them to 0 so the report can still run.
+        lp_vars = fun.f_clean_dict(dict(lp_vars))  # if a trial is infeasible or doesn't solve all the lp values are None. This function converts them to 0 so the report can still run.
     else:
-        reports["infeasible"] = pd.DataFrame()
+        reports["infeasible"] = pd.DataFrame().rename_axis('Trial')
 
     ##run report functions
     if report_run.loc['run_summary', 'Run']:
@@ -108,17 +114,11 @@ def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None):
         profitarea.loc[trial_name,'profit'] = rfun.f_profit(lp_vars,r_vals,profit_option)
         reports["profitarea"] = profitarea
     if report_run.loc['run_feedbudget', 'Run']:
-        option = 0      #0 mei/hd/day & propn from each source, 1 total mei
+        option = 1      #0 mei/hd/day & propn from each source, 1 total mei
         nv_option = 0   #0 Separate NV pool, NV pool summed.
         dams_cols = [6] #birth opp
         offs_cols = [7] #shear opp
         reports["feed"] = rfun.f_feed_budget(lp_vars, r_vals, option=option, nv_option=nv_option, dams_cols=dams_cols, offs_cols=offs_cols)
-    if report_run.loc['run_feedbudget', 'Run']:
-        option = 1
-        nv_option = 0
-        dams_cols = [6] #birth opp
-        offs_cols = [7] #shear opp
-        reports["feed"] = rfun.f_feed_budget(lp_vars, r_vals, option=option, nv_option=nv_option, dams_cols=dams_cols, offs_cols=offs_cols)
     if report_run.loc['run_feedbudget', 'Run']:
         reports["grazing"] = rfun.f_grazing_summary(lp_vars, r_vals)
     if report_run.loc['run_period_dates', 'Run']:
@@ -1017,4 +1017,7 @@ def f_run_report(lp_vars, r_vals, report_run, trial_name, infeasible = None):
         #returns consumption in each FP
         reports["mvf"] = rfun.f_mvf_summary(lp_vars)
 
+    ##intermediate results are reused by each report for this trial (a new trial clears them automatically)
+    if clear_cache:
+        rfun.f1_clear_trial_cache()
     return reports
@@ -25,16 +25,28 @@ from matplotlib import pyplot as plt
 import pickle as pkl
 import os.path
 import sys
+import functools
+import inspect
 import xlsxwriter
 
 from . import Functions as fun
 from . import Exceptions as exc
+from . import ResultsStore as rstore
 
 na = np.newaxis
 
 ###################
 #general functions#
 ###################
+def f1_table_name(sheet, existing):
+    '''Name of a table in a report. The sheet name with a number added if the sheet already has a table.'''
+    name = sheet
+    n = 0
+    while name in existing:
+        n += 1
+        name = f"{sheet}_{n}"
+    return name
+
 def f_df2xl(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=0):
     '''
     Pandas to excel. https://xlsxwriter.readthedocs.io/working_with_pandas.html
@@ -48,7 +60,9 @@ def f_df2xl(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=
     :param writer: writer used. controls the workbook being writen to.
     :param df: dataframe going to excel
     :param sheet: str: sheet name.
-    :param df_settings: df: df to store number of row and col indexes.
+    :param df_settings: df: df to store number of row and col indexes, the sheet and the start col of each table
+                        (used to read the tables back in e.g. XlCombine). The first table in a sheet is named
+                        the sheet name, subsequent tables have a number added e.g. period_dates_1.
     :param rowstart: start row in Excel
     :param colstart: start col in Excel
     :param option: int: specifying the writing option
@@ -58,7 +72,8 @@ def f_df2xl(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=
     '''
     ##store df settings
     if df_settings is not None:
-        df_settings.loc[sheet] = [df.index.nlevels, df.columns.nlevels]
+        name = f1_table_name(sheet, df_settings.index)
+        df_settings.loc[name] = [df.index.nlevels, df.columns.nlevels, sheet, colstart]
     
     ## round to tidy and so that very small numbers are dropped out in the next step
     df = df.round(3)  
@@ -83,18 +98,20 @@ def f_df2xl(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=
 
     ## collapse cols with all 0's (rows are removed
     if option==1:
-        for row in range(len(df)-1):   #range(len(df)) hides the last blank row but causes a blank line in some of report.xl
-            if (df.iloc[row]==0).all():
-                offset = df.columns.nlevels #number of columns used for names
-                if offset>1:
-                    offset += 1 #for some reason if the cols are multiindex the an extra row gets added when writing to excel
-                worksheet.set_row(row+offset,None,None,{'level': 1, 'hidden': True}) #set hidden to true to collapse the level initially
-
-        for col in range(len(df.columns)):
-            if (df.iloc[:,col]==0).all():
-                offset = df.index.nlevels
-                col = xlsxwriter.utility.xl_col_to_name(col+offset) + ':' + xlsxwriter.utility.xl_col_to_name(col+offset) #convert col number to excel col reference e.g. 'A:B'
-                worksheet.set_column(col,None,None,{'level': 1, 'hidden': True})
+        ##find the rows and cols that are all 0 for the whole df at once then only loop over those
+        zero_df = (df==0).values
+        zero_rows = np.flatnonzero(zero_df.all(axis=1)[:len(df)-1])   #len(df) hides the last blank row but causes a blank line in some of report.xl
+        zero_cols = np.flatnonzero(zero_df.all(axis=0))
+        offset = df.columns.nlevels #number of columns used for names
+        if offset>1:
+            offset += 1 #for some reason if the cols are multiindex the an extra row gets added when writing to excel
+        for row in zero_rows:
+            worksheet.set_row(row+offset,None,None,{'level': 1, 'hidden': True}) #set hidden to true to collapse the level initially
+
+        offset = df.index.nlevels
+        for col in zero_cols:
+            col = xlsxwriter.utility.xl_col_to_name(col+offset) + ':' + xlsxwriter.utility.xl_col_to_name(col+offset) #convert col number to excel col reference e.g. 'A:B'
+            worksheet.set_column(col,None,None,{'level': 1, 'hidden': True})
 
     ##apply filter
     if option==3:
@@ -120,6 +137,38 @@ def f_df2xl(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=
 
     return df_settings
 
+def f_df2csv(writer, df, sheet, df_settings=None, rowstart=0, colstart=0, option=0):
+    '''
+    Pandas to csv. Headless alternative to f_df2xl (same arguments) which is much quicker for big experiments.
+
+    Each df is written to its own csv (including the index) in the folder passed as writer. The file name is the
+    table name (see df_settings in f_df2xl). The number of row and col index levels for each file is stored in
+    df_settings (written to df_settings.csv in f_save_reports) so the csv can be read back in with the correct index
+    e.g. pd.read_csv(file, index_col=list(range(index)), header=list(range(cols))).
+
+    :param writer: str: path to the folder the csv files are written to.
+    :param option: int: 2 removes rows and cols that are all 0. Other options are Excel formatting so they are ignored.
+    '''
+    ##file name - if the sheet has multiple dfs (e.g. period_dates) each is saved to a separate file
+    existing = [os.path.splitext(file)[0] for file in os.listdir(writer)]
+    name = f1_table_name(sheet, existing)
+
+    ##store df settings
+    if df_settings is not None:
+        df_settings.loc[name] = [df.index.nlevels, df.columns.nlevels, sheet, colstart]
+
+    ## round to tidy and so that very small numbers are dropped out in the next step
+    df = df.round(3)
+
+    ## Remove rows and cols with all 0's
+    if option==2:
+        row_mask = (df != 0).any(axis=1)
+        col_mask = (df != 0).any(axis=0)
+        df = df.loc[row_mask, col_mask]
+
+    df.to_csv(os.path.join(writer, f"{name}.csv"))
+    return df_settings
+
 def f_errors(trial_outdated, trials):
     '''
     The report module conducts three error checks before commencing:
@@ -150,7 +199,7 @@ def f_errors(trial_outdated, trials):
     ##second check if data exists for each desired trial
     non_exist_trials = []
     for trial_name in trials:
-        if os.path.isfile('pkl/pkl_r_vals_{0}.pkl'.format(trial_name)):
+        if rstore.f_results_exist(trial_name):
             pass
         else:
             print('''WARNING: Trials for reporting don't all exist''')
@@ -169,10 +218,15 @@ def f_errors(trial_outdated, trials):
 
 def load_pkl(trial_name):
     '''load in lp_vars and r_vals output file.
+
+    lp_vars and r_vals are loaded lazily from the results store (each key is read when it is first used). Trials saved
+    before the results store was used are read from the full pickles.
     '''
+    if os.path.isfile(rstore.f_index_path(trial_name)):
+        return rstore.f_load_results(trial_name)
     with open('pkl/pkl_lp_vars_{0}.pkl'.format(trial_name),"rb") as f:
         lp_vars = pkl.load(f)
-    with open('pkl/pkl_r_vals_{0}.pkl'.format(trial_name),"rb") as f:
+    with open(rstore.f_legacy_path(trial_name),"rb") as f:
         r_vals = pkl.load(f)
     return lp_vars, r_vals
 
@@ -243,6 +297,19 @@ def f_append_dfs(stacked_df, additional_df):
     new_stacked_df = new_stacked_df.reindex(cols,axis=1)
     return new_stacked_df.fillna(0) #fill na with 0 so that the function that writes to xl can hide the rows/cols (na gets entered if the two dfs being appended don't have all the same cols)
 
+def f_stack_dfs(dfs):
+    '''
+    Stack a list of dfs (e.g. the same report from each trial). Same result as appending each df with f_append_dfs
+    but the data is only copied once.
+    '''
+    stacked_df = pd.concat(dfs, axis=0)
+    ##reset index order. If two dfs are appended with different columns the pandas append function sorts the index.
+    cols = dfs[0].columns
+    for df in dfs[1:]:
+        cols = cols.union(df.columns,sort=False)
+    stacked_df = stacked_df.reindex(cols,axis=1)
+    return stacked_df.fillna(0) #fill na with 0 so that the function that writes to xl can hide the rows/cols
+
 ########################
 # across trial reports #
 ########################
@@ -263,6 +330,44 @@ def f_xy_graph(data):
 ###################
 # variable setup  #
 ###################
+##intermediate results for the current trial - several reports use the same reshaped variables and summaries
+## (e.g. f_stock_reshape, f_profit, f_area_summary) so each one is only calculated once per trial.
+d_trial_cache = {}
+
+def f1_trial_cache(func):
+    '''
+    Memoise a report function that takes (lp_vars, r_vals, ...) so it is only calculated once for each trial and set
+    of arguments. Only the most recent lp_vars/r_vals are cached (a new trial clears the cache) and the cache is also
+    cleared at the end of ReportControl.f_run_report.
+
+    .. note:: The results are shared between reports so they must not be altered in place.
+    '''
+    sig = inspect.signature(func)
+    @functools.wraps(func)
+    def wrapper(lp_vars, r_vals, *args, **kwargs):
+        ##lp_vars and r_vals are stored (not just their id) so a new trial can't be mistaken for the cached one
+        trial = d_trial_cache.get('trial')
+        if trial is None or trial[0] is not lp_vars or trial[1] is not r_vals:
+            d_trial_cache.clear()
+            d_trial_cache['trial'] = (lp_vars, r_vals)
+        ##key is the function and the value of each argument (including defaults) so the same call with positional or key word args is only calculated once
+        bound = sig.bind(lp_vars, r_vals, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__,) + tuple(bound.arguments.values())[2:]
+        try:
+            return d_trial_cache[key]
+        except KeyError:
+            result = d_trial_cache[key] = func(lp_vars, r_vals, *args, **kwargs)
+            return result
+        except TypeError: #unhashable arg (e.g. a list) so just calculate
+            return func(lp_vars, r_vals, *args, **kwargs)
+    return wrapper
+
+def f1_clear_trial_cache():
+    '''Clear the intermediate results from the previous trial.'''
+    d_trial_cache.clear()
+
+@f1_trial_cache
 def f_stock_reshape(lp_vars, r_vals):
     '''
     Stock reshape. Gets everything into the correct shape.
@@ -367,6 +472,7 @@ def f_stock_reshape(lp_vars, r_vals):
     return stock_vars
 
 
+@f1_trial_cache
 def f_feed_reshape(lp_vars, r_vals):
     '''
     Reshape feed (pasture, residue & crop grazing) lp variables into numpy array.
@@ -496,6 +602,7 @@ def f_feed_reshape(lp_vars, r_vals):
     return feed_vars
 
 
+@f1_trial_cache
 def f_mach_reshape(lp_vars, r_vals):
     '''
     Reshape mach lp variables into numpy array.
@@ -658,6 +765,7 @@ def f_summary(lp_vars, r_vals, trial):
 
 
 
+@f1_trial_cache
 def f_rotation(lp_vars, r_vals):
     '''
     manipulates the rotation solution into usable format. This is used in many function.
@@ -679,6 +787,7 @@ def f_rotation(lp_vars, r_vals):
     return phases_rk, v_phase_change_increase_area_qszrl_p7, v_phase_area_qszrl_p7, v_phase_area_qszlrk_p7
 
 
+@f1_trial_cache
 def f_area_summary(lp_vars, r_vals, option):
     '''
     Rotation & landuse area summary. With multiple output levels.
@@ -783,6 +892,7 @@ def f_area_summary(lp_vars, r_vals, option):
             return round(canola_area_mean, 1), round(canola_area_max, 1), round(canola_area_min, 1), round(canola_area_stdev, 1)
 
 
+@f1_trial_cache
 def f_mach_summary(lp_vars, r_vals, option=0):
     '''
     Machine summary.
@@ -927,6 +1037,7 @@ def f_biomass_penalty(lp_vars, r_vals):
     penalty.columns=['seeding', 'crop_grazing']
     return penalty
 
+@f1_trial_cache
 def f_grain_sup_summary(lp_vars, r_vals, option=0):
     '''
     Summary of grain, supplement and their costs
@@ -1018,6 +1129,7 @@ def f_mvf_summary(lp_vars):
     return mvf_qsp6vq.unstack([-1,-2])
 
 
+@f1_trial_cache
 def f_crop_summary(lp_vars, r_vals, option=0):
     '''
     Crop summary. Includes pasture inputs.
@@ -1096,6 +1208,7 @@ def f_crop_summary(lp_vars, r_vals, option=0):
         return exp_fert_k_p7zqs, exp_chem_k_p7zqs, misc_exp_k_p7zqs, rev_grain_k_p7zqs
 
 
+@f1_trial_cache
 def f_stock_cash_summary(lp_vars, r_vals):
     '''
     Returns:
@@ -1200,6 +1313,7 @@ def f_stock_cash_summary(lp_vars, r_vals):
     return stocksale_qszp7, wool_qszp7, husbcost_qszp7, supcost_qsz_p7, purchasecost_qszp7, trade_value_qszp7
 
 
+@f1_trial_cache
 def f_labour_summary(lp_vars, r_vals, option=0):
     '''
     :param option:
@@ -1263,6 +1377,7 @@ def f_labour_summary(lp_vars, r_vals, option=0):
         return sheep_labour, crop_labour, fixed_labour
 
 
+@f1_trial_cache
 def f_dep_summary(lp_vars, r_vals):
     ##depreciation total
     keys_p7 = r_vals['fin']['keys_p7']
@@ -1278,6 +1393,7 @@ def f_dep_summary(lp_vars, r_vals):
     dep_qsp7z = f_vars2np(lp_vars, 'v_dep', qsp7z, mask_season_p7z, z_pos=-1)
     return dep_qsp7z
 
+@f1_trial_cache
 def f_minroe_summary(lp_vars, r_vals):
     ##min return on expense cost
     keys_p7 = r_vals['fin']['keys_p7']
@@ -1294,6 +1410,7 @@ def f_minroe_summary(lp_vars, r_vals):
     minroe_qsp7z = f_vars2np(lp_vars, 'v_minroe', qsp7z, mask_season_p7z, z_pos=-1)
     return minroe_qsp7z
 
+@f1_trial_cache
 def f_asset_cost_summary(lp_vars, r_vals):
     ##asset opportunity cost
     keys_p7 = r_vals['fin']['keys_p7']
@@ -1334,6 +1451,7 @@ def f_overhead_summary(r_vals):
     exp_fix_c = r_vals['fin']['overheads']
     return exp_fix_c
 
+@f1_trial_cache
 def f_dse(lp_vars, r_vals, method, per_ha, summary1=False, summary2=False, summary3=False):
     '''
     DSE calculation.
@@ -1602,6 +1720,7 @@ def f_profitloss_table(lp_vars, r_vals, option=1):
     return pnl
 
 
+@f1_trial_cache
 def f_profit(lp_vars, r_vals, option=0):
     '''returns profit
     0- Profit = rev - (exp + dep)
@@ -1720,7 +1839,7 @@ def f_stock_pasture_summary(lp_vars, r_vals, build_df=True, keys=None, type=None
     if weights is not None:
         weights = vars[weights]
         ###set weights to 0 if very small number (otherwise it can show up in report when it shouldn't)
-        weights[np.isclose(weights, 0)] = 0
+        weights = np.where(np.isclose(weights, 0), 0, weights) #not in place because the reshaped variables are shared between reports
 
     ##initialise prod array from either r_vals or default value (this means you can perform arith with any number - mainly used for pasture when there is no production param)
     if isinstance(prod, str):
@@ -1750,7 +1869,10 @@ def f_stock_pasture_summary(lp_vars, r_vals, build_df=True, keys=None, type=None
     ##check for errors
     f_numpy2df_error(prod, weights, arith_axis, index, cols)
     if build_df:
-        prod = f_numpy2df(prod, keys, index, cols)
+        ###the index and cols are cached for the trial because many reports use the same keys (the slice is included
+        ### in the cache key because it changes the keys)
+        slice_key = tuple((axis, tuple(slc)) for axis, slc in sorted(axis_slice.items()))
+        prod = f_numpy2df(prod, keys, index, cols, cache_key=(type, keys_key, slice_key))
         return prod
     else:
         return prod, keys
@@ -2191,21 +2313,26 @@ def f_slice(prod, prod_weights, weights, den_weights, keys, arith, axis_slice):
     :return: prod array
     '''
     ##slice axis - slice the keys and the array - if user hasn't specified slice the whole axis will be included
-    sl = [slice(None)] * prod.ndim
     keys = keys.copy()  # need to copy so that it doesn't change the underlying array (because assigning in a loop)
     for axis, slc in axis_slice.items():
-        start = slc[0]
-        stop = slc[1]
-        step = slc[2]
-        sl[axis] = slice(start, stop, step)
-        keys[axis] = keys[axis][start:stop:step]
+        keys[axis] = keys[axis][slc[0]:slc[1]:slc[2]]
     ###apply slice to np array
-    ### if arith is being conducted these arrays need to be the same size so slicing can work
-    prod, prod_weights, weights, den_weights = np.broadcast_arrays(prod, prod_weights, weights, den_weights)
-    prod = prod[tuple(sl)]
-    prod_weights = prod_weights[tuple(sl)]
-    weights = weights[tuple(sl)]
-    den_weights = den_weights[tuple(sl)]
+    ### the arrays are not broadcast to full size (that is done in the arith), instead each array is only sliced along
+    ### the axes it is active. A singleton axis is the same value for every slice so it is left singleton.
+    weights = np.asarray(weights)
+    den_weights = np.asarray(den_weights)
+    ndim = max(prod.ndim, prod_weights.ndim, weights.ndim, den_weights.ndim)
+    def f1_slice(array):
+        array = array.reshape((1,) * (ndim - array.ndim) + array.shape) #same number of axes as the broadcast array
+        sl = [slice(None)] * array.ndim
+        for axis, slc in axis_slice.items():
+            if array.shape[axis] > 1:
+                sl[axis] = slice(slc[0], slc[1], slc[2])
+        return array[tuple(sl)]
+    prod = f1_slice(prod)
+    prod_weights = f1_slice(prod_weights)
+    weights = f1_slice(weights)
+    den_weights = f1_slice(den_weights)
     return prod, prod_weights, weights, den_weights, keys
 
 
@@ -2226,33 +2353,88 @@ def f_arith(prod, prod_weights, weight, den_weights, arith, axis):
     :param axis: list: axes to perform arith along
     :return: array
     '''
+    ##shape of the result - the arrays are broadcast together (without creating the full array) and the arith axes
+    ## are kept as singleton unless all axes are summed
+    shape = np.broadcast_shapes(*[a.shape for a in (prod, prod_weights, weight, den_weights) if a.dtype != object]) #weight is None (object) if not required
+    keepdims = len(axis) != len(shape)
+    shape_keep = tuple(1 if i in axis else shape[i] for i in range(len(shape))) if keepdims else ()
     ##adjust prod by prod_weights
     prod = prod * prod_weights
-    ##calc if keep dims
-    keepdims = len(axis) != len(prod.shape)
     ##option 0
     if arith == 0:
-        prod = np.mean(prod, tuple(axis), keepdims=keepdims)
+        ###mean of the broadcast array is the same as the mean of prod (singleton axes are just repeated)
+        prod = f1_broadcast_result(np.mean(prod, tuple(axis), keepdims=True), shape_keep)
     ##option 1
     if arith == 1:
-        prod = fun.f_weighted_average(prod, weight, tuple(axis), keepdims=keepdims, den_weights=den_weights)
+        numerator = f1_contract([prod, weight], axis, shape, shape_keep)
+        denominator = f1_contract([weight, den_weights], axis, shape, shape_keep)
+        prod = np.zeros_like(numerator)
+        mask = denominator != 0
+        prod[mask] = numerator[mask] / denominator[mask]
     ##option 2
     if arith == 2:
-        prod = np.sum(prod * weight, tuple(axis), keepdims=keepdims)
+        prod = f1_contract([prod, weight], axis, shape, shape_keep)
     ##option 3
     if arith == 3:
         prod = prod * weight
+        if prod.shape != shape:
+            prod = f1_broadcast_result(prod, shape)
     ##option 4
     if arith == 4:
-        prod = fun.f_divide(np.sum(prod * (prod>0), tuple(axis), keepdims=keepdims), np.sum(prod>0, tuple(axis), keepdims=keepdims))
+        prod = fun.f_divide(f1_contract([prod * (prod>0)], axis, shape, shape_keep), f1_contract([prod>0], axis, shape, shape_keep))
     ##option 5
     if arith == 5:
-        prod = np.max(prod, tuple(axis), keepdims=keepdims)
+        prod = f1_broadcast_result(np.max(prod, tuple(axis), keepdims=True), shape_keep)
 
     return prod
 
 
-def f_numpy2df(prod, keys, index, cols):
+def f1_contract(arrays, axis, shape, shape_keep):
+    '''
+    Sum the product of the arrays along axis using np.einsum so the broadcast product is never created.
+
+    :param arrays: list of arrays that broadcast to shape.
+    :param axis: list: axes to sum along.
+    :param shape: shape of the broadcast arrays.
+    :param shape_keep: shape of the result (axis is singleton, or () if all axes are summed).
+    :return: array
+    '''
+    ndim = len(shape)
+    arrays = [np.asarray(a, dtype=float) for a in arrays]
+    labels = [list(range(ndim)) for a in arrays]
+    out = [i for i in range(ndim) if i not in axis]
+    operands = [x for pair in zip(arrays, labels) for x in pair]
+    result = np.einsum(*operands, out)
+    ##einsum sums a singleton axis once, so if the axis is only active in the arrays that are not included (e.g. den_weights) scale by its size
+    for i in axis:
+        if all(a.shape[i] == 1 for a in arrays):
+            result = result * shape[i]
+    ##the kept axes are only as large as the arrays that are included so broadcast to the full result
+    result = result.reshape([max(a.shape[i] for a in arrays) for i in out])
+    if shape_keep:
+        result = np.expand_dims(result, tuple(axis))
+    return f1_broadcast_result(result, shape_keep)
+
+
+def f1_broadcast_result(result, shape_keep):
+    '''Broadcast the result of the arith to the shape of the report (if all axes are summed the result is a scalar).'''
+    if shape_keep:
+        return np.broadcast_to(result, shape_keep).copy()
+    else:
+        return np.asarray(result).reshape(())[()]
+
+
+def f_numpy2df(prod, keys, index, cols, cache_key=None):
+    '''
+    Convert a numpy array to a df.
+
+    :param prod: array: each axis that is not singleton must be in index or cols.
+    :param keys: list: keys for each axis.
+    :param index: list: axes that become the index.
+    :param cols: list: axes that become the cols.
+    :param cache_key: (optional) hashable: if passed, the index and cols are cached for the current trial under this key
+                      (they only need to be built once when many reports use the same keys e.g. the stock reports).
+    '''
     if prod.size <= 1 and prod.ndim <= 1:
         return pd.DataFrame([prod])  # don't need to reshape etc. if everything is summed and prod is just one number
     ##move x axis to front
@@ -2284,6 +2466,32 @@ def f_numpy2df(prod, keys, index, cols):
     prod = prod.reshape(x_len, y_len)
 
     ##make df
-    prod = fun.f_produce_df(prod, x_keys, y_keys)
+    if cache_key is None:
+        prod = fun.f_produce_df(prod, x_keys, y_keys)
+    else:
+        x_index = f1_key_index(x_keys, cache_key + (tuple(index),))
+        y_index = f1_key_index(y_keys, cache_key + (tuple(cols),))
+        prod = pd.DataFrame(prod, index=x_index, columns=y_index)
 
     return prod
+
+
+def f1_key_index(keys, cache_key):
+    '''
+    Index built from a list of axis keys (same as fun.f_produce_df). Building a MultiIndex is slow so it is cached for the
+    current trial (the cache is cleared with the other trial results - see f1_trial_cache). A (shallow) copy is returned
+    so renaming the index of one report doesn't change another.
+    '''
+    key = ('f1_key_index',) + cache_key
+    try:
+        return d_trial_cache[key].copy()
+    except KeyError:
+        pass
+    if len(keys) == 0:
+        key_index = pd.Index([0])
+    elif len(keys) == 1:
+        key_index = pd.Index(keys[0])
+    else:
+        key_index = pd.MultiIndex.from_product(keys)
+    d_trial_cache[key] = key_index
+    return key_index.copy()
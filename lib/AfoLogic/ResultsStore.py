@@ -0,0 +1,161 @@
+'''
+Results store for the trial outputs (lp_vars and r_vals).
+
+Each trial is saved to its own folder (pkl/results_<trial name>) with one file per key rather than a single pickle
+for the whole of lp_vars and r_vals. This means the reports only read the keys they use:
+
+    - numeric numpy arrays are saved as .npy and are loaded memory-mapped (copy on write so reports can still
+      alter the array in memory without changing the file).
+    - lp variables (dict of {index: value}) are saved as a .npy of the values and a pickle of the indexes.
+    - everything else (dataframes, scalars, lists etc) is pickled individually.
+    - nested dicts (e.g. r_vals['stock']) are saved in a sub folder.
+
+The folder has an index (index.pkl) mapping each key to its file. The index is written last so it also signals that
+the trial was saved successfully (used by LoadExp.f_run_required to determine if the trial needs to be re-run).
+
+@author: young
+'''
+import os
+import shutil
+import pickle as pkl
+import numpy as np
+from collections.abc import Mapping
+
+from . import relativeFile
+
+
+def f_results_path(trial_name):
+    '''Path to the results folder for a trial.'''
+    return relativeFile.find(__file__, "../../pkl", "results_{0}".format(trial_name))
+
+
+def f_index_path(trial_name):
+    '''Path to the results index for a trial. The index only exists if the trial was successfully saved.'''
+    return os.path.join(f_results_path(trial_name), "index.pkl")
+
+
+def f_legacy_path(trial_name):
+    '''Path to the r_vals pickle of a trial saved before the results store was used (pkl/pkl_r_vals_<trial name>.pkl).'''
+    return relativeFile.find(__file__, "../../pkl", "pkl_r_vals_{0}.pkl".format(trial_name))
+
+
+def f_results_mtime(trial_name):
+    '''
+    Time the results of a trial were saved. Used to check if the trial (and its reports) are up-to-date.
+
+    Trials saved before the results store was used are still valid results so the time of the legacy r_vals pickle
+    is used if the results index doesn't exist.
+
+    :param trial_name: name of the trial.
+    :return: modification time of the results index (or legacy pickle). Raises FileNotFoundError if neither exist.
+    '''
+    try:
+        return os.path.getmtime(f_index_path(trial_name))
+    except FileNotFoundError:
+        return os.path.getmtime(f_legacy_path(trial_name))
+
+
+def f_results_exist(trial_name):
+    '''True if the results for a trial exist (in the results store or the legacy pickles).'''
+    return os.path.isfile(f_index_path(trial_name)) or os.path.isfile(f_legacy_path(trial_name))
+
+
+def f1_save_dict(d, path, is_lp_vars):
+    '''Save each value in a dict to its own file and return the index {key: (kind, file)}. For nested dicts file is (folder, index).'''
+    os.mkdir(path)
+    index = {}
+    for n, (key, value) in enumerate(d.items()):
+        file = os.path.join(path, str(n))
+        if is_lp_vars and isinstance(value, dict):
+            ##lp variable - values stored as an array so they can be loaded without the (large) index
+            np.save(file + '.npy', np.array(list(value.values()), dtype=float))
+            with open(file + '_keys.pkl', "wb") as f:
+                pkl.dump(list(value.keys()), f, protocol=pkl.HIGHEST_PROTOCOL)
+            index[key] = ('var', str(n))
+        elif isinstance(value, dict):
+            index[key] = ('dict', (str(n), f1_save_dict(value, file, is_lp_vars)))
+        elif type(value) is np.ndarray and value.dtype != object and value.size: #subclasses (e.g. masked arrays) are pickled so nothing is lost
+            np.save(file + '.npy', value)
+            index[key] = ('npy', str(n))
+        else:
+            with open(file + '.pkl', "wb") as f:
+                pkl.dump(value, f, protocol=pkl.HIGHEST_PROTOCOL)
+            index[key] = ('pkl', str(n))
+    return index
+
+
+def f_save_results(trial_name, lp_vars, r_vals):
+    '''
+    Save lp_vars and r_vals for a trial. Any existing results for the trial are removed first.
+
+    :param trial_name: name of the trial.
+    :param lp_vars: dict of lp variable values (plus profit, utility and mvf).
+    :param r_vals: dict of report values.
+    '''
+    path = f_results_path(trial_name)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    index = {'lp_vars': f1_save_dict(lp_vars, os.path.join(path, 'lp_vars'), True),
+             'r_vals': f1_save_dict(r_vals, os.path.join(path, 'r_vals'), False)}
+    ##index must be written last because it signals that the results are complete
+    with open(f_index_path(trial_name), "wb") as f:
+        pkl.dump(index, f, protocol=pkl.HIGHEST_PROTOCOL)
+
+
+class LazyResults(Mapping):
+    '''
+    Read only dict of saved results. A value is only loaded from disk the first time it is accessed and is then kept
+    for the life of the object.
+    '''
+    def __init__(self, path, index):
+        self._path = path
+        self._index = index
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._loaded[key]
+        except KeyError:
+            pass
+        kind, file = self._index[key]
+        if kind == 'dict':
+            folder, index = file
+            value = LazyResults(os.path.join(self._path, folder), index)
+        else:
+            file = os.path.join(self._path, file)
+            if kind == 'npy':
+                value = np.load(file + '.npy', mmap_mode='c')
+            elif kind == 'var':
+                with open(file + '_keys.pkl', "rb") as f:
+                    keys = pkl.load(f)
+                values = np.load(file + '.npy')
+                if np.isnan(values).any(): #variables without a value (e.g. infeasible trial) are None in lp_vars
+                    values = np.where(np.isnan(values), None, values)
+                value = dict(zip(keys, values.tolist()))
+            else:
+                with open(file + '.pkl', "rb") as f:
+                    value = pkl.load(f)
+        self._loaded[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+
+def f_load_results(trial_name):
+    '''
+    Lazy load lp_vars and r_vals for a trial.
+
+    :param trial_name: name of the trial.
+    :return: lp_vars, r_vals as read only dicts that load each key when it is first used.
+    '''
+    path = f_results_path(trial_name)
+    with open(f_index_path(trial_name), "rb") as f:
+        index = pkl.load(f)
+    lp_vars = LazyResults(os.path.join(path, 'lp_vars'), index['lp_vars'])
+    r_vals = LazyResults(os.path.join(path, 'r_vals'), index['r_vals'])
+    return lp_vars, r_vals
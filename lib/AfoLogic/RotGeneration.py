@@ -140,6 +140,7 @@ Note a2 (pasture with no cost) doesnt provide anything and it doesnt need to bec
 '''
 ##if you want to use a customised list of rotations this can be set to false - populate the array further down the module.
 customised_rotations = False
+
 def f_rot_gen(user_crop_rot=False): #by default it runs the full rotation list
     print('Running rotation generator')
     yr0 = np.array(['b', 'o', 'w', 'f', 'l', 'z','r','of'#, 'h'- not included in v1 to speed calibration process
@@ -359,16 +360,17 @@ def f_rot_gen(user_crop_rot=False): #by default it runs the full rotation list
         for offset in range(1,np.size(ds_user_rot_init,axis=1)):
             ds_user_rot = np.concatenate((ds_user_rot, np.roll(ds_user_rot_init, offset, axis=1)),axis=0)
         ##the next code simplifies the full list of phases to only include the necessary ones to represent the user rotations.
-        ix_bool=np.zeros(len(phases))
-        ###loop through all rotation phases then loop through all of the user rotations.
-        ###this checks if the rotation phases are a superset of any of the user rotations
-        for s_rot_phase, ix_phase in zip(phases,range(len(phases))):
-            for s_user_rot in ds_user_rot:
-                req=1
-                for i in range(np.size(s_user_rot)):
-                    req*=sinp.landuse[s_rot_phase[i]].issuperset({s_user_rot[i]})
-                ix_bool[ix_phase]=max(req,ix_bool[ix_phase])
-        phases=phases[ix_bool>0]
+        ###this checks if the rotation phases are a superset of any of the user rotations. The sets are encoded as a
+        ###membership matrix so all phases and user rotations are checked together one year at a time.
+        phase_codes, phase_ix = np.unique(phases, return_inverse=True)
+        user_codes, user_ix = np.unique(ds_user_rot, return_inverse=True)
+        phase_ix = phase_ix.reshape(phases.shape)
+        user_ix = user_ix.reshape(ds_user_rot.shape)
+        member_k_k = sinp.f1_landuse_membership(user_codes, phase_codes)
+        ix_bool = np.ones((len(phases), len(ds_user_rot)), dtype=bool)
+        for i in range(np.size(ds_user_rot, axis=1)):
+            ix_bool &= member_k_k[np.ix_(user_ix[:,i], phase_ix[:,i])].T
+        phases=phases[np.any(ix_bool, axis=1)]
 
 
     ##option 2: if you want to represent the rotations from property.xlsx
@@ -397,38 +399,37 @@ def f_rot_gen(user_crop_rot=False): #by default it runs the full rotation list
     #con 1 param     #
     ##################
     '''determines what history1 each rotation requires and provides'''
-    mps_bool_req=[]
-    mps_bool_prov=[]
-    for rot_phase in phases:
-        ##test variable just used to help check all rotations provide and require a history - only for user information.
-        ##every rotation should provide and require a history.
-        test=0
-        test2=0
-        for hist in rot_hist:
-            l_hist=[]
-            for i in range(len(hist)):
-                l_hist.append(sinp.landuse[hist[i]]) #deterimines the sets in each constraint
-            req=1
-            prov=-1
-            for i in range(len(hist)):
-                req*=np.isin(rot_phase[i], list(l_hist[i]))  #checks each set in a given rotation for the req part of the equation
-                prov*=np.isin(rot_phase[i+1],list(l_hist[i])) #checks each set in a given rotation for the prov part of the equation
-            test+=prov
-            test2+=req
-            mps_bool_req.append(req)
-            mps_bool_prov.append(prov)
-        if test==0 and rot_phase[-1]!='a2': #doesn't provide a history. Note a2 (pasture with no cost) doesnt provide anything and it doesnt need to because it is only selected until the latest brk.
-            print('rot does not provide a history: ',rot_phase)
-        if test2==0: #doesn't require a history
-            print('rot does not req a history: ',rot_phase)
-
-    rot_phase_by_constrain = pd.DataFrame(list(itertools.product(l_phases,l_rot_hist) ) ) #had to use this cartesian method as i couldn't get the fast function to work
-    mps_bool_req=pd.Series(mps_bool_req) #convert to series because easier to manipulate
-    mps_bool_prov=pd.Series(mps_bool_prov) #convert to series because easier to manipulate
-    mps_bool_req=pd.concat([rot_phase_by_constrain, mps_bool_req], axis=1) #add two dfs together
-    mps_bool_prov=pd.concat([rot_phase_by_constrain, mps_bool_prov], axis=1) #add two dfs together
-    mps_bool_req = mps_bool_req[(mps_bool_req.iloc[:,2] != 0)]
-    mps_bool_prov = mps_bool_prov[(mps_bool_prov.iloc[:,2] != 0)]
+    ###the landuse sets are encoded as a membership matrix (landuse in phase x set in history) so req and prov can be
+    ###calculated for all phase-history pairs at once. A phase requires a history if each yr of the history (excluding yr0)
+    ###is in the sets of the history, and provides it if each yr (excluding the oldest yr) is in the sets of the history.
+    phase_codes, phase_ix = np.unique(phases, return_inverse=True)
+    hist_codes, hist_ix = np.unique(rot_hist, return_inverse=True)
+    phase_ix = phase_ix.reshape(phases.shape)
+    hist_ix = hist_ix.reshape(rot_hist.shape)
+    member_k_k = sinp.f1_landuse_membership(phase_codes, hist_codes)
+    req_rh = np.ones((len(phases), len(rot_hist)), dtype=bool)
+    prov_rh = np.ones((len(phases), len(rot_hist)), dtype=bool)
+    for i in range(np.size(rot_hist, axis=1)):
+        req_rh &= member_k_k[np.ix_(phase_ix[:,i], hist_ix[:,i])]
+        prov_rh &= member_k_k[np.ix_(phase_ix[:,i+1], hist_ix[:,i])]
+
+    ##check all rotations provide and require a history - only for user information.
+    ##every rotation should provide and require a history.
+    for rot_phase in phases[~np.any(prov_rh, axis=1) & (phases[:,-1] != 'a2')]: #Note a2 (pasture with no cost) doesnt provide anything and it doesnt need to because it is only selected until the latest brk.
+        print('rot does not provide a history: ',rot_phase)
+    for rot_phase in phases[~np.any(req_rh, axis=1)]:
+        print('rot does not req a history: ',rot_phase)
+
+    ##only the non-zero phase-history pairs are stored (req is 1 and prov is -1) with the index being the position in
+    ##the phase x history matrix.
+    l_phases_rh = np.array(l_phases, dtype=object)
+    l_rot_hist_rh = np.array(l_rot_hist, dtype=object)
+    r_req, h_req = np.nonzero(req_rh)
+    r_prov, h_prov = np.nonzero(prov_rh)
+    mps_bool_req = pd.DataFrame({0: l_phases_rh[r_req], 1: l_rot_hist_rh[h_req], 2: 1},
+                                index=r_req * len(rot_hist) + h_req)
+    mps_bool_prov = pd.DataFrame({0: l_phases_rh[r_prov], 1: l_rot_hist_rh[h_prov], 2: -1},
+                                 index=r_prov * len(rot_hist) + h_prov)
 
     ##test to make sure all histories are required (this may not happen if the set definitions are wrong)
     if len(np.unique(mps_bool_req.iloc[:,1].values)) != len(l_rot_hist):
@@ -304,7 +304,8 @@ def f_rot_hist_params(params):
     p_inc_hist_gs1_con_p7z = np.logical_and(p7_constrained_gs1_p7[:,na], season_broken_p7z)
 
 
-    ##history prov and req
+    ##history prov and req - only the non-zero (phase, history) pairs are stored (sparse COO format) from rotation
+    ## generation through to the pyomo params.
     rot_req = pinp.rot_req.set_index([0,1])
     rot_prov = pinp.rot_prov.set_index([0,1])
     params['hist_prov'] = rot_prov.squeeze().to_dict()
@@ -312,6 +313,9 @@ def f_rot_hist_params(params):
 
     ##create constraint mask - this is required when some rotations have been masked out (e.g unprofitbale rotation) - when rot are masked out it can result in nothing requiring a history therefore meaning the constraint needs to be skipped
     phases_r = pinp.phases_r.index #list of phases after the rot mask has been applied
+    ###phases that provide/require each history - so the history constraints only iterate the non-zero pairs rather than all phases
+    params['hist_prov_phases_h'] = f1_hist_phases(rot_prov, phases_r)
+    params['hist_req_phases_h'] = f1_hist_phases(rot_req, phases_r)
     masked_rot_req = rot_req[rot_req.index.get_level_values(0).isin(phases_r)] #mask out the removed rotations from req param
     req_hist = masked_rot_req.index.get_level_values(1).unique() #get the unique histories after rot mask
     ###histories that are required by any rotations
@@ -322,6 +326,24 @@ def f_rot_hist_params(params):
     params['p_inc_hist_gs0_con_p7z'] = fun.f1_make_pyomo_dict(p_inc_hist_gs0_con_p7z*1, arrays_p7z)
     params['p_inc_hist_gs1_con_p7z'] = fun.f1_make_pyomo_dict(p_inc_hist_gs1_con_p7z*1, arrays_p7z)
 
+def f1_hist_phases(rot_hist_rh, phases_r):
+    '''
+    Group the sparse provide/require param by history.
+
+    :param rot_hist_rh: df with the phase and history as the index (only non-zero pairs are included).
+    :param phases_r: phases in the model (after the rot mask).
+    :return: dict {history: list of the phases that provide/require it}. Phases are in the same order as phases_r.
+    '''
+    phase = rot_hist_rh.index.get_level_values(0)
+    hist = rot_hist_rh.index.get_level_values(1)
+    pos = phases_r.get_indexer(phase)
+    mask = pos >= 0 #phases removed by the rot mask are not included
+    order = np.argsort(pos[mask], kind='stable')
+    d_hist_phases = {}
+    for h, r in zip(hist[mask][order], phase[mask][order]):
+        d_hist_phases.setdefault(h, []).append(r)
+    return d_hist_phases
+
 def f_rot_hist4_params(params):
     '''
     History 4 constraint is used to ensure dual landuse follows the correct part a landuse.
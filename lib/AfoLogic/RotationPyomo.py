@@ -8,6 +8,7 @@ import pyomo.environ as pe
 import numpy as np
 
 #AFO modules
+from . import Functions as fun
 from . import RotationPhases as rps
 from . import PropertyInputs as pinp
 
@@ -33,13 +34,13 @@ def f1_rotationpyomo(params, model):
     #variables  #
     #############
     ##Amount of each phase on each soil, Positive Variable.
-    model.v_phase_area = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='cumulative total area (ha) of phase, selected up to and including the current m period')
+    model.v_phase_area = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='cumulative total area (ha) of phase, selected up to and including the current m period')
 
     ##Amount of each phase added in each rotation period on each soil.
-    model.v_phase_change_increase = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='Increased area (ha) of phase, selected in the current m period')
+    model.v_phase_change_increase = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='Increased area (ha) of phase, selected in the current m period')
 
     ##Amount of each phase reduced in each rotation period on each soil.
-    model.v_phase_change_reduce = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='Increased area (ha) of phase, selected in the current m period')
+    model.v_phase_change_reduce = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_phases,model.s_lmus, bounds=(0,None),doc='Increased area (ha) of phase, selected in the current m period')
 
     ####################
     #define parameters #
@@ -121,21 +122,20 @@ def f_con_history_between(params, model):
     due to the seeding cost it will select a dry phase with the correct history from the start).
     '''
 
+    l_p7 = list(model.s_season_periods)
+    p7_end_gs1 = l_p7[pinp.general['i_gs_p7_end'][1]] #p7 period from growing season 1. This provides the history.
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def rot_history_between(model,q,s9,p7,l,h,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_end_gs1 = l_p7[pinp.general['i_gs_p7_end'][1]] #p7 period from growing season 1. This provides the history.
-        l_q = list(model.s_sequence_year)
-        q_prev = l_q[l_q.index(q) - 1]
+        q_prev = d_q_prev[q]
         if pe.value(model.p_wyear_inc_qs[q,s9]) and pe.value(model.p_mask_season_p7z[p7,z9]) and pe.value(model.p_inc_hist_gs1_con[p7,z9]) and params['hist_used'][h]:
             return sum(model.v_phase_area[q_prev,s8,p7_end_gs1,z8,r,l]*model.p_hist_prov[r,h]
                        * (model.p_sequence_prov_qs8zs9[q_prev,s8,z8,s9] + model.p_endstart_prov_qsz[q_prev,s8,z8])
-                       for r in model.s_phases for s8 in model.s_sequence for z8 in model.s_season_types
-                       if ((r,)+(h,)) in params['hist_prov'].keys()) \
-                 + sum(model.v_phase_area[q,s9,p7,z9,r,l]*model.p_hist_req[r,h] for r in model.s_phases
-                       if ((r,)+(h,)) in params['hist_req'].keys())<=0
+                       for r in params['hist_prov_phases_h'].get(h, []) for s8 in model.s_sequence for z8 in model.s_season_types
+                       if pe.value(model.p_wyear_inc_qs[q_prev,s8])!=0) \
+                 + sum(model.v_phase_area[q,s9,p7,z9,r,l]*model.p_hist_req[r,h] for r in params['hist_req_phases_h'].get(h, []))<=0
         else:
             return pe.Constraint.Skip
-    model.con_rot_history_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_rotconstraints, model.s_season_types, rule=rot_history_between, doc='rotation phases constraint')
+    model.con_rot_history_between = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_rotconstraints, model.s_season_types, rule=rot_history_between, doc='rotation phases constraint')
 
 def f_con_history_within(params, model):
     '''
@@ -150,21 +150,18 @@ def f_con_history_within(params, model):
 
     '''
 
+    l_p7 = list(model.s_season_periods)
+    p7_end_gs0 = l_p7[pinp.general['i_gs_p7_end'][0]] #p7 period from growing season 0. This prov the history.
     def rot_history_within(model,q,s9,p7,l,h,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_end_gs0 = l_p7[pinp.general['i_gs_p7_end'][0]] #p7 period from growing season 0. This prov the history.
-        l_q = list(model.s_sequence_year)
-        q_prev = l_q[l_q.index(q) - 1]
         if pe.value(model.p_wyear_inc_qs[q,s9]) and pe.value(model.p_mask_season_p7z[p7,z9]) and model.p_inc_hist_gs0_con[p7,z9]:
-            return sum(model.v_phase_area[q_prev,s9,p7_end_gs0,z8,r,l]*model.p_hist_prov[r,h]
+            ##history is provided by growing season 0 of the same year (q)
+            return sum(model.v_phase_area[q,s9,p7_end_gs0,z8,r,l]*model.p_hist_prov[r,h]
                        * model.p_ancestorz_provwithinz_phase[p7_end_gs0,z8,z9]
-                       for r in model.s_phases for z8 in model.s_season_types
-                       if ((r,)+(h,)) in params['hist_prov'].keys()) \
-                 + sum(model.v_phase_area[q,s9,p7,z9,r,l]*model.p_hist_req[r,h] for r in model.s_phases
-                       if ((r,)+(h,)) in params['hist_req'].keys())<=0
+                       for r in params['hist_prov_phases_h'].get(h, []) for z8 in model.s_season_types) \
+                 + sum(model.v_phase_area[q,s9,p7,z9,r,l]*model.p_hist_req[r,h] for r in params['hist_req_phases_h'].get(h, []))<=0
         else:
             return pe.Constraint.Skip
-    model.con_rot_history_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_rotconstraints, model.s_season_types, rule=rot_history_within, doc='rotation phases constraint')
+    model.con_rot_history_within = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_rotconstraints, model.s_season_types, rule=rot_history_within, doc='rotation phases constraint')
 
 def f_phase_history4_within(model):
     '''
@@ -174,9 +171,9 @@ def f_phase_history4_within(model):
 
     Note: k is the same as h4 so just use landuse as the h4 set
     '''
+    d_p7_prev = fun.f1_position_index(list(model.s_season_periods))[1] #previous p7 - built once rather than l_p7.index() for each row
     def phase_history4_within(model,q,s,p7,l,h4,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last season period
+        p7_prev = d_p7_prev[p7] #need the activity level from last season period
         if pe.value(model.p_wyear_inc_qs[q,s]) and pe.value(model.p_mask_childz_within_phase[p7,z9]) and model.p_landuse_is_dual_h4[h4]:
             return sum(model.v_phase_area[q,s,p7,z9,r,l] * model.p_hist4_req[r,h4] \
                        - sum(model.v_phase_area[q,s,p7_prev,z8,r,l] * model.p_hist4_prov[r,h4] \
@@ -184,7 +181,7 @@ def f_phase_history4_within(model):
                        for r in model.s_phases) <= 0
         else:
             return pe.Constraint.Skip
-    model.con_phase_history4_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_landuses, model.s_season_types, rule=phase_history4_within, doc='rotation phases constraint - history4')
+    model.con_phase_history4_within = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_landuses, model.s_season_types, rule=phase_history4_within, doc='rotation phases constraint - history4')
 
 def f_phase_link_within(model):
     '''
@@ -203,9 +200,9 @@ def f_phase_link_within(model):
            parameter of v_phase_change_increase is earning money. In this situation the model would be unbounded with a less-than constraint.
 
     '''
+    d_p7_prev = fun.f1_position_index(list(model.s_season_periods))[1] #previous p7 - built once rather than l_p7.index() for each row
     def phase_link_within(model,q,s,p7,l,r,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last season period
+        p7_prev = d_p7_prev[p7] #need the activity level from last season period
         if pe.value(model.p_wyear_inc_qs[q,s]) and pe.value(model.p_mask_childz_within_phase[p7,z9]):
             return model.v_phase_area[q,s,p7,z9,r,l]  \
                    - model.v_phase_change_increase[q,s,p7,z9,r,l] * model.p_phase_can_increase[p7,z9,r] \
@@ -214,29 +211,30 @@ def f_phase_link_within(model):
                          for z8 in model.s_season_types) * model.p_phase_area_transfers[p7_prev,z9,r] == 0 #p_phase_area_transfers ensures no transfer at break of season except for dry sown phases
         else:
             return pe.Constraint.Skip
-    model.con_phase_link_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=phase_link_within, doc='rotation phases constraint')
+    model.con_phase_link_within = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=phase_link_within, doc='rotation phases constraint')
 
 def f_phase_link_between(model):
     '''
     This is the between year version of above. This is required because in the late breaks the phase from the previous
     year needs to carry over so that dry pasture and stubble can exist.
     '''
+    d_p7_prev = fun.f1_position_index(list(model.s_season_periods))[1] #previous p7 - built once rather than l_p7.index() for each row
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def phase_link_between(model,q,s9,p7,l,r,z9):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last feed period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        p7_prev = d_p7_prev[p7] #need the activity level from last feed period
+        q_prev = d_q_prev[q]
         if pe.value(model.p_wyear_inc_qs[q,s9]) and pe.value(model.p_mask_childz_between_phase[p7,z9]):
             return model.v_phase_area[q,s9,p7,z9,r,l]  \
                    - model.v_phase_change_increase[q,s9,p7,z9,r,l] * model.p_phase_can_increase[p7,z9,r] \
                    + model.v_phase_change_reduce[q,s9,p7,z9,r,l] * model.p_phase_can_reduce[r,p7,z9] \
-                   - sum(model.v_phase_area[q,s8,p7_prev,z8,r,l]
+                   - sum(model.v_phase_area[q_prev,s8,p7_prev,z8,r,l]
                          * model.p_parentz_provbetween_phase[p7_prev, z8, z9]
                          * (model.p_sequence_prov_qs8zs9[q_prev, s8, z8, s9] + model.p_endstart_prov_qsz[q_prev, s8, z8])
-                            for s8 in model.s_sequence for z8 in model.s_season_types) * model.p_phase_area_transfers[p7_prev,z9,r] \
+                            for s8 in model.s_sequence for z8 in model.s_season_types if pe.value(model.p_wyear_inc_qs[q_prev,s8])!=0) * model.p_phase_area_transfers[p7_prev,z9,r] \
                    == 0 #end of the previous yr is controlled by between constraint
         else:
             return pe.Constraint.Skip
-    model.con_phase_link_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=phase_link_between, doc='rotation phases constraint')
+    model.con_phase_link_between = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=phase_link_between, doc='rotation phases constraint')
 
 
 # def f_con_dry_link(model):
@@ -263,7 +261,7 @@ def f_phase_link_between(model):
 #                          for z8 in model.s_season_types) <= 0
 #         else:
 #             return pe.Constraint.Skip
-    # model.con_dry_link1 = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=dry_phase_link1, doc='link dry seeding between season types')
+    # model.con_dry_link1 = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=dry_phase_link1, doc='link dry seeding between season types')
 
     # #this one forces each season with the same break to have the same amount of dry seeding (by forcing the end to equal the start)
     # def dry_phase_link2(model,q,s,p7,l,r,z9):
@@ -275,7 +273,7 @@ def f_phase_link_between(model):
     #                      for z8 in model.s_season_types) <= 0
     #     else:
     #         return pe.Constraint.Skip
-    # model.con_dry_link2 = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=dry_phase_link2, doc='link dry seeding between season types')
+    # model.con_dry_link2 = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_phases, model.s_season_types, rule=dry_phase_link2, doc='link dry seeding between season types')
 
 
 
@@ -296,7 +294,7 @@ def f_con_area(model):
             return sum(model.v_phase_area[q,s,p7,z,r,l] for r in model.s_phases) <= model.p_area[l]
         else:
             return pe.Constraint.Skip
-    model.con_area = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_lmus, model.s_season_types, rule=area_rule, doc='rotation area constraint')
+    model.con_area = pe.Constraint(model.s_sequence_node, model.s_season_periods, model.s_lmus, model.s_season_types, rule=area_rule, doc='rotation area constraint')
     
 
 
@@ -10,6 +10,7 @@ import pyomo.environ as pe
 
 # AFO modules
 from . import PropertyInputs as pinp
+from . import Functions as fun
 from . import Saltbush as slp
 
 
@@ -32,14 +33,14 @@ def f1_saltbushpyomo_local(params,model):
     # variable #
     ############
 
-    model.v_slp_ha = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_lmus, bounds=(0,None),
+    model.v_slp_ha = pe.Var(model.s_sequence_node, model.s_season_types, model.s_lmus, bounds=(0,None),
                                           doc='tonnes of crop consumed by livestock in a p6 that was sown in a p5 (p5 axis tracks when the crop being grazed was sown)')
 
-    model.v_tonnes_sb_consumed = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods,
+    model.v_tonnes_sb_consumed = pe.Var(model.s_sequence_node, model.s_season_types, model.s_feed_periods,
                                         model.s_feed_pools, model.s_lmus,bounds=(0,None),
                                         doc='tonnes of saltbush consumed by livestock in a p6')
 
-    model.v_tonnes_sb_transfer = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods, model.s_lmus,
+    model.v_tonnes_sb_transfer = pe.Var(model.s_sequence_node, model.s_season_types, model.s_feed_periods, model.s_lmus,
                                           bounds=(0,None), doc='tonnes of saltbush DM transferred to next feed period')
 
     #########
@@ -104,7 +105,7 @@ def f_con_slp_area(model):
                  + model.v_slp_ha[q,s,z,l] ==0
         else:
             return pe.Constraint.Skip
-    model.con_slp_area = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_season_periods, model.s_lmus, rule=slp_area, doc='Pasture area row for growth constraint of each type on each soil for each feed period (ha)')
+    model.con_slp_area = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_season_periods, model.s_lmus, rule=slp_area, doc='Pasture area row for growth constraint of each type on each soil for each feed period (ha)')
 
 def f_con_saltbush_within(model):
     '''
@@ -113,8 +114,9 @@ def f_con_saltbush_within(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
     def saltbush_foo(model,q,s,z9,p6,l):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
         if pe.value(model.p_wyear_inc_qs[q,s]) and pe.value(model.p_mask_childz_within_fp[p6,z9]) and pinp.saltbush['i_saltbush_inc']:
             return - model.v_slp_ha[q,s,z9,l] * model.p_max_growth_per_ha[z9,p6,l] \
                     - sum(model.v_tonnes_sb_transfer[q,s,z8,p6_prev,l] * model.p_sb_transfer_provide[z8,p6_prev]
@@ -123,7 +125,7 @@ def f_con_saltbush_within(model):
                     + model.v_tonnes_sb_transfer[q,s,z9,p6,l] * 1000 <=0
         else:
             return pe.Constraint.Skip
-    model.con_saltbush_within = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods, model.s_lmus,
+    model.con_saltbush_within = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_feed_periods, model.s_lmus,
                                               rule=saltbush_foo, doc='Within seasons - saltbush feed available in each feed period')
 
 def f_con_saltbush_between(model):
@@ -133,12 +135,14 @@ def f_con_saltbush_between(model):
     '''
     ##convert feed period set to a list so it can be indexed
     l_fp = list(model.s_feed_periods)
+    d_fp_prev = fun.f1_position_index(l_fp)[1] #previous p6 - built once rather than l_fp.index() for each row
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def saltbush_foo(model,q,s9,z9,p6,l):
-        p6_prev = l_fp[l_fp.index(p6) - 1] #need the activity level from last feed period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        p6_prev = d_fp_prev[p6] #need the activity level from last feed period
+        q_prev = d_q_prev[q]
         if pe.value(model.p_wyear_inc_qs[q,s9]) and pe.value(model.p_mask_childz_between_fp[p6,z9]) and pinp.saltbush['i_saltbush_inc']:
             return - model.v_slp_ha[q,s9,z9,l] * model.p_max_growth_per_ha[z9,p6,l]  \
-                   - sum(model.v_tonnes_sb_transfer[q,s8,z8,p6_prev,l] * model.p_sb_transfer_provide[z8,p6_prev]
+                   - sum(model.v_tonnes_sb_transfer[q_prev,s8,z8,p6_prev,l] * model.p_sb_transfer_provide[z8,p6_prev]
                          * model.p_parentz_provbetween_fp[p6_prev,z8,z9]
                          * (model.p_sequence_prov_qs8zs9[q_prev,s8,z8,s9] + model.p_endstart_prov_qsz[q_prev,s8,z8])
                          for z8 in model.s_season_types for s8 in model.s_sequence if pe.value(model.p_wyear_inc_qs[q_prev,s8])!=0)  \
@@ -146,7 +150,7 @@ def f_con_saltbush_between(model):
                    + model.v_tonnes_sb_transfer[q,s9,z9,p6,l] * 1000 <=0
         else:
             return pe.Constraint.Skip
-    model.con_saltbush_between = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_feed_periods, model.s_lmus,
+    model.con_saltbush_between = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_feed_periods, model.s_lmus,
                                               rule=saltbush_foo, doc='between seasons - saltbush feed available in each feed period')
 
 
@@ -56,7 +56,7 @@ def f_season_precalcs(params, r_vals):
     ###The number of ‘z’ that are grouped together for each ‘q’
     step_zparam_q = np.power(float(len_z),len_q - 2 - index_q)  # needs to be float
     ###Only the first ‘s’ in the group is active (not masked)
-    mask_s8vars_qs8 = (index_s % step_sparam_q[:,na] == 0)
+    mask_s8vars_qs8 = zfun.f_sequence_nodes()
 
     mask_s9vars_qs9 = (index_s % np.roll(step_sparam_q[:,na],-1,axis=0) == 0)
     ## mask prov has 4 parts
@@ -107,6 +107,34 @@ def f_keys_z():
     return keys_z
 
 
+def f_sequence_nodes(keys=False):
+    '''
+    The active nodes of the season sequence tree.
+
+    Each year of the sequence (q) branches on the season types of the previous year so year q has len_z ** q nodes.
+    The node is stored in the first s of each group of len_z ** (len_q - 1 - q) sequences, the other q/s combinations
+    are not active. Variables and constraints are only built for the active nodes.
+
+    :param keys: False returns a boolean mask of the active nodes (qs). True returns a list of the (q, s) keys of the active nodes.
+    '''
+    steady_state_bool = pinp.general['steady_state'] or np.count_nonzero(pinp.general['i_mask_z']) == 1
+    if steady_state_bool:
+        len_z = 1
+    else:
+        len_z = np.count_nonzero(pinp.general['i_mask_z'])
+    len_q = pinp.general['i_len_q']
+    len_s = np.power(len_z, len_q - 1)
+    index_q = np.arange(len_q)
+    index_s = np.arange(len_s)
+    ##the number of s that are grouped together for each q - only the first s in the group is active
+    step_sparam_q = np.power(float(len_z), len_q - 1 - index_q)  # needs to be float
+    mask_node_qs = (index_s % step_sparam_q[:,na] == 0)
+    if keys:
+        q_idx, s_idx = np.nonzero(mask_node_qs)
+        return [('q%s' % q, 's%s' % s) for q, s in zip(q_idx, s_idx)]
+    return mask_node_qs
+
+
 def f_parent_z(season_start_z8, date_initiate_z8, index_z8):
     '''
     Create an association pointing at each seasons parent season
@@ -236,6 +264,18 @@ def f1_z_period_alloc(item_start=0, item_length=1, z_pos=-1, mask_z=True):
 
     from . import Periods as per #import here since periods.py imports this module.
 
+    ##the same items are allocated by multiple modules so the allocation is stored in the period registry (keyed by the item start and length)
+    item_start = np.asarray(item_start)
+    item_length = np.asarray(item_length)
+    key = ('p7_alloc', item_start.shape, item_start.dtype.str, item_start.tobytes(),
+           item_length.shape, item_length.dtype.str, item_length.tobytes(), z_pos, mask_z)
+    return per.f1_stored_period(key, lambda: f1_z_period_alloc_calc(item_start, item_length, z_pos, mask_z))
+
+
+def f1_z_period_alloc_calc(item_start, item_length, z_pos, mask_z):
+    '''Calculate the allocation of item into season periods (p7) - see f1_z_period_alloc.'''
+    from . import Periods as per #import here since periods.py imports this module.
+
     date_season_node_p7z = per.f_season_periods()
     len_p7 = date_season_node_p7z.shape[0] - 1  # minus one because end date is not a period
 
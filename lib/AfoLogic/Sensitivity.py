@@ -97,6 +97,8 @@ def create_sa():
     sav['inc_c1_variation'] = '-'               #control if price variation is on. This only effects result if risk aversion is included.
     sav['inc_risk_aversion'] = '-'              #control if risk aversion is included. Default is not included (ie utility=profit).
     sav['utility_method'] = '-'              #control which utility function is used
+    sav['inc_var_penalty'] = '-'              #control if the tiny objective penalty on all non-negative variables is included (default is included).
+    sav['inc_node_index'] = '-'              #control if variables and constraints are only built for the season sequence tree nodes (default) or every q and s.
     sav['cara_risk_coef'] = '-'              #control risk coefficient for CRRA method
     sav['crra_risk_coef'] = '-'              #control risk coefficient for CRRA method
     sav['pinp_rot'] = '-'                       #control if using the pinp rotations or the full rotation list (note full rot requires simulation inputs)
@@ -0,0 +1,78 @@
+"""
+Check that indexing the variables and constraints by the season sequence tree nodes (model.s_sequence_node) gives
+the same model as indexing by every q and s.
+
+The first trial in exp.xlsx is built and solved twice as a small multi-year DSP model (2 season types and 2 years):
+once with the node indexing (default) and once with the full q x s index (SA inc_node_index=False).
+The objective and the number of constraints should be the same. The full index only adds the inactive variables.
+
+To keep the model small enough to build twice the number of start weights and the age of the animals are reduced.
+
+Run from the top directory: python -m lib.AfoLogic.SequenceNodeTest [solver]
+
+@author: young
+"""
+import sys
+import gc
+import numpy as np
+import pyomo.environ as pe
+
+from lib.RawVersion import LoadExcelInputs as dxl
+from lib.RawVersion import LoadExp as exp
+from lib.RawVersion import RawVersionExtras as rve
+from lib.AfoLogic import AfoInit as afo
+
+###############
+#User control #
+###############
+try:
+    solver_method = sys.argv[1]
+except IndexError:  # in case no arg passed to python
+    solver_method = 'HiGHS'
+len_z = 2
+len_q = 2
+
+##load inputs and make the first trial a small multi-year DSP model
+exp_data, exp_data1, dataset, trial_pinp, total_trials = exp.f_load_experiment_data(True)
+sinp_defaults, uinp_defaults, pinp_defaults = dxl.f_load_excel_default_inputs()
+d_rot_info = dxl.f_load_phases()
+cat_propn_s1_ks2 = dxl.f_load_stubble()
+row = dataset[0]
+trial_name = exp_data.index[row][3]
+property = trial_pinp.iloc[row]
+general = pinp_defaults[property]['general_inp']
+general['steady_state'] = False
+general['i_len_q'] = len_q
+mask_z = np.zeros_like(general['i_mask_z'])
+mask_z[1:1+len_z] = True
+general['i_mask_z'] = mask_z
+sinp_defaults['stock_inp']['i_age_max'] = 3.25
+sinp_defaults['stock_inp']['i_age_max_offs'] = 3.25
+for key in ['i_w_start_len1', 'i_w_start_len3', 'i_progeny_w2_len']:
+    sinp_defaults['structuralsa_inp'][key] = 1
+
+##build and solve the model with and without the node indexing
+results = {}
+for inc_node_index in [True, False]:
+    user_sa = rve.f_process_user_sa(exp_data, row)
+    user_sa.append({"operation": 'sav', "key1": 'inc_node_index', "key2": None, "indices": None, "value": inc_node_index})
+    trial_description = f'{trial_name} inc_node_index={inc_node_index}'
+    model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info = afo.exp(solver_method, user_sa, property, trial_name, trial_description, sinp_defaults, uinp_defaults, pinp_defaults, d_rot_info, cat_propn_s1_ks2)
+    n_con = sum(len(c) for c in model.component_objects(pe.Constraint, active=True))
+    n_var = sum(len(v) for v in model.component_objects(pe.Var, active=True))
+    results[inc_node_index] = (lp_vars['utility'], profit, n_con, n_var, trial_infeasible)
+    ##free the model before building the next one
+    del model, lp_vars, r_vals
+    gc.collect()
+
+##report
+print('\n{0:>16} {1:>20} {2:>20} {3:>12} {4:>12} {5:>10}'.format('inc_node_index', 'objective', 'profit', 'constraints', 'variables', 'infeasible'))
+for inc_node_index, (obj, profit, n_con, n_var, trial_infeasible) in results.items():
+    print('{0:>16} {1:>20.4f} {2:>20.4f} {3:>12} {4:>12} {5:>10}'.format(str(inc_node_index), obj, profit, n_con, n_var, str(trial_infeasible)))
+obj_node, profit_node, n_con_node, n_var_node, infeasible_node = results[True]
+obj_full, profit_full, n_con_full, n_var_full, infeasible_full = results[False]
+same_obj = np.isclose(obj_node, obj_full, rtol=1e-6)
+same_con = n_con_node == n_con_full
+print(f'objective same: {same_obj}, constraint count same: {same_con}')
+if not (same_obj and same_con and not infeasible_node and not infeasible_full):
+    sys.exit(1)
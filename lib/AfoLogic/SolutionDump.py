@@ -0,0 +1,118 @@
+'''
+Full solution dump.
+
+Extracts the solution of every variable and constraint in the model in one pass and stores it as a single table (one
+row per variable/constraint) so it can be filtered and compared with pandas rather than searching a text file. The
+table has the following columns:
+
+    - kind: 'Var' or 'Constraint'.
+    - component: name of the pyomo component.
+    - index: index of the variable/constraint (tuple, or None if the component is not indexed).
+    - value: Var - value. Constraint - value of the body.
+    - lower/upper: Var - bounds. Constraint - lhs/rhs (nan if there is no bound).
+    - rc: reduced cost of the variable (nan for constraints or if the solver didn't return rc).
+    - lslack/uslack: slack of the constraint (inf if there is no bound, nan for variables).
+    - dual: dual of the constraint (nan for variables or if the solver didn't return duals).
+
+The table is saved as a pickle (keeps the index tuples) in SaveOutputs when the full solution is requested and can be
+rendered to the old text format with f_write_solution_txt. To render a saved solution from the command line::
+
+    python -m lib.AfoLogic.SolutionDump "Output/Solution - <trial name>.pkl"
+
+@author: young
+'''
+import sys
+import numpy as np
+import pandas as pd
+import pyomo.environ as pe
+
+cols = ['kind', 'component', 'index', 'value', 'lower', 'upper', 'rc', 'lslack', 'uslack', 'dual']
+
+
+def f1_float(values):
+    '''Array of floats from a list of values (None becomes nan).'''
+    return np.array([np.nan if x is None else x for x in values], dtype=float)
+
+
+def f_solution_df(model):
+    '''
+    Extract the solution of the model.
+
+    :param model: pyomo model (after it has been solved). rc and duals are included if the model has rc and dual suffixes.
+    :return: DataFrame with one row per variable and constraint (see module doc for the columns).
+    '''
+    rc = getattr(model, 'rc', {})
+    dual = getattr(model, 'dual', {})
+    tables = []
+    ##variables
+    for v in model.component_objects(pe.Var, active=True):
+        data = list(v.items())
+        n = len(data)
+        table = {'kind': 'Var', 'component': v.name, 'index': [i for i, _ in data],
+                 'value': f1_float([d.value for _, d in data]),
+                 'lower': f1_float([d.lb for _, d in data]), 'upper': f1_float([d.ub for _, d in data]),
+                 'rc': f1_float([rc.get(d) for _, d in data]),
+                 'lslack': np.full(n, np.nan), 'uslack': np.full(n, np.nan), 'dual': np.full(n, np.nan)}
+        tables.append(pd.DataFrame(table, columns=cols))
+    ##constraints - the body is evaluated once and the slacks are calculated from it (same as pyomo lslack/uslack)
+    for c in model.component_objects(pe.Constraint, active=True):
+        data = list(c.items())
+        n = len(data)
+        body = f1_float([pe.value(d.body, exception=False) for _, d in data])
+        lower = f1_float([d.lb for _, d in data])
+        upper = f1_float([d.ub for _, d in data])
+        table = {'kind': 'Constraint', 'component': c.name, 'index': [i for i, _ in data],
+                 'value': body, 'lower': lower, 'upper': upper, 'rc': np.full(n, np.nan),
+                 'lslack': np.where(np.isnan(lower), np.inf, body - lower),
+                 'uslack': np.where(np.isnan(upper), np.inf, upper - body),
+                 'dual': f1_float([dual.get(d) for _, d in data])}
+        tables.append(pd.DataFrame(table, columns=cols))
+    if not tables:
+        return pd.DataFrame(columns=cols)
+    return pd.concat(tables, ignore_index=True)
+
+
+def f1_lines(df, value_col, prefix):
+    '''Text line for each row of the component that has a value (same format as print(prefix, index, value)).'''
+    df = df[df[value_col].notna()]
+    return "".join([f"{prefix} {i} {x}\n" for i, x in zip(df['index'], df[value_col].tolist())])
+
+
+def f1_slack_lines(df):
+    '''Text lines for the lower and upper slack of each constraint (constraints with no slack are not included).'''
+    lines = []
+    for i, lslack, uslack in zip(df['index'], df['lslack'].tolist(), df['uslack'].tolist()):
+        if lslack != 0 and lslack != np.inf:
+            lines.append(f"  L    {i} {lslack}\n")
+        if uslack != 0 and uslack != np.inf:
+            lines.append(f"  U    {i} {uslack}\n")
+    return "".join(lines)
+
+
+def f_write_solution_txt(solution, path):
+    '''
+    Render the solution as text - rc of each variable then the slacks and duals of each constraint.
+
+    :param solution: DataFrame from f_solution_df.
+    :param path: path of the text file.
+    '''
+    variables = solution[solution['kind'] == 'Var']
+    constraints = solution[solution['kind'] == 'Constraint']
+    with open(path, 'w') as f:
+        f.write('RC\n')
+        for name, df in variables.groupby('component', sort=False):
+            f.write("Variable %s\n" % name)
+            f.write(f1_lines(df, 'rc', '      '))
+        f.write('Slacks (no entry means no slack)\n')  # this can be used in search to find the start of this in the txt file
+        for name, df in constraints.groupby('component', sort=False):
+            f.write("Constraint %s\n" % name)
+            f.write(f1_slack_lines(df))
+        f.write('Dual\n')   #this can be used in search to find the start of this in the txt file
+        for name, df in constraints.groupby('component', sort=False):
+            f.write("Constraint %s\n" % name)
+            f.write(f1_lines(df, 'dual', '      '))
+
+
+if __name__ == '__main__':
+    solution_path = sys.argv[1]
+    f_write_solution_txt(pd.read_pickle(solution_path), solution_path.rsplit('.', 1)[0] + '.txt')
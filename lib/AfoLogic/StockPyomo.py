@@ -11,6 +11,7 @@ import time
 import numpy as np
 
 #AFO modules
+from . import Functions as fun
 from . import StockGenerator as sgen
 from . import PropertyInputs as pinp
 
@@ -48,24 +49,24 @@ def f1_stockpyomo_local(params, model):
     ##  setup variables # #variables that use dynamic sets must be defined each iteration of exp
     #####################
     ##animals
-    model.v_sire = pe.Var(model.s_sequence_year, model.s_sequence, model.s_groups_sire, bounds = (0,None) , doc='number of sire animals') #assumption is that no tactical management of numbers of dams mated and hence sires across seasons so no z axis. Does need q & s axis though for multiperiod model.
-    model.v_dams = pe.Var(model.s_sequence_year, model.s_sequence, model.s_k2_birth_dams, model.s_sale_dams, model.s_dvp_dams, model.s_wean_times, model.s_nut_dams, model.s_lw_dams,
+    model.v_sire = pe.Var(model.s_sequence_node, model.s_groups_sire, bounds = (0,None) , doc='number of sire animals') #assumption is that no tactical management of numbers of dams mated and hence sires across seasons so no z axis. Does need q & s axis though for multiperiod model.
+    model.v_dams = pe.Var(model.s_sequence_node, model.s_k2_birth_dams, model.s_sale_dams, model.s_dvp_dams, model.s_wean_times, model.s_nut_dams, model.s_lw_dams,
                           model.s_season_types, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams, bounds = (0,None) , doc='number of dam animals')
-    model.v_offs = pe.Var(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_sale_offs, model.s_dvp_offs, model.s_nut_offs, model.s_lw_offs,
+    model.v_offs = pe.Var(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_sale_offs, model.s_dvp_offs, model.s_nut_offs, model.s_lw_offs,
                           model.s_season_types, model.s_tol, model.s_wean_times, model.s_gender, model.s_gen_merit_offs,
                           model.s_groups_offs, bounds = (0,None) , doc='number of offs animals')
-    model.v_prog = pe.Var(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs,
+    model.v_prog = pe.Var(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs,
                           model.s_sale_prog, model.s_lw_prog, model.s_season_types, model.s_tol, model.s_wean_times, model.s_gender,
                           model.s_groups_prog, bounds = (0,None) , doc='number of offs animals')
 
-    model.v_tradevalue = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types,
+    model.v_tradevalue = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types,
                                 bounds = (None,None) , doc='value of stock traded between seasons')
     ##purchases
-    model.v_purchase_dams = pe.Var(model.s_sequence_year, model.s_sequence, model.s_dvp_dams, model.s_lw_dams, model.s_season_types, model.s_tol, model.s_groups_dams, bounds = (0,None) , doc='number of purchased dam animals')
-    model.v_purchase_offs = pe.Var(model.s_sequence_year, model.s_sequence, model.s_dvp_offs, model.s_lw_offs, model.s_season_types, model.s_tol, model.s_groups_offs, bounds = (0,None) , doc='number of purchased offs animals')
+    model.v_purchase_dams = pe.Var(model.s_sequence_node, model.s_dvp_dams, model.s_lw_dams, model.s_season_types, model.s_tol, model.s_groups_dams, bounds = (0,None) , doc='number of purchased dam animals')
+    model.v_purchase_offs = pe.Var(model.s_sequence_node, model.s_dvp_offs, model.s_lw_offs, model.s_season_types, model.s_tol, model.s_groups_offs, bounds = (0,None) , doc='number of purchased offs animals')
 
     ##infrastructure
-    model.v_infrastructure = pe.Var(model.s_sequence_year, model.s_sequence, model.s_infrastructure, model.s_season_types, bounds=(0,None),
+    model.v_infrastructure = pe.Var(model.s_sequence_node, model.s_infrastructure, model.s_season_types, bounds=(0,None),
                                     doc='amount of infrastructure required for given animal enterprise (based on number of sheep through infra)')
 
     ######################
@@ -342,6 +343,35 @@ def f1_stockpyomo_local(params, model):
     end_params = time.time()
     # print('params time: ',end_params-param_start)
 
+    ################
+    #sparse index  #
+    ################
+    ##map each row of the core constraints to the non-zero keys of the stock params so the core constraints only loop
+    ## over the non-zero terms rather than the cartesian product of the stock sets (see fun.f1_sparse_index).
+    ##dams - row is (p6,f,z), (c1,p7,z), (c0,p7,z), (p7,z) or (p5,z)
+    model.si_mei_dams = fun.f1_sparse_index(model.p_mei_dams, (1,2,8))
+    model.si_pi_dams = fun.f1_sparse_index(model.p_pi_dams, (1,2,8))
+    model.si_cashflow_dams = fun.f1_sparse_index(model.p_cashflow_dams, (1,2,8))
+    model.si_wc_dams = fun.f1_sparse_index(model.p_wc_dams, (1,2,8))
+    model.si_cost_dams = fun.f1_sparse_index(model.p_cost_dams, (1,7))
+    model.si_asset_dams = fun.f1_sparse_index(model.p_asset_dams, (1,7))
+    model.si_lab_anyone_dams = fun.f1_sparse_index(model.p_lab_anyone_dams, (1,7))
+    model.si_lab_perm_dams = fun.f1_sparse_index(model.p_lab_perm_dams, (1,7))
+    model.si_lab_manager_dams = fun.f1_sparse_index(model.p_lab_manager_dams, (1,7))
+    ##prog - row is (c1,p7,z) or (c0,p7,z)
+    model.si_cashflow_prog = fun.f1_sparse_index(model.p_cashflow_prog, (2,3,6))
+    model.si_wc_prog = fun.f1_sparse_index(model.p_wc_prog, (2,3,6))
+    ##offs - row is (p6,f,z), (c1,p7,z), (c0,p7,z), (p7,z) or (p5,z)
+    model.si_mei_offs = fun.f1_sparse_index(model.p_mei_offs, (2,3,8))
+    model.si_pi_offs = fun.f1_sparse_index(model.p_pi_offs, (2,3,8))
+    model.si_cashflow_offs = fun.f1_sparse_index(model.p_cashflow_offs, (2,3,8))
+    model.si_wc_offs = fun.f1_sparse_index(model.p_wc_offs, (2,3,8))
+    model.si_cost_offs = fun.f1_sparse_index(model.p_cost_offs, (2,7))
+    model.si_asset_offs = fun.f1_sparse_index(model.p_asset_offs, (2,7))
+    model.si_lab_anyone_offs = fun.f1_sparse_index(model.p_lab_anyone_offs, (2,7))
+    model.si_lab_perm_offs = fun.f1_sparse_index(model.p_lab_perm_offs, (2,7))
+    model.si_lab_manager_offs = fun.f1_sparse_index(model.p_lab_manager_offs, (2,7))
+
     ########################
     #call local constraint #
     ########################
@@ -398,18 +428,21 @@ def f_con_off_withinR(model, params, l_v3, l_k3, l_k5, l_z, l_i, l_x, l_g3, l_w9
     Within year numbers/transfers of offspring to offspring in the following decision variable period.
 
     '''
+    ##position of each set element (so the numpy array can be indexed) and the previous dvp - built once rather than a list scan for each row
+    d_k3, d_k5, d_v3, d_z, d_i, d_x, d_g3, d_w9 = [fun.f1_position_index(l)[0] for l in (l_k3, l_k5, l_v3, l_z, l_i, l_x, l_g3, l_w9_offs)]
+    d_v3_prev = fun.f1_position_index(l_v3)[1]
     def offwithinR(model,q,s,k3,k5,v3,a,z9,i,x,y3,g3,w9):
-        v3_prev = l_v3[l_v3.index(v3) - 1]  #used to get the activity number from the last period
+        v3_prev = d_v3_prev[v3]  #used to get the activity number from the last period
         ##skip constraint if the require param is 0 - using the numpy array because it is 2x faster because don't need to loop through activity keys e.g. k28
         ###get the index number - required so numpy array can be indexed
-        t_k3 = l_k3.index(k3)
-        t_k5 = l_k5.index(k5)
-        t_v3 = l_v3.index(v3)
-        t_z = l_z.index(z9)
-        t_i = l_i.index(i)
-        t_x = l_x.index(x)
-        t_g3 = l_g3.index(g3)
-        t_w9 = l_w9_offs.index(w9)
+        t_k3 = d_k3[k3]
+        t_k5 = d_k5[k5]
+        t_v3 = d_v3[v3]
+        t_z = d_z[z9]
+        t_i = d_i[i]
+        t_x = d_x[x]
+        t_g3 = d_g3[g3]
+        t_w9 = d_w9[w9]
         if np.any(params['numbers_req_numpyversion_k3k5vw8zixg3w9'][t_k3,t_k5,t_v3,:,t_z,t_i,t_x,t_g3,t_w9]) \
            and pe.value(model.p_mask_childz_within_offs[k3,v3,z9,x,g3])\
            and pe.value(model.p_wyear_inc_qs[q,s]):
@@ -425,7 +458,7 @@ def f_con_off_withinR(model, params, l_v3, l_k3, l_k5, l_z, l_i, l_x, l_g3, l_w9
         else:
             return pe.Constraint.Skip
     start_con_offwithinR=time.time()
-    model.con_offwithinR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_offs, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gender,
+    model.con_offwithinR = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_offs, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gender,
                                    model.s_gen_merit_dams, model.s_groups_offs, model.s_lw_offs, rule=offwithinR, doc='transfer off to off from last dvp to current dvp.')
     end_con_offwithinR=time.time()
     # print('con_offwithinR: ',end_con_offR - start_con_offR)
@@ -435,19 +468,23 @@ def f_con_off_betweenR(model, params, l_v3, l_k3, l_k5, l_z, l_i, l_x, l_g3, l_w
     Between year numbers/transfers of offspring to offspring in the following decision variable period.
 
     '''
+    ##position of each set element (so the numpy array can be indexed) and the previous dvp - built once rather than a list scan for each row
+    d_k3, d_k5, d_v3, d_z, d_i, d_x, d_g3, d_w9 = [fun.f1_position_index(l)[0] for l in (l_k3, l_k5, l_v3, l_z, l_i, l_x, l_g3, l_w9_offs)]
+    d_v3_prev = fun.f1_position_index(l_v3)[1]
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def offbetweenR(model,q,s9,k3,k5,v3,a,z9,i,x,y3,g3,w9):
-        v3_prev = l_v3[l_v3.index(v3) - 1]  #used to get the activity number from the last period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]  #used to get the activity number from the last period
+        v3_prev = d_v3_prev[v3]  #used to get the activity number from the last period
+        q_prev = d_q_prev[q]  #used to get the activity number from the last period
         ##skip constraint if the require param is 0 - using the numpy array because it is 2x faster because don't need to loop through activity keys e.g. k28
         ###get the index number - required so numpy array can be indexed
-        t_k3 = l_k3.index(k3)
-        t_k5 = l_k5.index(k5)
-        t_v3 = l_v3.index(v3)
-        t_z = l_z.index(z9)
-        t_i = l_i.index(i)
-        t_x = l_x.index(x)
-        t_g3 = l_g3.index(g3)
-        t_w9 = l_w9_offs.index(w9)
+        t_k3 = d_k3[k3]
+        t_k5 = d_k5[k5]
+        t_v3 = d_v3[v3]
+        t_z = d_z[z9]
+        t_i = d_i[i]
+        t_x = d_x[x]
+        t_g3 = d_g3[g3]
+        t_w9 = d_w9[w9]
         if np.any(params['numbers_req_numpyversion_k3k5vw8zixg3w9'][t_k3,t_k5,t_v3,:,t_z,t_i,t_x,t_g3,t_w9]) \
            and pe.value(model.p_mask_childz_between_offs[k3,v3,z9,x,g3]) \
            and pe.value(model.p_wyear_inc_qs[q,s9]):
@@ -464,7 +501,7 @@ def f_con_off_betweenR(model, params, l_v3, l_k3, l_k5, l_z, l_i, l_x, l_g3, l_w
         else:
             return pe.Constraint.Skip
     start_con_offbetweenR=time.time()
-    model.con_offbetweenR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_offs, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gender,
+    model.con_offbetweenR = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_offs, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gender,
                                    model.s_gen_merit_dams, model.s_groups_offs, model.s_lw_offs, rule=offbetweenR, doc='transfer off to off from last dvp to current dvp.')
     end_con_offbetweenR=time.time()
     # print('con_offbetweenR: ',end_con_offR - start_con_offR)
@@ -478,18 +515,21 @@ def f_con_dam_withinR(model, params, l_v1, l_k29, l_a, l_z, l_i, l_y1, l_g9, l_w
     b) Dams to dams in the following decision variable period.
 
     '''
+    ##position of each set element (so the numpy array can be indexed) and the previous dvp - built once rather than a list scan for each row
+    d_k29, d_v1, d_a, d_z, d_i, d_y1, d_g9, d_w9 = [fun.f1_position_index(l)[0] for l in (l_k29, l_v1, l_a, l_z, l_i, l_y1, l_g9, l_w9)]
+    d_v1_prev = fun.f1_position_index(l_v1)[1]
     def damwithinR(model,q,s,k29,v1,a,z9,i,y1,g9,w9):
-        v1_prev = l_v1[l_v1.index(v1) - 1]  #used to get the activity number from the last period - to determine the number of dam provided into this period
+        v1_prev = d_v1_prev[v1]  #used to get the activity number from the last period - to determine the number of dam provided into this period
         ##skip constraint if the require param is 0 - using the numpy array because it is 2x faster because don't need to loop through activity keys e.g. k28
         ###get the index number - required so numpy array can be indexed
-        t_k29 = l_k29.index(k29)
-        t_v1 = l_v1.index(v1)
-        t_a = l_a.index(a)
-        t_z = l_z.index(z9)
-        t_i = l_i.index(i)
-        t_y1 = l_y1.index(y1)
-        t_g9 = l_g9.index(g9)
-        t_w9 = l_w9.index(w9)
+        t_k29 = d_k29[k29]
+        t_v1 = d_v1[v1]
+        t_a = d_a[a]
+        t_z = d_z[z9]
+        t_i = d_i[i]
+        t_y1 = d_y1[y1]
+        t_g9 = d_g9[g9]
+        t_w9 = d_w9[w9]
         if np.any(params['numbers_req_numpyversion_k2k2tva1nw8ziyg1g9w9'][:,t_k29,:,t_v1,t_a,:,:,t_z,t_i,t_y1,:,t_g9,t_w9])\
            and any(pe.value(model.p_mask_childz_within_dams[k28,v1,z9,g1]) for k28 in model.s_k2_birth_dams for g1 in model.s_groups_dams)\
            and pe.value(model.p_wyear_inc_qs[q,s]):
@@ -509,7 +549,7 @@ def f_con_dam_withinR(model, params, l_v1, l_k29, l_a, l_z, l_i, l_y1, l_g9, l_w
             return pe.Constraint.Skip
 
     start_con_damR=time.time()
-    model.con_dam_withinR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gen_merit_dams,
+    model.con_dam_withinR = pe.Constraint(model.s_sequence_node, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gen_merit_dams,
                                    model.s_groups_dams, model.s_lw_dams, rule=damwithinR, doc='transfer dam to dam from last dvp to current dvp.')
     end_con_damR=time.time()
     print('con_damwithinR: ',end_con_damR-start_con_damR)
@@ -524,19 +564,23 @@ def f_con_dam_betweenR(model, params, l_v1, l_k29, l_a, l_z, l_i, l_y1, l_g9, l_
 
     Note: this constraint is only active when season start is included as a dvp (e.g. not always active in steady state model).
     '''
+    ##position of each set element (so the numpy array can be indexed) and the previous dvp - built once rather than a list scan for each row
+    d_k29, d_v1, d_a, d_z, d_i, d_y1, d_g9, d_w9 = [fun.f1_position_index(l)[0] for l in (l_k29, l_v1, l_a, l_z, l_i, l_y1, l_g9, l_w9)]
+    d_v1_prev = fun.f1_position_index(l_v1)[1]
+    d_q_prev = fun.f1_position_index(list(model.s_sequence_year))[1]
     def dambetweenR(model,q,s9,k29,v1,a,z9,i,y1,g9,w9):
-        v1_prev = l_v1[l_v1.index(v1) - 1]  #used to get the activity number from the last period - to determine the number of dam provided into this period
-        q_prev = list(model.s_sequence_year)[list(model.s_sequence_year).index(q) - 1]
+        v1_prev = d_v1_prev[v1]  #used to get the activity number from the last period - to determine the number of dam provided into this period
+        q_prev = d_q_prev[q]
         ##skip constraint if the require param is 0 - using the numpy array because it is 2x faster because don't need to loop through activity keys e.g. k28
         ###get the index number - required so numpy array can be indexed
-        t_k29 = l_k29.index(k29)
-        t_v1 = l_v1.index(v1)
-        t_a = l_a.index(a)
-        t_z = l_z.index(z9)
-        t_i = l_i.index(i)
-        t_y1 = l_y1.index(y1)
-        t_g9 = l_g9.index(g9)
-        t_w9 = l_w9.index(w9)
+        t_k29 = d_k29[k29]
+        t_v1 = d_v1[v1]
+        t_a = d_a[a]
+        t_z = d_z[z9]
+        t_i = d_i[i]
+        t_y1 = d_y1[y1]
+        t_g9 = d_g9[g9]
+        t_w9 = d_w9[w9]
         if np.any(params['numbers_req_numpyversion_k2k2tva1nw8ziyg1g9w9'][:,t_k29,:,t_v1,t_a,:,:,t_z,t_i,t_y1,:,t_g9,t_w9])\
            and any(pe.value(model.p_mask_childz_between_dams[k28,v1,z9,g1]) for k28 in model.s_k2_birth_dams for g1 in model.s_groups_dams)\
            and pe.value(model.p_wyear_inc_qs[q,s9]):
@@ -557,7 +601,7 @@ def f_con_dam_betweenR(model, params, l_v1, l_k29, l_a, l_z, l_i, l_y1, l_g9, l_
         else:
             return pe.Constraint.Skip
     start_con_damR=time.time()
-    model.con_dam_betweenR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gen_merit_dams,
+    model.con_dam_betweenR = pe.Constraint(model.s_sequence_node, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_season_types, model.s_tol, model.s_gen_merit_dams,
                                    model.s_groups_dams, model.s_lw_dams, rule=dambetweenR, doc='sason start - transfer dam to dam from last dvp to current dvp.')
     end_con_damR=time.time()
     print('con_dambetweenR: ',end_con_damR-start_con_damR)
@@ -579,7 +623,7 @@ def f_con_progR(model):
         else:
             return pe.Constraint.Skip
     start_con_progR = time.time()
-    model.con_progR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_wean_times, model.s_season_types, model.s_tol,
+    model.con_progR = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_wean_times, model.s_season_types, model.s_tol,
                                     model.s_gender, model.s_gen_merit_dams, model.s_groups_dams, model.s_lw_prog, rule=progR,
                                    doc='transfer npw from dams to prog.')
     end_con_progR = time.time()
@@ -641,7 +685,7 @@ def f_con_prog2damsR(model, l_v1):
         else:
             return pe.Constraint.Skip
     start_con_prog2damsR = time.time()
-    model.con_prog2damsR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_dvp_dams, model.s_season_types, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams,
+    model.con_prog2damsR = pe.Constraint(model.s_sequence_node, model.s_dvp_dams, model.s_season_types, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams,
                                          model.s_lw_dams, rule=prog2damR, doc='transfer prog to dams in dvp 0.')
     end_con_prog2damsR = time.time()
     # print('con_prog2damsR: ',end_con_prog2damsR-start_con_prog2damsR)
@@ -663,7 +707,7 @@ def f_con_prog2offsR(model, l_v3):
         else:
             return pe.Constraint.Skip
     start_con_prog2offR = time.time()
-    model.con_prog2offsR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_dams, model.s_season_types, model.s_tol,
+    model.con_prog2offsR = pe.Constraint(model.s_sequence_node, model.s_k3_damage_offs, model.s_k5_birth_offs, model.s_dvp_dams, model.s_season_types, model.s_tol,
                                    model.s_wean_times, model.s_gender, model.s_gen_merit_dams, model.s_groups_offs, model.s_lw_offs, rule=prog2offsR,
                                    doc='transfer prog to off in dvp 0.')
     end_con_prog2offR = time.time()
@@ -686,7 +730,7 @@ def f_con_matingR(model):
                        if pe.value(model.p_nsires_req[k2,t1,v1,a,n1,w1,z,i,y1,g1,g0,p8])!=0) <=0
         else:
             return pe.Constraint.Skip
-    model.con_matingR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_groups_sire, model.s_sire_periods, rule=mating, doc='sire requirement for mating')
+    model.con_matingR = pe.Constraint(model.s_sequence_node, model.s_season_types, model.s_groups_sire, model.s_sire_periods, rule=mating, doc='sire requirement for mating')
 
 def f_con_stockinfra(model):
     '''
@@ -706,7 +750,7 @@ def f_con_stockinfra(model):
                    for a in model.s_wean_times for i in model.s_tol) <=0
         else:
             return pe.Constraint.Skip
-    model.con_stockinfra = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_infrastructure, model.s_season_types, rule=stockinfra, doc='Requirement for infrastructure (based on number of times yarded and shearing activity)')
+    model.con_stockinfra = pe.Constraint(model.s_sequence_node, model.s_infrastructure, model.s_season_types, rule=stockinfra, doc='Requirement for infrastructure (based on number of times yarded and shearing activity)')
 
 def f_con_stock_trade_profit(model):
     '''
@@ -723,28 +767,25 @@ def f_con_stock_trade_profit(model):
     '''
 
     # this could be skipped for SE model (e.g. len(model.s_season_periods)>1) but that might get confusing so for now I have left it in.
+    l_p7 = list(model.s_season_periods)
+    p7_start = l_p7[0]
+    d_p7_prev = fun.f1_position_index(l_p7)[1] #need the activity level from last period
+    si_tradevalue_dams = fun.f1_sparse_index(model.p_tradevalue_dams, (1,7))
+    si_tradevalue_offs = fun.f1_sparse_index(model.p_tradevalue_offs, (2,7))
     def stock_trade_profit(model, q, s, p7, z):
-        l_p7 = list(model.s_season_periods)
-        p7_prev = l_p7[l_p7.index(p7) - 1] #need the activity level from last period
-        p7_start = l_p7[0]
+        p7_prev = d_p7_prev[p7]
         if pe.value(model.p_wyear_inc_qs[q, s]):
             stock = sum(model.v_sire[q, s, g0] * model.p_tradevalue_sire[p7, z, g0] for g0 in model.s_groups_sire) \
-                    + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_tradevalue_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
-                              for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                              for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                              if pe.value(model.p_tradevalue_dams[k2, p7, t1, v1, a, n1, w1, z, i, y1, g1]) != 0)
-                          + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3] * model.p_tradevalue_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                                for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs
-                                for v3 in model.s_dvp_offs for n3 in model.s_nut_offs for w3 in model.s_lw_offs
-                                for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                                if pe.value(model.p_tradevalue_offs[k3, k5, p7, t3, v3, n3, w3, z, i, a, x, y3, g3]) != 0)
-                          for a in model.s_wean_times for i in model.s_tol)
+                    + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_tradevalue_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
+                          for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in si_tradevalue_dams.get((p7,z), ())) \
+                    + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3] * model.p_tradevalue_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                          for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in si_tradevalue_offs.get((p7,z), ()))
             return model.v_tradevalue[q, s, p7, z] - stock \
                    - sum(model.v_tradevalue[q,s,p7_prev,z8] * model.p_parentz_provwithin_season[p7_prev,z8,z]
                           for z8 in model.s_season_types) * (p7!=p7_start) <=0 #end doesn't carry over
         else:
             return pe.Constraint.Skip
-    model.con_stock_trade_profit = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_season_periods,
+    model.con_stock_trade_profit = pe.Constraint(model.s_sequence_node, model.s_season_periods,
                                                  model.s_season_types, rule=stock_trade_profit,
                                                  doc='Requirement for infrastructure (based on number of times yarded and shearing activity)')
 
@@ -771,15 +812,10 @@ def f_stock_me(model,q,s,p6,f,z):
     '''
 
     return sum(model.v_sire[q,s,g0] * model.p_mei_sire[p6,f,z,g0] for g0 in model.s_groups_sire)\
-           + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_mei_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                     if pe.value(model.p_mei_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_mei_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_mei_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+           + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_mei_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]
+                 for k2,_,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_mei_dams.get((p6,f,z), ()))\
+           + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_mei_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                 for k3,k5,_,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_mei_offs.get((p6,f,z), ()))
 
 
 def f_stock_pi(model,q,s,p6,f,z):
@@ -790,15 +826,10 @@ def f_stock_pi(model,q,s,p6,f,z):
     '''
 
     return sum(model.v_sire[q,s,g0] * model.p_pi_sire[p6,f,z,g0] for g0 in model.s_groups_sire)\
-           + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_pi_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                     if pe.value(model.p_pi_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_pi_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_pi_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+           + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_pi_dams[k2,p6,f,t1,v1,a,n1,w1,z,i,y1,g1]
+                 for k2,_,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_pi_dams.get((p6,f,z), ()))\
+           + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_pi_offs[k3,k5,p6,f,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                 for k3,k5,_,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_pi_offs.get((p6,f,z), ()))
 
 def f_stock_cashflow(model,q,s,p7,z,c1):
     '''
@@ -811,18 +842,12 @@ def f_stock_cashflow(model,q,s,p7,z,c1):
                          for h1 in model.s_infrastructure)
     #todo v_prog requires a y axis
     stock = sum(model.v_sire[q,s,g0] * model.p_cashflow_sire[c1,p7,z,g0] for g0 in model.s_groups_sire) \
-           + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_cashflow_dams[k2,c1,p7,t1,v1,a,n1,w1,z,i,y1,g1]
-                      for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                      for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                     if pe.value(model.p_cashflow_dams[k2,c1,p7,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_prog[q,s,k3, k5, t2, w2, z, i, a, x, g2] * model.p_cashflow_prog[k3, k5, c1,p7, t2, w2, z, i, a, x, g2]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t2 in model.s_sale_prog for w2 in model.s_lw_prog
-                      for x in model.s_gender for g2 in model.s_groups_prog if model.p_cashflow_prog[k3, k5, c1,p7, t2, w2, z, i, a, x, g2] != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_cashflow_offs[k3,k5,c1,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_cashflow_offs[k3,k5,c1,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_cashflow_dams[k2,c1,p7,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_cashflow_dams.get((c1,p7,z), ())) \
+            + sum(model.v_prog[q,s,k3, k5, t2, w2, z, i, a, x, g2] * model.p_cashflow_prog[k3, k5, c1,p7, t2, w2, z, i, a, x, g2]
+                  for k3,k5,_,_,t2,w2,_,i,a,x,g2 in model.si_cashflow_prog.get((c1,p7,z), ())) \
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_cashflow_offs[k3,k5,c1,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_cashflow_offs.get((c1,p7,z), ()))
     purchases = sum(model.v_sire[q,s,g0] * model.p_cost_purch_sire[p7,z,g0] for g0 in model.s_groups_sire)
     return stock - infrastructure - purchases
 
@@ -842,18 +867,12 @@ def f_stock_wc(model,q,s,c0,p7,z):
     infrastructure = sum(model.p_rm_stockinfra_fix_wc[h1,c0,p7,z] + model.p_rm_stockinfra_var_wc[h1,c0,p7,z] * model.v_infrastructure[q,s,h1,z]
                          for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_wc_sire[c0,p7,z,g0] for g0 in model.s_groups_sire) \
-           + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_wc_dams[k2,c0,p7,t1,v1,a,n1,w1,z,i,y1,g1]
-                      for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                      for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                     if pe.value(model.p_wc_dams[k2,c0,p7,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_prog[q,s,k3, k5, t2, w2, z, i, a, x, g2] * model.p_wc_prog[k3, k5, c0,p7, t2, w2, z, i, a, x, g2]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t2 in model.s_sale_prog for w2 in model.s_lw_prog
-                      for x in model.s_gender for g2 in model.s_groups_prog if model.p_wc_prog[k3, k5, c0,p7, t2, w2, z, i, a, x, g2] != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_wc_offs[k3,k5,c0,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_wc_offs[k3,k5,c0,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_wc_dams[k2,c0,p7,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_wc_dams.get((c0,p7,z), ())) \
+            + sum(model.v_prog[q,s,k3, k5, t2, w2, z, i, a, x, g2] * model.p_wc_prog[k3, k5, c0,p7, t2, w2, z, i, a, x, g2]
+                  for k3,k5,_,_,t2,w2,_,i,a,x,g2 in model.si_wc_prog.get((c0,p7,z), ())) \
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_wc_offs[k3,k5,c0,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_wc_offs.get((c0,p7,z), ()))
     purchases = sum(model.v_sire[q,s,g0] * model.p_wc_purch_sire[c0,p7,z,g0] for g0 in model.s_groups_sire)
     return stock - infrastructure - purchases
 
@@ -874,15 +893,10 @@ def f_stock_cost(model,q,s,p7,z):
     infrastructure = sum(model.p_rm_stockinfra_fix[h1,p7,z] + model.p_rm_stockinfra_var[h1,p7,z] * model.v_infrastructure[q,s,h1,z]
                          for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_cost_sire[p7,z,g0] for g0 in model.s_groups_sire) \
-            + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_cost_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                      if pe.value(model.p_cost_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_cost_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_cost_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_cost_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_cost_dams.get((p7,z), ())) \
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_cost_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_cost_offs.get((p7,z), ()))
     purchases = sum(model.v_sire[q,s,g0] * model.p_cost_purch_sire[p7,z,g0]
                     for g0 in model.s_groups_sire)
     return  stock + infrastructure + purchases
@@ -897,15 +911,10 @@ def f_stock_asset(model,q,s,p7,z):
 
     infrastructure = sum(model.p_asset_stockinfra[p7,h1] for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_asset_sire[p7,z,g0] for g0 in model.s_groups_sire) \
-            + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_asset_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                      if pe.value(model.p_asset_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_asset_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_asset_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_asset_dams[k2,p7,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_asset_dams.get((p7,z), ())) \
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_asset_offs[k3,k5,p7,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_asset_offs.get((p7,z), ()))
     # purchases = sum(sum(model.v_purchase_dams[q,s,v1,w1,i,g1] * sum(model.p_cost_purch_dam[v1,w1,i,g1,c] for c in model.s_season_periods) for v1 in model.s_dvp_dams for w1 in model.s_lw_dams for g1 in model.s_groups_dams)
     #                 +sum(model.v_purchase_offs[q,s,v3,w3,i,g3] * sum(model.p_cost_purch_offs[v3,w3,i,g3,c] for c in model.s_season_periods) for v3 in model.s_dvp_offs for w3 in model.s_lw_offs for g3 in model.s_groups_offs)
     return stock + infrastructure #+ purchases
@@ -920,15 +929,10 @@ def f_stock_labour_anyone(model,q,s,p5,z):
 
     # infrastructure = sum(model.p_lab_stockinfra[h1,p5] * model.v_infrastructure[h1,p5] for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_lab_anyone_sire[p5,z,g0] for g0 in model.s_groups_sire)\
-            + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_anyone_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                      if pe.value(model.p_lab_anyone_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_anyone_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_lab_anyone_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_anyone_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_lab_anyone_dams.get((p5,z), ()))\
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_anyone_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_lab_anyone_offs.get((p5,z), ()))
     return stock
 
 def f_stock_labour_perm(model,q,s,p5,z):
@@ -940,15 +944,10 @@ def f_stock_labour_perm(model,q,s,p5,z):
 
     # infrastructure = sum(model.p_lab_stockinfra[h1,p5] * model.v_infrastructure[h1,p5] for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_lab_perm_sire[p5,z,g0] for g0 in model.s_groups_sire)\
-            + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_perm_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                      if pe.value(model.p_lab_perm_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_perm_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_lab_perm_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_perm_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_lab_perm_dams.get((p5,z), ()))\
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_perm_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_lab_perm_offs.get((p5,z), ()))
     return stock
 
 def f_stock_labour_manager(model,q,s,p5,z):
@@ -960,15 +959,10 @@ def f_stock_labour_manager(model,q,s,p5,z):
 
     # infrastructure = sum(model.p_lab_stockinfra[h1,p5] * model.v_infrastructure[h1,p5] for h1 in model.s_infrastructure)
     stock = sum(model.v_sire[q,s,g0] * model.p_lab_manager_sire[p5,z,g0] for g0 in model.s_groups_sire)\
-            + sum(sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_manager_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
-                     for k2 in model.s_k2_birth_dams for t1 in model.s_sale_dams for v1 in model.s_dvp_dams for n1 in model.s_nut_dams
-                     for w1 in model.s_lw_dams for y1 in model.s_gen_merit_dams for g1 in model.s_groups_dams
-                      if pe.value(model.p_lab_manager_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]) != 0)
-                + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_manager_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
-                      for k3 in model.s_k3_damage_offs for k5 in model.s_k5_birth_offs for t3 in model.s_sale_offs for v3 in model.s_dvp_offs
-                      for n3 in model.s_nut_offs for w3 in model.s_lw_offs for x in model.s_gender for y3 in model.s_gen_merit_offs for g3 in model.s_groups_offs
-                      if pe.value(model.p_lab_manager_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]) != 0)
-               for a in model.s_wean_times for i in model.s_tol)
+            + sum(model.v_dams[q,s,k2,t1,v1,a,n1,w1,z,i,y1,g1] * model.p_lab_manager_dams[k2,p5,t1,v1,a,n1,w1,z,i,y1,g1]
+                  for k2,_,t1,v1,a,n1,w1,_,i,y1,g1 in model.si_lab_manager_dams.get((p5,z), ()))\
+            + sum(model.v_offs[q,s,k3,k5,t3,v3,n3,w3,z,i,a,x,y3,g3]  * model.p_lab_manager_offs[k3,k5,p5,t3,v3,n3,w3,z,i,a,x,y3,g3]
+                  for k3,k5,_,t3,v3,n3,w3,_,i,a,x,y3,g3 in model.si_lab_manager_offs.get((p5,z), ()))
     return stock
 #
 
@@ -1019,7 +1013,7 @@ def f_stock_labour_manager(model,q,s,p5,z):
     #         return pe.Constraint.Skip
     #     else: return con
     # start=time.time()
-    # # model.con_damR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams, model.s_lw_dams, rule=damR1, doc='transfer of off to dam and dam from last dvp to current dvp.')
+    # # model.con_damR = pe.Constraint(model.s_sequence_node, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams, model.s_lw_dams, rule=damR1, doc='transfer of off to dam and dam from last dvp to current dvp.')
     # end=time.time()
     # print('method 1: ',end-start)
 
@@ -1039,7 +1033,7 @@ def f_stock_labour_manager(model,q,s,p5,z):
     #                for t1 in model.s_sale_dams for k28 in model.s_k2_birth_dams for n1 in model.s_nut_dams for w8 in model.s_lw_dams
     #                if model.p_numbers_req_dams[k28,k29,v1,a,n1,w8,i,y1,g1,w9] !=0) <= 0
     # start=time.time()
-    # model.con_damR = pe.Constraint(model.s_sequence_year, model.s_sequence, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams, model.s_lw_dams, rule=damR2, doc='transfer of off to dam and dam from last dvp to current dvp.')
+    # model.con_damR = pe.Constraint(model.s_sequence_node, model.s_k2_birth_dams, model.s_dvp_dams, model.s_wean_times, model.s_tol, model.s_gen_merit_dams, model.s_groups_dams, model.s_lw_dams, rule=damR2, doc='transfer of off to dam and dam from last dvp to current dvp.')
     # end=time.time()
     # print('method 2: ',end-start)
 
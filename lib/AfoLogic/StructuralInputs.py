@@ -263,6 +263,19 @@ def f_landuse_sets():
     # landuse['XR'] = {'xr'}
     # landuse['PAS'] = {'A', 'AR', 'S', 'SR', 'M','T','J','U','X', 'tc', 'jc', 'uc', 'xc'}
 
+def f1_landuse_membership(landuses, sets):
+    '''
+    Boolean matrix (landuse x set) that is True if the landuse is in the landuse set. Used to match rotation phases
+    against landuse sets for all phases at once (e.g. rotation history and pasture germination).
+
+    :param landuses: array of landuses (or landuse sets e.g. history yrs) in the phases.
+    :param sets: array of the names of the landuse sets.
+    '''
+    member_k_k = np.zeros((len(landuses), len(sets)), dtype=bool)
+    for j, landuse_set in enumerate(sets):
+        member_k_k[:, j] = np.isin(landuses, list(landuse[landuse_set]))
+    return member_k_k
+
 
 #########################################################################################################################################################################################################
 #########################################################################################################################################################################################################
@@ -27,9 +27,9 @@ def f1_suppyomo_local(params, model):
     ############
     # variable #
     ############
-    model.v_buy_product = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
+    model.v_buy_product = pe.Var(model.s_sequence_node, model.s_season_periods, model.s_season_types, model.s_crops, model.s_biomass_uses, model.s_grain_pools, bounds=(0,None),
                                doc='tonnes of grain/baled product in each pool purchased for sup feeding')
-    model.v_sup_con = pe.Var(model.s_sequence_year, model.s_sequence, model.s_season_types, model.s_crops, model.s_grain_pools, model.s_feed_pools, model.s_feed_periods,
+    model.v_sup_con = pe.Var(model.s_sequence_node, model.s_season_types, model.s_crops, model.s_grain_pools, model.s_feed_pools, model.s_feed_periods,
                              bounds=(0,None), doc='tonnes of grain/baled product consumed in each pool')
 
     #########
@@ -1,41 +1,147 @@
 '''
 17/4/2021 by Michael Young
-Module to combine multiple excel documents into one.
+Module to combine multiple report documents into one.
 Useful when generating Report.xl in multiple cloud instances.
 
+Combines all the reports in the Output folder - both Excel reports (*.xlsx) and csv report folders (folders with a
+df_settings.csv, see RawVersionReportExtras.f_save_reports). Each report is read once (in parallel if multiple
+processes are used) and each table is stacked across the reports in a single concat. The table settings (index and
+col levels, sheet and start col) stored in df_settings are used to read the tables, so sheets with multiple tables
+(e.g. period_dates) are supported.
+
+To run execute this module from the AFO folder with optional args <number of processes> <output format>::
+
+    python -m lib.AfoLogic.XlCombine 4 csv
+
+The output format is either xlsx (Output/combined_file.xlsx - default) or csv (Output/combined_file folder with a
+csv for each table).
+
 Limitations:
-    1. sheets with multiple tables are not fully supported.
-    2. All excel files being combined need to be the same.
+    1. All reports being combined need to be the same (the tables and sheets in the first report are used).
+    2. Reports written before df_settings stored the sheet and start col of each table only support one table per sheet.
 '''
 
 import os
+import io
+import sys
+import shutil
+import multiprocessing
 import pandas as pd
+import openpyxl
+
+from . import ReportFunctions as rep
+from . import relativeFile
+
+
+def f_report_paths():
+    '''Paths to the reports being combined (excluding the combined report).'''
+    output_path = relativeFile.find(__file__, "../../Output", "")
+    report_paths = []
+    for file in sorted(os.listdir(output_path)):
+        path = os.path.join(output_path, file)
+        if file.startswith('~') or file.startswith('combined_file'):
+            continue
+        if file.endswith('.xlsx') or os.path.isfile(os.path.join(path, 'df_settings.csv')):
+            report_paths.append(path)
+    return report_paths
+
+
+def f_read_report(path):
+    '''
+    Read all the tables in a report.
+
+    :param path: path to an Excel report or a csv report folder.
+    :return: df_settings, dict of tables {table name: df}
+    '''
+    tables = {}
+    ##csv - each table is a separate file
+    if os.path.isdir(path):
+        df_settings = pd.read_csv(os.path.join(path, 'df_settings.csv'), index_col=0)
+        for name, settings in df_settings.iterrows():
+            tables[name] = pd.read_csv(os.path.join(path, f"{name}.csv"), index_col=list(range(settings['index'])),
+                                       header=list(range(settings['cols'])))
+        return df_settings, tables
+
+    ##excel - the workbook is loaded once and each table is parsed from it
+    report = pd.ExcelFile(path, engine='openpyxl')
+    df_settings = report.parse(sheet_name='df_settings', header=[0], index_col=[0])
+    if 'sheet' not in df_settings.columns: #reports written before the sheet and start col were stored
+        df_settings['sheet'] = df_settings.index
+        df_settings['colstart'] = 0
+    for sheet, sheet_settings in df_settings.groupby('sheet', sort=False):
+        sheet_settings = sheet_settings.sort_values('colstart')
+        l_colstart = list(sheet_settings['colstart']) + [report.book[sheet].max_column + 1] #the col after the last table
+        for t, (name, settings) in enumerate(sheet_settings.iterrows()):
+            header = list(range(settings['cols']))
+            index_col = list(range(settings['index']))
+            if len(sheet_settings) == 1:
+                tables[name] = report.parse(sheet_name=sheet, header=header, index_col=index_col)
+            else:
+                ##pandas can't select cols when there is a multi-index header so copy the cols of the table (tables
+                ## are separated by a blank col) to their own workbook and parse that.
+                table_book = openpyxl.Workbook()
+                for row in report.book[sheet].iter_rows(min_col=l_colstart[t] + 1, max_col=l_colstart[t+1] - 1, values_only=True):
+                    table_book.active.append(row)
+                buffer = io.BytesIO()
+                table_book.save(buffer)
+                tables[name] = pd.read_excel(buffer, header=header, index_col=index_col, engine='openpyxl')
+    return df_settings, tables
+
+
+def f_combine_reports(report_paths, processes=1, report_format='xlsx'):
+    '''
+    Combine the reports into one.
+
+    :param report_paths: list of paths to the reports (Excel or csv folder).
+    :param processes: number of processes used to read the reports.
+    :param report_format: xlsx or csv.
+    '''
+    ##read each report
+    processes = min(processes, multiprocessing.cpu_count(), len(report_paths))
+    if processes > 1:
+        with multiprocessing.Pool(processes=processes) as pool:
+            l_reports = pool.map(f_read_report, report_paths)
+    else:
+        l_reports = [f_read_report(path) for path in report_paths]
+
+    ##stack each table across the reports
+    df_settings = l_reports[0][0]
+    combined = {name: rep.f_stack_dfs([tables[name] for _, tables in l_reports]) for name in df_settings.index}
+
+    ##write
+    output_path = relativeFile.find(__file__, "../../Output", "combined_file")
+    if report_format == 'csv':
+        if os.path.isdir(output_path):
+            shutil.rmtree(output_path)
+        os.makedirs(output_path)
+        writer = output_path
+        df2out = rep.f_df2csv
+    else:
+        writer = pd.ExcelWriter(output_path + '.xlsx', engine='xlsxwriter')
+        df2out = rep.f_df2xl
+    combined_settings = pd.DataFrame(columns=['index', 'cols', 'sheet', 'colstart'])
+    for sheet, sheet_settings in df_settings.groupby('sheet', sort=False):
+        ###the start col of each table changes because the combined tables may have more cols
+        colstart = 0
+        for name in sheet_settings.sort_values('colstart').index:
+            df = combined[name]
+            option = 1 if len(sheet_settings) == 1 else 0 #sheets with multiple tables are not collapsed because the rows are shared
+            combined_settings = df2out(writer, df, sheet, combined_settings, colstart=colstart, option=option)
+            colstart += len(df.columns) + df.index.nlevels + 1
+    if report_format == 'csv':
+        combined_settings.to_csv(os.path.join(writer, 'df_settings.csv'))
+    else:
+        combined_settings.to_excel(writer, 'df_settings')
+        writer.save()
+
 
-import ReportFunctions as rep
-
-
-
-##gets all report files
-files = os.listdir('Output')
-excel_files=[]
-for file in files:                         # loop through Excel files
-    if not file.startswith('~') and file.endswith('.xlsx') and file!='combined_file.xlsx':
-        excel_files.append(pd.ExcelFile('Output/{0}'.format(file)))
-
-## Create a Pandas Excel writer using XlsxWriter as the engine. used to write to multiple sheets in excel
-writer = pd.ExcelWriter('Output/combined_file.xlsx',engine='xlsxwriter')
-
-##loop through sheets and combine across all excel files.
-sheets = excel_files[0].sheet_names
-df_settings = excel_files[0].parse(sheet_name = 'df_settings', header=[0], index_col=[0])
-for sheet in sheets:
-    if sheet != 'df_settings':
-        df_total = pd.DataFrame()
-        l_index = list(range(df_settings.loc[sheet, 'index'])) #gets the index columns
-        l_header = list(range(df_settings.loc[sheet, 'cols'])) #gets the header rows
-        for report in excel_files:
-            df = report.parse(sheet_name = sheet, header=l_header, index_col=l_index)
-            df_total = df_total.append(df)
-        ###write to new excel file using custom function in ReportFunctions.py
-        rep.f_df2xl(writer, df_total, sheet, option=1)
-writer.save()
\ No newline at end of file
+if __name__ == '__main__':
+    try:
+        processes = int(sys.argv[1])
+    except IndexError:  # in case no arg passed to python
+        processes = 1
+    try:
+        report_format = sys.argv[2]
+    except IndexError:  # in case no arg passed to python
+        report_format = 'xlsx'
+    f_combine_reports(f_report_paths(), processes, report_format)
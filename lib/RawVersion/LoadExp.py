@@ -23,6 +23,7 @@ from datetime import datetime
 from ..AfoLogic import Functions as fun
 from ..AfoLogic import Exceptions as exc
 from ..AfoLogic import relativeFile
+from ..AfoLogic import ResultsStore as rstore
 
 def f_read_exp(pinp_req=False):
     '''
@@ -79,7 +80,7 @@ def f_run_required(exp_data1, l_pinp):
 
     This function is also used by report.py to calculate if reports are being generated without of date data.
 
-    To trigger trial re-run delete pkl_r_vals{trial_name}.pkl.
+    To trigger trial re-run delete pkl/results_{trial_name} (or pkl/pkl_r_vals_{trial_name}.pkl for trials saved before the results store).
     '''
     ##add run cols to be populated - this gets updated during this function and stored for next time.
     ## This tracks if a trial needs to be run but doesnt get run.
@@ -133,7 +134,7 @@ def f_run_required(exp_data1, l_pinp):
     no_r_vals = []
     for trial in prev_exp.index.get_level_values(3):
         try:
-            if os.path.getmtime('pkl/pkl_exp.pkl') <= os.path.getmtime('pkl/pkl_r_vals_{0}.pkl'.format(trial)):
+            if os.path.getmtime('pkl/pkl_exp.pkl') <= rstore.f_results_mtime(trial):
                 run_last.append(True)
                 no_r_vals.append(False)
             else:
@@ -2,427 +2,491 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import shutil
+import time
+import warnings
+import pickle as pkl
 
 
 from ..AfoLogic import ReportFunctions as rfun
+from ..AfoLogic import ReportControl as rep
+from ..AfoLogic import ResultsStore as rstore
 from ..AfoLogic import relativeFile
 
 
+def f1_report_cache_key(trial_name):
+    '''
+    Key used to check if the cached reports for a trial are up-to-date. The reports are out of date if the trial has
+    been re-run (results saved), its feasibility has changed or the report code has changed.
+    '''
+    infeasible_path = relativeFile.find(__file__, "../../Output/infeasible", f"{trial_name}.txt")
+    code_paths = [rep.__file__, rfun.__file__, relativeFile.find(__file__, "../AfoLogic", "Functions.py")]
+    return (rstore.f_results_mtime(trial_name), os.path.isfile(infeasible_path)) + tuple(os.path.getmtime(path) for path in code_paths)
+
+
+def f_run_trial_reports(trial_name, report_run):
+    '''
+    Run the reports for a trial, only calculating the reports that are not already cached.
+
+    The reports from each trial are cached (pkl/pkl_reports_<trial name>.pkl) for each report in the 'Run Report' sheet
+    (e.g. run_summary). Next time the reports are run only the reports that have been turned on since (or all the
+    reports if the trial or the report code has changed) are calculated.
+
+    :param trial_name: name of the trial.
+    :param report_run: df with a bool 'Run' col for each report.
+    :return: dict of reports for the trial (the same as ReportControl.f_run_report).
+    '''
+    cache_path = relativeFile.find(__file__, "../../pkl", "pkl_reports_{0}.pkl".format(trial_name))
+    cache_key = f1_report_cache_key(trial_name)
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pkl.load(f)
+        if cache['key'] != cache_key:
+            cache = {'key': cache_key, 'reports': {}}
+    except (FileNotFoundError, EOFError, pkl.UnpicklingError):
+        cache = {'key': cache_key, 'reports': {}}
+
+    ##run the reports that are not cached - one at a time so the reports from each can be cached separately.
+    ## the intermediate results (e.g. f_stock_reshape) are shared between the reports for the trial.
+    ## if no reports are selected the infeasible report is still required (cached as None).
+    l_run = list(report_run.index[report_run.loc[:, 'Run']]) or [None]
+    l_missing = [report for report in l_run if report not in cache['reports']]
+    if l_missing:
+        lp_vars, r_vals = rfun.load_pkl(trial_name)
+        for report in l_missing:
+            report_run_single = report_run.copy()
+            report_run_single.loc[:, 'Run'] = report_run_single.index == report
+            cache['reports'][report] = rep.f_run_report(lp_vars, r_vals, report_run_single, trial_name, clear_cache=False)
+        rfun.f1_clear_trial_cache()
+        with open(cache_path, "wb") as f:
+            pkl.dump(cache, f, protocol=pkl.HIGHEST_PROTOCOL)
+
+    ##combine the reports
+    reports = {}
+    for report in l_run:
+        reports.update(cache['reports'][report])
+    return reports
+
+
 def f_create_report_dfs(non_exist_trials):
+    '''
+    Create the lists used to collect the reports from each trial. The reports are only stacked into a single df
+    (rfun.f_stack_dfs) when they are written in f_save_reports. This avoids copying the stacked df for each trial.
+    '''
     reports = {}
-    ##create empty df to stack each trial results into
-    reports["stacked_infeasible"] = pd.DataFrame().rename_axis('Trial')  # name of any infeasible trials
-    reports["stacked_non_exist"] = pd.DataFrame(non_exist_trials).rename_axis('Trial')  # name of any infeasible trials
-    reports["stacked_summary"] = pd.DataFrame()  # 1 line summary of each trial
-    reports["stacked_areasum"] = pd.DataFrame()  # area summary
-    reports["stacked_profit"] = pd.DataFrame()  # profit
-    reports["stacked_numbers_qsz"] = pd.DataFrame()  # total dse by qsz
-    reports["stacked_croparea_qsz"] = pd.DataFrame()  # total crop by qsz
-    reports["stacked_pnl"] = pd.DataFrame()  # profit and loss statement
-    reports["stacked_wc"] = pd.DataFrame()  # max bank overdraw
-    reports["stacked_penalty"] = pd.DataFrame()  # biomass penalty from seeding timeliness and crop grazing
-    reports["stacked_profitarea"] = pd.DataFrame()  # profit by land area
-    reports["stacked_feed"] = pd.DataFrame()  # feed budget
-    reports["stacked_feed2"] = pd.DataFrame()  # feed budget
-    reports["stacked_grazing"] = pd.DataFrame()  # grazing summary
-    reports["stacked_season_nodes"] = pd.DataFrame()  # season periods
-    reports["stacked_feed_periods"] = pd.DataFrame()  # feed periods
-    reports["stacked_dam_dvp_dates"] = pd.DataFrame()  # dam dvp dates
-    reports["stacked_repro_dates"] = pd.DataFrame()  # dam repro dates
-    reports["stacked_offs_dvp_dates"] = pd.DataFrame()  # offs dvp dates
-    reports["stacked_saleprice"] = pd.DataFrame()  # sale price
-    reports["stacked_salegrid_dams"] = pd.DataFrame()  # sale grid
-    reports["stacked_salegrid_yatf"] = pd.DataFrame()  # sale grid
-    reports["stacked_salegrid_offs"] = pd.DataFrame()  # sale grid
-    reports["stacked_saleage_offs"] = pd.DataFrame()  # sale grid
-    reports["stacked_salevalue_dams"] = pd.DataFrame()  # average sale value dams
-    reports["stacked_salevalue_offs"] = pd.DataFrame()  # average sale value offs
-    reports["stacked_salevalue_prog"] = pd.DataFrame()  # average sale value offs
-    reports["stacked_woolvalue_dams"] = pd.DataFrame()  # average wool value dams
-    reports["stacked_woolvalue_offs"] = pd.DataFrame()  # average wool value offs
-    reports["stacked_saledate_offs"] = pd.DataFrame()  # offs sale date
-    reports["stacked_cfw_dams"] = pd.DataFrame()  # clean fleece weight dams
-    reports["stacked_fd_dams"] = pd.DataFrame()  # fibre diameter dams
-    reports["stacked_cfw_offs"] = pd.DataFrame()  # clean fleece weight dams
-    reports["stacked_fd_offs"] = pd.DataFrame()  # fibre diameter dams
-    reports["stacked_wbe_dams"] = pd.DataFrame()  # whole body energy content dams
-    reports["stacked_wbe_offs"] = pd.DataFrame()  # whole body energy content offs
-    reports["stacked_lw_dams"] = pd.DataFrame()  # live weight dams (large array with p, e and b axis)
-    reports["stacked_ffcfw_dams"] = pd.DataFrame()  # fleece free conceptus free weight dams (large array with p, e and b axis)
-    reports["stacked_nv_dams"] = pd.DataFrame()  # diet nutritive value for dams (large array with p, e and b axis)
-    reports["stacked_ffcfw_yatf"] = pd.DataFrame()  # fleece free conceptus free weight yatf (large array with p, e and b axis)
-    reports["stacked_ffcfw_prog"] = pd.DataFrame()  # fleece free conceptus free weight prog (large array with p, e and b axis)
-    reports["stacked_ffcfw_offs"] = pd.DataFrame()  # fleece free conceptus free weight offs (large array with p, e and b axis)
-    reports["stacked_nv_offs"] = pd.DataFrame()  # diet nutritive value for offs (large array with p, e and b axis)
-    reports["stacked_weanper"] = pd.DataFrame()  # weaning percent
-    reports["stacked_scanper"] = pd.DataFrame()  # scan percent
-    reports["stacked_dry_propn"] = pd.DataFrame()  # dry ewe proportion
-    reports["stacked_lamb_survival"] = pd.DataFrame()  # lamb survival
-    reports["stacked_daily_mei_dams"] = pd.DataFrame()  # mei dams
-    reports["stacked_daily_pi_dams"] = pd.DataFrame()  # potential intake dams
-    reports["stacked_daily_mei_offs"] = pd.DataFrame()  # mei offs
-    reports["stacked_daily_pi_offs"] = pd.DataFrame()  # potential intake offs
-    reports["stacked_numbers_dams"] = pd.DataFrame()  # numbers dams
-    reports["stacked_numbers_dams_p"] = pd.DataFrame()  # numbers dams with p axis (large array)
-    reports["stacked_numbers_prog"] = pd.DataFrame()  # numbers prog
-    reports["stacked_numbers_offs"] = pd.DataFrame()  # numbers offs
-    reports["stacked_numbers_offs_p"] = pd.DataFrame()  # numbers offs with p axis (large array)
-    reports["stacked_mort_dams"] = pd.DataFrame()  # mort dams with p axis (large array)
-    reports["stacked_mort_offs"] = pd.DataFrame()  # mort offs with p axis (large array)
-    reports["stacked_dse_sire"] = pd.DataFrame()  # dse based on normal weight
-    reports["stacked_dse_dams"] = pd.DataFrame()  # dse based on normal weight
-    reports["stacked_dse_offs"] = pd.DataFrame()  # dse based on normal weight
-    reports["stacked_dse1_sire"] = pd.DataFrame()  # dse based on mei
-    reports["stacked_dse1_dams"] = pd.DataFrame()  # dse based on mei
-    reports["stacked_dse1_offs"] = pd.DataFrame()  # dse based on mei
-    reports["stacked_pgr"] = pd.DataFrame()  # pasture growth
-    reports["stacked_grnfoo"] = pd.DataFrame()  # green foo
-    reports["stacked_dryfoo"] = pd.DataFrame()  # dry foo
-    reports["stacked_napfoo"] = pd.DataFrame()  # non-arable pasture foo
-    reports["stacked_grncon"] = pd.DataFrame()  # green pasture consumed
-    reports["stacked_drycon"] = pd.DataFrame()  # dry pasture consumed
-    reports["stacked_napcon"] = pd.DataFrame()  # non-arable pasture feed consumed
-    reports["stacked_poccon"] = pd.DataFrame()  # pasture on crop paddocks feed consumed
-    reports["stacked_supcon"] = pd.DataFrame()  # supplement feed consumed
-    reports["stacked_stubcon"] = pd.DataFrame()  # stubble feed consumed
-    reports["stacked_cropcon"] = pd.DataFrame()  # crop consumed from early season crop grazing
-    reports["stacked_cropcon_available"] = pd.DataFrame()  # crop consumed from early season crop grazing
-    reports["stacked_grnnv"] = pd.DataFrame()  # NV of green pas
-    reports["stacked_grndmd"] = pd.DataFrame()  # dmd of green pas
-    reports["stacked_avegrnfoo"] = pd.DataFrame()  # Average Foo of green pas
-    reports["stacked_drynv"] = pd.DataFrame()  # NV of dry pas
-    reports["stacked_drydmd"] = pd.DataFrame()  # dmd of dry pas
-    reports["stacked_avedryfoo"] = pd.DataFrame()  # Average Foo of dry pas
-    reports["stacked_mvf"] = pd.DataFrame()  # Marginal value of feed
+    ##create a list (starting with an empty df) to collect each trial results into
+    reports["stacked_infeasible"] = [pd.DataFrame().rename_axis('Trial')]  # name of any infeasible trials
+    reports["stacked_non_exist"] = [pd.DataFrame(non_exist_trials).rename_axis('Trial')]  # name of any infeasible trials
+    reports["stacked_summary"] = [pd.DataFrame()]  # 1 line summary of each trial
+    reports["stacked_areasum"] = [pd.DataFrame()]  # area summary
+    reports["stacked_profit"] = [pd.DataFrame()]  # profit
+    reports["stacked_numbers_qsz"] = [pd.DataFrame()]  # total dse by qsz
+    reports["stacked_croparea_qsz"] = [pd.DataFrame()]  # total crop by qsz
+    reports["stacked_pnl"] = [pd.DataFrame()]  # profit and loss statement
+    reports["stacked_wc"] = [pd.DataFrame()]  # max bank overdraw
+    reports["stacked_penalty"] = [pd.DataFrame()]  # biomass penalty from seeding timeliness and crop grazing
+    reports["stacked_profitarea"] = [pd.DataFrame()]  # profit by land area
+    reports["stacked_feed"] = [pd.DataFrame()]  # feed budget
+    reports["stacked_feed2"] = [pd.DataFrame()]  # feed budget
+    reports["stacked_grazing"] = [pd.DataFrame()]  # grazing summary
+    reports["stacked_season_nodes"] = [pd.DataFrame()]  # season periods
+    reports["stacked_feed_periods"] = [pd.DataFrame()]  # feed periods
+    reports["stacked_dam_dvp_dates"] = [pd.DataFrame()]  # dam dvp dates
+    reports["stacked_repro_dates"] = [pd.DataFrame()]  # dam repro dates
+    reports["stacked_offs_dvp_dates"] = [pd.DataFrame()]  # offs dvp dates
+    reports["stacked_saleprice"] = [pd.DataFrame()]  # sale price
+    reports["stacked_salegrid_dams"] = [pd.DataFrame()]  # sale grid
+    reports["stacked_salegrid_yatf"] = [pd.DataFrame()]  # sale grid
+    reports["stacked_salegrid_offs"] = [pd.DataFrame()]  # sale grid
+    reports["stacked_saleage_offs"] = [pd.DataFrame()]  # sale grid
+    reports["stacked_salevalue_dams"] = [pd.DataFrame()]  # average sale value dams
+    reports["stacked_salevalue_offs"] = [pd.DataFrame()]  # average sale value offs
+    reports["stacked_salevalue_prog"] = [pd.DataFrame()]  # average sale value offs
+    reports["stacked_woolvalue_dams"] = [pd.DataFrame()]  # average wool value dams
+    reports["stacked_woolvalue_offs"] = [pd.DataFrame()]  # average wool value offs
+    reports["stacked_saledate_offs"] = [pd.DataFrame()]  # offs sale date
+    reports["stacked_cfw_dams"] = [pd.DataFrame()]  # clean fleece weight dams
+    reports["stacked_fd_dams"] = [pd.DataFrame()]  # fibre diameter dams
+    reports["stacked_cfw_offs"] = [pd.DataFrame()]  # clean fleece weight dams
+    reports["stacked_fd_offs"] = [pd.DataFrame()]  # fibre diameter dams
+    reports["stacked_wbe_dams"] = [pd.DataFrame()]  # whole body energy content dams
+    reports["stacked_wbe_offs"] = [pd.DataFrame()]  # whole body energy content offs
+    reports["stacked_lw_dams"] = [pd.DataFrame()]  # live weight dams (large array with p, e and b axis)
+    reports["stacked_ffcfw_dams"] = [pd.DataFrame()]  # fleece free conceptus free weight dams (large array with p, e and b axis)
+    reports["stacked_nv_dams"] = [pd.DataFrame()]  # diet nutritive value for dams (large array with p, e and b axis)
+    reports["stacked_ffcfw_yatf"] = [pd.DataFrame()]  # fleece free conceptus free weight yatf (large array with p, e and b axis)
+    reports["stacked_ffcfw_prog"] = [pd.DataFrame()]  # fleece free conceptus free weight prog (large array with p, e and b axis)
+    reports["stacked_ffcfw_offs"] = [pd.DataFrame()]  # fleece free conceptus free weight offs (large array with p, e and b axis)
+    reports["stacked_nv_offs"] = [pd.DataFrame()]  # diet nutritive value for offs (large array with p, e and b axis)
+    reports["stacked_weanper"] = [pd.DataFrame()]  # weaning percent
+    reports["stacked_scanper"] = [pd.DataFrame()]  # scan percent
+    reports["stacked_dry_propn"] = [pd.DataFrame()]  # dry ewe proportion
+    reports["stacked_lamb_survival"] = [pd.DataFrame()]  # lamb survival
+    reports["stacked_daily_mei_dams"] = [pd.DataFrame()]  # mei dams
+    reports["stacked_daily_pi_dams"] = [pd.DataFrame()]  # potential intake dams
+    reports["stacked_daily_mei_offs"] = [pd.DataFrame()]  # mei offs
+    reports["stacked_daily_pi_offs"] = [pd.DataFrame()]  # potential intake offs
+    reports["stacked_numbers_dams"] = [pd.DataFrame()]  # numbers dams
+    reports["stacked_numbers_dams_p"] = [pd.DataFrame()]  # numbers dams with p axis (large array)
+    reports["stacked_numbers_prog"] = [pd.DataFrame()]  # numbers prog
+    reports["stacked_numbers_offs"] = [pd.DataFrame()]  # numbers offs
+    reports["stacked_numbers_offs_p"] = [pd.DataFrame()]  # numbers offs with p axis (large array)
+    reports["stacked_mort_dams"] = [pd.DataFrame()]  # mort dams with p axis (large array)
+    reports["stacked_mort_offs"] = [pd.DataFrame()]  # mort offs with p axis (large array)
+    reports["stacked_dse_sire"] = [pd.DataFrame()]  # dse based on normal weight
+    reports["stacked_dse_dams"] = [pd.DataFrame()]  # dse based on normal weight
+    reports["stacked_dse_offs"] = [pd.DataFrame()]  # dse based on normal weight
+    reports["stacked_dse1_sire"] = [pd.DataFrame()]  # dse based on mei
+    reports["stacked_dse1_dams"] = [pd.DataFrame()]  # dse based on mei
+    reports["stacked_dse1_offs"] = [pd.DataFrame()]  # dse based on mei
+    reports["stacked_pgr"] = [pd.DataFrame()]  # pasture growth
+    reports["stacked_grnfoo"] = [pd.DataFrame()]  # green foo
+    reports["stacked_dryfoo"] = [pd.DataFrame()]  # dry foo
+    reports["stacked_napfoo"] = [pd.DataFrame()]  # non-arable pasture foo
+    reports["stacked_grncon"] = [pd.DataFrame()]  # green pasture consumed
+    reports["stacked_drycon"] = [pd.DataFrame()]  # dry pasture consumed
+    reports["stacked_napcon"] = [pd.DataFrame()]  # non-arable pasture feed consumed
+    reports["stacked_poccon"] = [pd.DataFrame()]  # pasture on crop paddocks feed consumed
+    reports["stacked_supcon"] = [pd.DataFrame()]  # supplement feed consumed
+    reports["stacked_stubcon"] = [pd.DataFrame()]  # stubble feed consumed
+    reports["stacked_cropcon"] = [pd.DataFrame()]  # crop consumed from early season crop grazing
+    reports["stacked_cropcon_available"] = [pd.DataFrame()]  # crop consumed from early season crop grazing
+    reports["stacked_grnnv"] = [pd.DataFrame()]  # NV of green pas
+    reports["stacked_grndmd"] = [pd.DataFrame()]  # dmd of green pas
+    reports["stacked_avegrnfoo"] = [pd.DataFrame()]  # Average Foo of green pas
+    reports["stacked_drynv"] = [pd.DataFrame()]  # NV of dry pas
+    reports["stacked_drydmd"] = [pd.DataFrame()]  # dmd of dry pas
+    reports["stacked_avedryfoo"] = [pd.DataFrame()]  # Average Foo of dry pas
+    reports["stacked_mvf"] = [pd.DataFrame()]  # Marginal value of feed
     
     return reports
 
 def f_concat_reports(stacked_reports, reports, report_run, trial_name):
-    stacked_infeasible = rfun.f_append_dfs(stacked_reports["stacked_infeasible"], reports["infeasible"])
+    stacked_reports["stacked_infeasible"].append(reports["infeasible"])
 
     if report_run.loc['run_summary', 'Run']:
         summary = pd.concat([reports["summary"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_summary"] = rfun.f_append_dfs(stacked_reports["stacked_summary"], summary)
+        stacked_reports["stacked_summary"].append(summary)
 
     if report_run.loc['run_areasum', 'Run']:
         areasum = pd.concat([reports["areasum"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_areasum"] = rfun.f_append_dfs(stacked_reports["stacked_areasum"], areasum)
+        stacked_reports["stacked_areasum"].append(areasum)
 
     if report_run.loc['run_profit', 'Run']:
         profit = pd.concat([reports["profit"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_profit"] = rfun.f_append_dfs(stacked_reports["stacked_profit"], profit)
+        stacked_reports["stacked_profit"].append(profit)
 
     if report_run.loc['run_numbers_qsz', 'Run']:
         numbers_qsz = pd.concat([reports["numbers_qsz"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_qsz"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_qsz"], numbers_qsz)
+        stacked_reports["stacked_numbers_qsz"].append(numbers_qsz)
 
     if report_run.loc['run_croparea_qsz', 'Run']:
         croparea_qsz = pd.concat([reports["croparea_qsz"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_croparea_qsz"] = rfun.f_append_dfs(stacked_reports["stacked_croparea_qsz"], croparea_qsz)
+        stacked_reports["stacked_croparea_qsz"].append(croparea_qsz)
 
     if report_run.loc['run_pnl', 'Run']:
         pnl = pd.concat([reports["pnl"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_pnl"] = rfun.f_append_dfs(stacked_reports["stacked_pnl"], pnl)
+        stacked_reports["stacked_pnl"].append(pnl)
 
     if report_run.loc['run_wc', 'Run']:
         wc = pd.concat([reports["wc"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_wc"] = rfun.f_append_dfs(stacked_reports["stacked_wc"], wc)
+        stacked_reports["stacked_wc"].append(wc)
 
     if report_run.loc['run_biomass_penalty', 'Run']:
         penalty = pd.concat([reports["penalty"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_penalty"] = rfun.f_append_dfs(stacked_reports["stacked_penalty"], penalty)
+        stacked_reports["stacked_penalty"].append(penalty)
 
     if report_run.loc['run_profitarea', 'Run']:
         profitarea = pd.concat([reports["profitarea"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_profitarea"] = rfun.f_append_dfs(stacked_reports["stacked_profitarea"], profitarea)
+        stacked_reports["stacked_profitarea"].append(profitarea)
 
     if report_run.loc['run_feedbudget', 'Run']:
         feed = pd.concat([reports["feed"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_feed"] = rfun.f_append_dfs(stacked_reports["stacked_feed"], feed)
+        stacked_reports["stacked_feed"].append(feed)
 
     if report_run.loc['run_feedbudget', 'Run']:
         feed = pd.concat([reports["feed"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_feed2"] = rfun.f_append_dfs(stacked_reports["stacked_feed2"], feed)
+        stacked_reports["stacked_feed2"].append(feed)
 
     if report_run.loc['run_feedbudget', 'Run']:
         grazing = pd.concat([reports["grazing"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_grazing"] = rfun.f_append_dfs(stacked_reports["stacked_grazing"], grazing)
+        stacked_reports["stacked_grazing"].append(grazing)
 
     if report_run.loc['run_period_dates', 'Run']:
         season_nodes = pd.concat([reports["season_nodes"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_season_nodes"] = rfun.f_append_dfs(stacked_reports["stacked_season_nodes"], season_nodes)
+        stacked_reports["stacked_season_nodes"].append(season_nodes)
 
         ###feed periods (p6)
         feed_periods = pd.concat([reports["feed_periods"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_feed_periods"] = rfun.f_append_dfs(stacked_reports["stacked_feed_periods"], feed_periods)
+        stacked_reports["stacked_feed_periods"].append(feed_periods)
 
         ###dams dvp
         dam_dvp_dates = pd.concat([reports["dam_dvp_dates"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_dam_dvp_dates"] = rfun.f_append_dfs(stacked_reports["stacked_dam_dvp_dates"], dam_dvp_dates)
+        stacked_reports["stacked_dam_dvp_dates"].append(dam_dvp_dates)
 
         ###dams repro dates
         repro_dates = pd.concat([reports["repro_dates"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_repro_dates"] = rfun.f_append_dfs(stacked_reports["stacked_repro_dates"], repro_dates)
+        stacked_reports["stacked_repro_dates"].append(repro_dates)
 
         ###offs dvp
         offs_dvp_dates = pd.concat([reports["offs_dvp_dates"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_offs_dvp_dates"] = rfun.f_append_dfs(stacked_reports["stacked_offs_dvp_dates"], offs_dvp_dates)
+        stacked_reports["stacked_offs_dvp_dates"].append(offs_dvp_dates)
 
     if report_run.loc['run_saleprice', 'Run']:
         saleprice = pd.concat([reports["saleprice"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_saleprice"] = rfun.f_append_dfs(stacked_reports["stacked_saleprice"], saleprice)
+        stacked_reports["stacked_saleprice"].append(saleprice)
 
     if report_run.loc['run_salegrid_dams', 'Run']:
         salegrid_dams = pd.concat([reports["salegrid_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salegrid_dams"] = rfun.f_append_dfs(stacked_reports["stacked_salegrid_dams"], salegrid_dams)
+        stacked_reports["stacked_salegrid_dams"].append(salegrid_dams)
 
     if report_run.loc['run_salegrid_yatf', 'Run']:
         salegrid_yatf = pd.concat([reports["salegrid_yatf"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salegrid_yatf"] = rfun.f_append_dfs(stacked_reports["stacked_salegrid_yatf"], salegrid_yatf)
+        stacked_reports["stacked_salegrid_yatf"].append(salegrid_yatf)
 
     if report_run.loc['run_salegrid_offs', 'Run']:
         salegrid_offs = pd.concat([reports["salegrid_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salegrid_offs"] = rfun.f_append_dfs(stacked_reports["stacked_salegrid_offs"], salegrid_offs)
+        stacked_reports["stacked_salegrid_offs"].append(salegrid_offs)
 
     if report_run.loc['run_saleage_offs', 'Run']:
         saleage_offs = pd.concat([reports["saleage_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_saleage_offs"] = rfun.f_append_dfs(stacked_reports["stacked_saleage_offs"], saleage_offs)
+        stacked_reports["stacked_saleage_offs"].append(saleage_offs)
 
     if report_run.loc['run_salevalue_dams', 'Run']:
         salevalue_dams = pd.concat([reports["salevalue_dams"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salevalue_dams"] = rfun.f_append_dfs(stacked_reports["stacked_salevalue_dams"], salevalue_dams)
+        stacked_reports["stacked_salevalue_dams"].append(salevalue_dams)
 
     if report_run.loc['run_salevalue_offs', 'Run']:
         salevalue_offs = pd.concat([reports["salevalue_offs"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salevalue_offs"] = rfun.f_append_dfs(stacked_reports["stacked_salevalue_offs"], salevalue_offs)
+        stacked_reports["stacked_salevalue_offs"].append(salevalue_offs)
 
     if report_run.loc['run_salevalue_prog', 'Run']:
         salevalue_prog = pd.concat([reports["salevalue_prog"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_salevalue_prog"] = rfun.f_append_dfs(stacked_reports["stacked_salevalue_prog"], salevalue_prog)
+        stacked_reports["stacked_salevalue_prog"].append(salevalue_prog)
 
     if report_run.loc['run_woolvalue_dams', 'Run']:
         woolvalue_dams = pd.concat([reports["woolvalue_dams"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_woolvalue_dams"] = rfun.f_append_dfs(stacked_reports["stacked_woolvalue_dams"], woolvalue_dams)
+        stacked_reports["stacked_woolvalue_dams"].append(woolvalue_dams)
 
     if report_run.loc['run_woolvalue_offs', 'Run']:
         woolvalue_offs = pd.concat([reports["woolvalue_offs"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_woolvalue_offs"] = rfun.f_append_dfs(stacked_reports["stacked_woolvalue_offs"], woolvalue_offs)
+        stacked_reports["stacked_woolvalue_offs"].append(woolvalue_offs)
 
     if report_run.loc['run_saledate_offs', 'Run']:
         saledate_offs = pd.concat([reports["saledate_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_saledate_offs"] = rfun.f_append_dfs(stacked_reports["stacked_saledate_offs"], saledate_offs)
+        stacked_reports["stacked_saledate_offs"].append(saledate_offs)
 
     if report_run.loc['run_cfw_dams', 'Run']:
         cfw_dams = pd.concat([reports["cfw_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_cfw_dams"] = rfun.f_append_dfs(stacked_reports["stacked_cfw_dams"], cfw_dams)
+        stacked_reports["stacked_cfw_dams"].append(cfw_dams)
 
     if report_run.loc['run_fd_dams', 'Run']:
         fd_dams = pd.concat([reports["fd_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_fd_dams"] = rfun.f_append_dfs(stacked_reports["stacked_fd_dams"], fd_dams)
+        stacked_reports["stacked_fd_dams"].append(fd_dams)
 
     if report_run.loc['run_cfw_offs', 'Run']:
         cfw_offs = pd.concat([reports["cfw_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_cfw_offs"] = rfun.f_append_dfs(stacked_reports["stacked_cfw_offs"], cfw_offs)
+        stacked_reports["stacked_cfw_offs"].append(cfw_offs)
 
     if report_run.loc['run_fd_offs', 'Run']:
         fd_offs = pd.concat([reports["fd_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_fd_offs"] = rfun.f_append_dfs(stacked_reports["stacked_fd_offs"], fd_offs)
+        stacked_reports["stacked_fd_offs"].append(fd_offs)
 
     if report_run.loc['run_wbe_dams', 'Run']:
         wbe_dams = pd.concat([reports["wbe_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_wbe_dams"] = rfun.f_append_dfs(stacked_reports["stacked_wbe_dams"], wbe_dams)
+        stacked_reports["stacked_wbe_dams"].append(wbe_dams)
 
     if report_run.loc['run_wbe_offs', 'Run']:
         wbe_offs = pd.concat([reports["wbe_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_wbe_offs"] = rfun.f_append_dfs(stacked_reports["stacked_wbe_offs"], wbe_offs)
+        stacked_reports["stacked_wbe_offs"].append(wbe_offs)
 
     if report_run.loc['run_lw_dams', 'Run']:
         lw_dams = pd.concat([reports["lw_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_lw_dams"] = rfun.f_append_dfs(stacked_reports["stacked_lw_dams"], lw_dams)
+        stacked_reports["stacked_lw_dams"].append(lw_dams)
 
     if report_run.loc['run_ffcfw_dams', 'Run']:
         ffcfw_dams = pd.concat([reports["ffcfw_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_ffcfw_dams"] = rfun.f_append_dfs(stacked_reports["stacked_ffcfw_dams"], ffcfw_dams)
+        stacked_reports["stacked_ffcfw_dams"].append(ffcfw_dams)
 
     if report_run.loc['run_nv_dams', 'Run']:
         nv_dams = pd.concat([reports["nv_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_nv_dams"] = rfun.f_append_dfs(stacked_reports["stacked_nv_dams"], nv_dams)
+        stacked_reports["stacked_nv_dams"].append(nv_dams)
 
     if report_run.loc['run_ffcfw_yatf', 'Run']:
         ffcfw_yatf = pd.concat([reports["ffcfw_yatf"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_ffcfw_yatf"] = rfun.f_append_dfs(stacked_reports["stacked_ffcfw_yatf"], ffcfw_yatf)
+        stacked_reports["stacked_ffcfw_yatf"].append(ffcfw_yatf)
 
     if report_run.loc['run_ffcfw_prog', 'Run']:
         ffcfw_prog = pd.concat([reports["ffcfw_prog"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_ffcfw_prog"] = rfun.f_append_dfs(stacked_reports["stacked_ffcfw_prog"], ffcfw_prog)
+        stacked_reports["stacked_ffcfw_prog"].append(ffcfw_prog)
 
     if report_run.loc['run_ffcfw_offs', 'Run']:
         ffcfw_offs = pd.concat([reports["ffcfw_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_ffcfw_offs"] = rfun.f_append_dfs(stacked_reports["stacked_ffcfw_offs"], ffcfw_offs)
+        stacked_reports["stacked_ffcfw_offs"].append(ffcfw_offs)
 
     if report_run.loc['run_nv_offs', 'Run']:
         nv_offs = pd.concat([reports["nv_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_nv_offs"] = rfun.f_append_dfs(stacked_reports["stacked_nv_offs"], nv_offs)
+        stacked_reports["stacked_nv_offs"].append(nv_offs)
 
     if report_run.loc['run_lamb_survival', 'Run']:
         lamb_survival = pd.concat([reports["lamb_survival"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_lamb_survival"] = rfun.f_append_dfs(stacked_reports["stacked_lamb_survival"], lamb_survival)
+        stacked_reports["stacked_lamb_survival"].append(lamb_survival)
 
     if report_run.loc['run_weanper', 'Run']:
         weanper = pd.concat([reports["weanper"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_weanper"] = rfun.f_append_dfs(stacked_reports["stacked_weanper"], weanper)
+        stacked_reports["stacked_weanper"].append(weanper)
 
     if report_run.loc['run_scanper', 'Run']:
         scanper = pd.concat([reports["scanper"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_scanper"] = rfun.f_append_dfs(stacked_reports["stacked_scanper"], scanper)
+        stacked_reports["stacked_scanper"].append(scanper)
 
     if report_run.loc['run_dry_propn', 'Run']:
         dry_propn = pd.concat([reports["dry_propn"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_dry_propn"] = rfun.f_append_dfs(stacked_reports["stacked_dry_propn"], dry_propn)
+        stacked_reports["stacked_dry_propn"].append(dry_propn)
 
     if report_run.loc['run_daily_mei_dams', 'Run']:
         daily_mei_dams = pd.concat([reports["daily_mei_dams"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_daily_mei_dams"] = rfun.f_append_dfs(stacked_reports["stacked_daily_mei_dams"], daily_mei_dams)
+        stacked_reports["stacked_daily_mei_dams"].append(daily_mei_dams)
 
     if report_run.loc['run_daily_pi_dams', 'Run']:
         daily_pi_dams = pd.concat([reports["daily_pi_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_daily_pi_dams"] = rfun.f_append_dfs(stacked_reports["stacked_daily_pi_dams"], daily_pi_dams)
+        stacked_reports["stacked_daily_pi_dams"].append(daily_pi_dams)
 
     if report_run.loc['run_daily_mei_offs', 'Run']:
         daily_mei_offs = pd.concat([reports["daily_mei_offs"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_daily_mei_offs"] = rfun.f_append_dfs(stacked_reports["stacked_daily_mei_offs"], daily_mei_offs)
+        stacked_reports["stacked_daily_mei_offs"].append(daily_mei_offs)
 
     if report_run.loc['run_daily_pi_offs', 'Run']:
         daily_pi_offs = pd.concat([reports["daily_pi_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_daily_pi_offs"] = rfun.f_append_dfs(stacked_reports["stacked_daily_pi_offs"], daily_pi_offs)
+        stacked_reports["stacked_daily_pi_offs"].append(daily_pi_offs)
 
     if report_run.loc['run_numbers_dams', 'Run']:
         numbers_dams = pd.concat([reports["numbers_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_dams"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_dams"], numbers_dams)
+        stacked_reports["stacked_numbers_dams"].append(numbers_dams)
 
     if report_run.loc['run_numbers_dams_p', 'Run']:
         numbers_dams_p = pd.concat([reports["numbers_dams_p"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_dams_p"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_dams_p"], numbers_dams_p)
+        stacked_reports["stacked_numbers_dams_p"].append(numbers_dams_p)
 
     if report_run.loc['run_numbers_prog', 'Run']:
         numbers_prog = pd.concat([reports["numbers_prog"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_prog"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_prog"], numbers_prog)
+        stacked_reports["stacked_numbers_prog"].append(numbers_prog)
 
     if report_run.loc['run_numbers_offs', 'Run']:
         numbers_offs = pd.concat([reports["numbers_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_offs"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_offs"], numbers_offs)
+        stacked_reports["stacked_numbers_offs"].append(numbers_offs)
     if report_run.loc['run_numbers_offs_p', 'Run']:
         numbers_offs_p = pd.concat([reports["numbers_offs_p"]], keys=[trial_name],
                                    names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_numbers_offs_p"] = rfun.f_append_dfs(stacked_reports["stacked_numbers_offs_p"], numbers_offs_p)
+        stacked_reports["stacked_numbers_offs_p"].append(numbers_offs_p)
 
     if report_run.loc['run_mort_dams', 'Run']:
         mort_dams = pd.concat([reports["mort_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_mort_dams"] = rfun.f_append_dfs(stacked_reports["stacked_mort_dams"], mort_dams)
+        stacked_reports["stacked_mort_dams"].append(mort_dams)
 
     if report_run.loc['run_mort_offs', 'Run']:
         mort_offs = pd.concat([reports["mort_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_mort_offs"] = rfun.f_append_dfs(stacked_reports["stacked_mort_offs"], mort_offs)
+        stacked_reports["stacked_mort_offs"].append(mort_offs)
 
     if report_run.loc['run_dse', 'Run']:
         dse_sire = pd.concat([reports["dse_sire"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
         dse_dams = pd.concat([reports["dse_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
         dse_offs = pd.concat([reports["dse_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_dse_sire"] = rfun.f_append_dfs(stacked_reports["stacked_dse_sire"], dse_sire)
-        stacked_reports["stacked_dse_dams"] = rfun.f_append_dfs(stacked_reports["stacked_dse_dams"], dse_dams)
-        stacked_reports["stacked_dse_offs"] = rfun.f_append_dfs(stacked_reports["stacked_dse_offs"], dse_offs)
+        stacked_reports["stacked_dse_sire"].append(dse_sire)
+        stacked_reports["stacked_dse_dams"].append(dse_dams)
+        stacked_reports["stacked_dse_offs"].append(dse_offs)
 
         dse1_sire = pd.concat([reports["dse1_sire"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
         dse1_dams = pd.concat([reports["dse1_dams"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
         dse1_offs = pd.concat([reports["dse1_offs"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_dse1_sire"] = rfun.f_append_dfs(stacked_reports["stacked_dse1_sire"], dse1_sire)
-        stacked_reports["stacked_dse1_dams"] = rfun.f_append_dfs(stacked_reports["stacked_dse1_dams"], dse1_dams)
-        stacked_reports["stacked_dse1_offs"] = rfun.f_append_dfs(stacked_reports["stacked_dse1_offs"], dse1_offs)
+        stacked_reports["stacked_dse1_sire"].append(dse1_sire)
+        stacked_reports["stacked_dse1_dams"].append(dse1_dams)
+        stacked_reports["stacked_dse1_offs"].append(dse1_offs)
 
     if report_run.loc['run_grnfoo', 'Run']:
         grnfoo = pd.concat([reports["grnfoo"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_grnfoo"] = rfun.f_append_dfs(stacked_reports["stacked_grnfoo"], grnfoo)
+        stacked_reports["stacked_grnfoo"].append(grnfoo)
 
     if report_run.loc['run_pgr', 'Run']:
         pgr = pd.concat([reports["pgr"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_pgr"] = rfun.f_append_dfs(stacked_reports["stacked_pgr"], pgr)
+        stacked_reports["stacked_pgr"].append(pgr)
 
     if report_run.loc['run_dryfoo', 'Run']:
         dryfoo = pd.concat([reports["dryfoo"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_dryfoo"] = rfun.f_append_dfs(stacked_reports["stacked_dryfoo"], dryfoo)
+        stacked_reports["stacked_dryfoo"].append(dryfoo)
 
     if report_run.loc['run_napfoo', 'Run']:
         napfoo = pd.concat([reports["napfoo"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_napfoo"] = rfun.f_append_dfs(stacked_reports["stacked_napfoo"], napfoo)
+        stacked_reports["stacked_napfoo"].append(napfoo)
 
     if report_run.loc['run_grncon', 'Run']:
         grncon = pd.concat([reports["grncon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_grncon"] = rfun.f_append_dfs(stacked_reports["stacked_grncon"], grncon)
+        stacked_reports["stacked_grncon"].append(grncon)
 
     if report_run.loc['run_drycon', 'Run']:
         drycon = pd.concat([reports["drycon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_drycon"] = rfun.f_append_dfs(stacked_reports["stacked_drycon"], drycon)
+        stacked_reports["stacked_drycon"].append(drycon)
 
     if report_run.loc['run_grnnv', 'Run']:
         grnnv = pd.concat([reports["grnnv"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_grnnv"] = rfun.f_append_dfs(stacked_reports["stacked_grnnv"], grnnv)
+        stacked_reports["stacked_grnnv"].append(grnnv)
 
     if report_run.loc['run_grndmd', 'Run']:
         grndmd = pd.concat([reports["grndmd"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_grndmd"] = rfun.f_append_dfs(stacked_reports["stacked_grndmd"], grndmd)
+        stacked_reports["stacked_grndmd"].append(grndmd)
 
     if report_run.loc['run_avegrnfoo', 'Run']:
         grnfoo = pd.concat([reports["grnfoo"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_avegrnfoo"] = rfun.f_append_dfs(stacked_reports["stacked_avegrnfoo"], grnfoo)
+        stacked_reports["stacked_avegrnfoo"].append(grnfoo)
 
     if report_run.loc['run_drynv', 'Run']:
         drynv = pd.concat([reports["drynv"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_drynv"] = rfun.f_append_dfs(stacked_reports["stacked_drynv"], drynv)
+        stacked_reports["stacked_drynv"].append(drynv)
 
     if report_run.loc['run_drydmd', 'Run']:
         drydmd = pd.concat([reports["drydmd"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_drydmd"] = rfun.f_append_dfs(stacked_reports["stacked_drydmd"], drydmd)
+        stacked_reports["stacked_drydmd"].append(drydmd)
 
     if report_run.loc['run_avedryfoo', 'Run']:
         dryfoo = pd.concat([reports["dryfoo"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_avedryfoo"] = rfun.f_append_dfs(stacked_reports["stacked_avedryfoo"], dryfoo)
+        stacked_reports["stacked_avedryfoo"].append(dryfoo)
 
     if report_run.loc['run_napcon', 'Run']:
         napcon = pd.concat([reports["napcon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_napcon"] = rfun.f_append_dfs(stacked_reports["stacked_napcon"], napcon)
+        stacked_reports["stacked_napcon"].append(napcon)
 
     if report_run.loc['run_poccon', 'Run']:
         poccon = pd.concat([reports["poccon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_poccon"] = rfun.f_append_dfs(stacked_reports["stacked_poccon"], poccon)
+        stacked_reports["stacked_poccon"].append(poccon)
 
     if report_run.loc['run_supcon', 'Run']:
         supcon = pd.concat([reports["supcon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_supcon"] = rfun.f_append_dfs(stacked_reports["stacked_supcon"], supcon)
+        stacked_reports["stacked_supcon"].append(supcon)
 
     if report_run.loc['run_stubcon', 'Run']:
         stubcon = pd.concat([reports["stubcon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_stubcon"] = rfun.f_append_dfs(stacked_reports["stacked_stubcon"], stubcon)
+        stacked_reports["stacked_stubcon"].append(stubcon)
 
     if report_run.loc['run_cropcon', 'Run']:
         cropcon = pd.concat([reports["cropcon"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_cropcon"] = rfun.f_append_dfs(stacked_reports["stacked_cropcon"], cropcon)
+        stacked_reports["stacked_cropcon"].append(cropcon)
 
     if report_run.loc['run_cropcon', 'Run']:
         cropcon_available = pd.concat([reports["cropcon_available"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_cropcon_available"] = rfun.f_append_dfs(stacked_reports["stacked_cropcon_available"], cropcon_available)
+        stacked_reports["stacked_cropcon_available"].append(cropcon_available)
 
     if report_run.loc['run_mvf', 'Run']:
         mvf = pd.concat([reports["mvf"]], keys=[trial_name], names=['Trial'])  # add trial name as index level
-        stacked_reports["stacked_mvf"] = rfun.f_append_dfs(stacked_reports["stacked_mvf"], mvf)
+        stacked_reports["stacked_mvf"].append(mvf)
     
     return stacked_reports
 
@@ -430,25 +494,46 @@ def f_save_reports(report_run, reports, processor):
     ####################################
     #run between trial reports and save#
     ####################################
-    print("Writing to Excel")
-    ##first check that Excel is not open (Microsoft puts a lock on files, so they can't be updated from elsewhere while open)
-    report_file_path = relativeFile.find(__file__, "../../Output", "Report{0}.xlsx".format(processor))
-    if os.path.isfile(report_file_path): #to check if report.xl exists
-        while True:   # repeat until the try statement succeeds
+    ##stack the reports from each trial - done once here rather than each trial
+    reports = {report: rfun.f_stack_dfs(dfs) for report, dfs in reports.items()}
+
+    ##determine the output format
+    ### xlsx: Report{processor}.xlsx with a sheet for each report.
+    ### csv: folder Report{processor} with a csv for each report (headless - much quicker for big experiments). Excel can be made later with XlCombine.
+    ### the default is xlsx if the reports are run without args (i.e. interactively) and csv if args are passed (i.e. batch run)
+    try:
+        report_format = sys.argv[5]
+    except IndexError:  # in case no arg passed to python
+        report_format = 'csv' if len(sys.argv) > 1 else 'xlsx'
+
+    if report_format == 'csv':
+        print("Writing to csv")
+        report_file_path = relativeFile.find(__file__, "../../Output", "Report{0}".format(processor))
+        if os.path.isdir(report_file_path):
+            shutil.rmtree(report_file_path)
+        os.makedirs(report_file_path)
+        writer = report_file_path
+        df2out = rfun.f_df2csv
+    else:
+        print("Writing to Excel")
+        ##check that Excel is not open (Microsoft puts a lock on files, so they can't be updated from elsewhere while open)
+        ##if it is open write to a new file rather than waiting for the user
+        report_file_path = relativeFile.find(__file__, "../../Output", "Report{0}.xlsx".format(processor))
+        if os.path.isfile(report_file_path): #to check if report.xl exists
             try:
-                myfile = open(report_file_path,"w") # chucks an error if Excel file is open
-                break                             # exit the loop
+                open(report_file_path,"a").close() # chucks an error if Excel file is open
             except IOError:
-                input("Could not open file! Please close Excel. Press Enter to retry.")
-                # restart the loop
+                report_file_path = relativeFile.find(__file__, "../../Output", "Report{0} {1}.xlsx".format(processor, time.strftime('%Y%m%d-%H%M%S')))
+                warnings.warn("Report{0}.xlsx is open. Reports saved to {1}".format(processor, report_file_path))
 
-    ## Create a Pandas Excel writer using XlsxWriter as the engine. used to write to multiple sheets in Excel
-    writer = pd.ExcelWriter(report_file_path, engine='xlsxwriter')
+        ## Create a Pandas Excel writer using XlsxWriter as the engine. used to write to multiple sheets in Excel
+        writer = pd.ExcelWriter(report_file_path, engine='xlsxwriter')
+        df2out = rfun.f_df2xl
 
     ##make empty df to store row and col index settings. Used when combining multiple report.xl
-    df_settings = pd.DataFrame(columns=['index', 'cols'])
+    df_settings = pd.DataFrame(columns=['index', 'cols', 'sheet', 'colstart'])
 
-    ##write to excel
+    ##write reports
     ###determine the method of reporting rows and columns that are all zeros
     ### mode 0: df straight into Excel
     ### mode 1: df into Excel - collapsing rows/cols that contain only 0's.
@@ -458,171 +543,174 @@ def f_save_reports(report_run, reports, processor):
     except IndexError:  # in case no arg passed to python
         xl_display_mode = 1 #default is to collapse rows/cols that are all 0's (ie they exist in Excel but are hidden)
 
-    df_settings = rfun.f_df2xl(writer, reports["stacked_infeasible"], 'infeasible', df_settings, option=xl_display_mode)
-    df_settings = rfun.f_df2xl(writer, reports["stacked_non_exist"],'Non-exist',df_settings,option=0,colstart=0)
+    df_settings = df2out(writer, reports["stacked_infeasible"], 'infeasible', df_settings, option=xl_display_mode)
+    df_settings = df2out(writer, reports["stacked_non_exist"],'Non-exist',df_settings,option=0,colstart=0)
     if report_run.loc['run_summary', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_summary"], 'summary', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_summary"], 'summary', df_settings, option=xl_display_mode)
     if report_run.loc['run_areasum', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_areasum"], 'areasum', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_areasum"], 'areasum', df_settings, option=xl_display_mode)
     if report_run.loc['run_profit', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_profit"], 'profit', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_profit"], 'profit', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_qsz', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_qsz"], 'numbers_qsz', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_qsz"], 'numbers_qsz', df_settings, option=xl_display_mode)
     if report_run.loc['run_croparea_qsz', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_croparea_qsz"], 'croparea_qsz', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_croparea_qsz"], 'croparea_qsz', df_settings, option=xl_display_mode)
     if report_run.loc['run_pnl', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_pnl"], 'pnl', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_pnl"], 'pnl', df_settings, option=xl_display_mode)
     if report_run.loc['run_wc', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_wc"], 'wc', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_wc"], 'wc', df_settings, option=xl_display_mode)
     if report_run.loc['run_biomass_penalty', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_penalty"], 'biomass_penalty', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_penalty"], 'biomass_penalty', df_settings, option=xl_display_mode)
     if report_run.loc['run_profitarea', 'Run']:
         plot = rfun.f_xy_graph(reports["stacked_profitarea"])
         plot.savefig('Output/profitarea_curve.png')
     if report_run.loc['run_feedbudget', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_feed"], 'feed budget', df_settings, option=xl_display_mode)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_feed2"], 'feed budget total', df_settings, option=xl_display_mode)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_grazing"], 'grazing summary', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_feed"], 'feed budget', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_feed2"], 'feed budget total', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_grazing"], 'grazing summary', df_settings, option=xl_display_mode)
     if report_run.loc['run_period_dates', 'Run']:
         fp_start_col = len(reports["stacked_season_nodes"].columns) + reports["stacked_season_nodes"].index.nlevels + 1
         dam_dvp_start_col = fp_start_col + len(reports["stacked_feed_periods"].columns) + reports["stacked_feed_periods"].index.nlevels + 1
         repro_start_col = dam_dvp_start_col + len(reports["stacked_dam_dvp_dates"].columns) + reports["stacked_dam_dvp_dates"].index.nlevels + 1
         offs_start_col = repro_start_col + len(reports["stacked_repro_dates"].columns) + reports["stacked_repro_dates"].index.nlevels + 1
-        df_settings = rfun.f_df2xl(writer, reports["stacked_season_nodes"], 'period_dates', df_settings, option=0, colstart=0)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_feed_periods"], 'period_dates', df_settings, option=0, colstart=fp_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dam_dvp_dates"], 'period_dates', df_settings, option=0, colstart=dam_dvp_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_repro_dates"], 'period_dates', df_settings, option=0, colstart=repro_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_offs_dvp_dates"], 'period_dates', df_settings, option=0, colstart=offs_start_col)
+        df_settings = df2out(writer, reports["stacked_season_nodes"], 'period_dates', df_settings, option=0, colstart=0)
+        df_settings = df2out(writer, reports["stacked_feed_periods"], 'period_dates', df_settings, option=0, colstart=fp_start_col)
+        df_settings = df2out(writer, reports["stacked_dam_dvp_dates"], 'period_dates', df_settings, option=0, colstart=dam_dvp_start_col)
+        df_settings = df2out(writer, reports["stacked_repro_dates"], 'period_dates', df_settings, option=0, colstart=repro_start_col)
+        df_settings = df2out(writer, reports["stacked_offs_dvp_dates"], 'period_dates', df_settings, option=0, colstart=offs_start_col)
     if report_run.loc['run_saleprice', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_saleprice"], 'saleprice', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_saleprice"], 'saleprice', df_settings, option=xl_display_mode)
     if report_run.loc['run_salegrid_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salegrid_dams"], 'salegrid_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salegrid_dams"], 'salegrid_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_salegrid_yatf', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salegrid_yatf"], 'salegrid_yatf', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salegrid_yatf"], 'salegrid_yatf', df_settings, option=xl_display_mode)
     if report_run.loc['run_salegrid_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salegrid_offs"], 'salegrid_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salegrid_offs"], 'salegrid_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_saleage_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_saleage_offs"], 'saleage_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_saleage_offs"], 'saleage_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_salevalue_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salevalue_offs"], 'salevalue_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salevalue_offs"], 'salevalue_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_salevalue_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salevalue_dams"], 'salevalue_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salevalue_dams"], 'salevalue_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_salevalue_prog', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_salevalue_prog"], 'salevalue_prog', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_salevalue_prog"], 'salevalue_prog', df_settings, option=xl_display_mode)
     if report_run.loc['run_woolvalue_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_woolvalue_offs"], 'woolvalue_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_woolvalue_offs"], 'woolvalue_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_woolvalue_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_woolvalue_dams"], 'woolvalue_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_woolvalue_dams"], 'woolvalue_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_saledate_offs', 'Run']:
         reports["stacked_saledate_offs"] = reports["stacked_saledate_offs"].astype(object)
         reports["stacked_saledate_offs"][reports["stacked_saledate_offs"]==np.datetime64('1970-01-01')] = 0
-        df_settings = rfun.f_df2xl(writer, reports["stacked_saledate_offs"], 'saledate_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_saledate_offs"], 'saledate_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_cfw_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_cfw_dams"], 'cfw_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_cfw_dams"], 'cfw_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_fd_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_fd_dams"], 'fd_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_fd_dams"], 'fd_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_cfw_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_cfw_offs"], 'cfw_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_cfw_offs"], 'cfw_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_fd_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_fd_offs"], 'fd_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_fd_offs"], 'fd_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_wbe_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_wbe_dams"], 'wbe_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_wbe_dams"], 'wbe_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_wbe_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_wbe_offs"], 'wbe_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_wbe_offs"], 'wbe_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_lw_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_lw_dams"], 'lw_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_lw_dams"], 'lw_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_ffcfw_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_ffcfw_dams"], 'ffcfw_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_ffcfw_dams"], 'ffcfw_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_ffcfw_yatf', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_ffcfw_yatf"], 'ffcfw_yatf', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_ffcfw_yatf"], 'ffcfw_yatf', df_settings, option=xl_display_mode)
     if report_run.loc['run_nv_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_nv_dams"], 'nv_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_nv_dams"], 'nv_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_ffcfw_prog', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_ffcfw_prog"], 'ffcfw_prog', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_ffcfw_prog"], 'ffcfw_prog', df_settings, option=xl_display_mode)
     if report_run.loc['run_ffcfw_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_ffcfw_offs"], 'ffcfw_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_ffcfw_offs"], 'ffcfw_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_nv_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_nv_offs"], 'nv_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_nv_offs"], 'nv_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_lamb_survival', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_lamb_survival"], 'lamb_survival', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_lamb_survival"], 'lamb_survival', df_settings, option=xl_display_mode)
     if report_run.loc['run_weanper', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_weanper"], 'wean_per', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_weanper"], 'wean_per', df_settings, option=xl_display_mode)
     if report_run.loc['run_scanper', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_scanper"], 'scan_per', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_scanper"], 'scan_per', df_settings, option=xl_display_mode)
     if report_run.loc['run_dry_propn', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dry_propn"], 'dry_propn', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_dry_propn"], 'dry_propn', df_settings, option=xl_display_mode)
     if report_run.loc['run_daily_mei_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_daily_mei_dams"], 'daily_mei_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_daily_mei_dams"], 'daily_mei_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_daily_pi_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_daily_pi_dams"], 'daily_pi_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_daily_pi_dams"], 'daily_pi_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_daily_mei_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_daily_mei_offs"], 'daily_mei_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_daily_mei_offs"], 'daily_mei_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_daily_pi_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_daily_pi_offs"], 'daily_pi_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_daily_pi_offs"], 'daily_pi_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_dams"], 'numbers_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_dams"], 'numbers_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_dams_p', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_dams_p"], 'numbers_dams_p', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_dams_p"], 'numbers_dams_p', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_prog', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_prog"], 'numbers_prog', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_prog"], 'numbers_prog', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_offs"], 'numbers_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_offs"], 'numbers_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_numbers_offs_p', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_numbers_offs_p"], 'numbers_offs_p', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_numbers_offs_p"], 'numbers_offs_p', df_settings, option=xl_display_mode)
     if report_run.loc['run_mort_dams', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_mort_dams"], 'mort_dams', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_mort_dams"], 'mort_dams', df_settings, option=xl_display_mode)
     if report_run.loc['run_mort_offs', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_mort_offs"], 'mort_offs', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_mort_offs"], 'mort_offs', df_settings, option=xl_display_mode)
     if report_run.loc['run_dse', 'Run']:
         dams_start_col = len(reports["stacked_dse_sire"].columns) + reports["stacked_dse_sire"].index.nlevels + 1
         offs_start_col = dams_start_col + len(reports["stacked_dse_dams"].columns) + reports["stacked_dse_dams"].index.nlevels + 1
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse_sire"], 'dse_wt', df_settings, option=0, colstart=0)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse_dams"], 'dse_wt', df_settings, option=0, colstart=dams_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse_offs"], 'dse_wt', df_settings, option=0, colstart=offs_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse1_sire"], 'dse_mei', df_settings, option=0, colstart=0)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse1_dams"], 'dse_mei', df_settings, option=0, colstart=dams_start_col)
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dse1_offs"], 'dse_mei', df_settings, option=0, colstart=offs_start_col)
+        df_settings = df2out(writer, reports["stacked_dse_sire"], 'dse_wt', df_settings, option=0, colstart=0)
+        df_settings = df2out(writer, reports["stacked_dse_dams"], 'dse_wt', df_settings, option=0, colstart=dams_start_col)
+        df_settings = df2out(writer, reports["stacked_dse_offs"], 'dse_wt', df_settings, option=0, colstart=offs_start_col)
+        df_settings = df2out(writer, reports["stacked_dse1_sire"], 'dse_mei', df_settings, option=0, colstart=0)
+        df_settings = df2out(writer, reports["stacked_dse1_dams"], 'dse_mei', df_settings, option=0, colstart=dams_start_col)
+        df_settings = df2out(writer, reports["stacked_dse1_offs"], 'dse_mei', df_settings, option=0, colstart=offs_start_col)
     if report_run.loc['run_pgr', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_pgr"], 'Total pg', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_pgr"], 'Total pg', df_settings, option=xl_display_mode)
     if report_run.loc['run_grnfoo', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_grnfoo"], 'grnfoo', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_grnfoo"], 'grnfoo', df_settings, option=xl_display_mode)
     if report_run.loc['run_dryfoo', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_dryfoo"], 'dryfoo', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_dryfoo"], 'dryfoo', df_settings, option=xl_display_mode)
     if report_run.loc['run_napfoo', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_napfoo"], 'napfoo', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_napfoo"], 'napfoo', df_settings, option=xl_display_mode)
     if report_run.loc['run_grnnv', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_grnnv"], 'grnnv', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_grnnv"], 'grnnv', df_settings, option=xl_display_mode)
     if report_run.loc['run_grndmd', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_grndmd"], 'grndmd', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_grndmd"], 'grndmd', df_settings, option=xl_display_mode)
     if report_run.loc['run_avegrnfoo', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_avegrnfoo"], 'avegrnfoo', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_avegrnfoo"], 'avegrnfoo', df_settings, option=xl_display_mode)
     if report_run.loc['run_drynv', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_drynv"], 'drynv', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_drynv"], 'drynv', df_settings, option=xl_display_mode)
     if report_run.loc['run_drydmd', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_drydmd"], 'drydmd', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_drydmd"], 'drydmd', df_settings, option=xl_display_mode)
     if report_run.loc['run_avedryfoo', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_avedryfoo"], 'avedryfoo', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_avedryfoo"], 'avedryfoo', df_settings, option=xl_display_mode)
     if report_run.loc['run_grncon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_grncon"], 'grncon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_grncon"], 'grncon', df_settings, option=xl_display_mode)
     if report_run.loc['run_drycon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_drycon"], 'drycon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_drycon"], 'drycon', df_settings, option=xl_display_mode)
     if report_run.loc['run_napcon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_napcon"], 'napcon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_napcon"], 'napcon', df_settings, option=xl_display_mode)
     if report_run.loc['run_poccon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_poccon"], 'poccon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_poccon"], 'poccon', df_settings, option=xl_display_mode)
     if report_run.loc['run_supcon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_supcon"], 'supcon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_supcon"], 'supcon', df_settings, option=xl_display_mode)
     if report_run.loc['run_stubcon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_stubcon"], 'stubcon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_stubcon"], 'stubcon', df_settings, option=xl_display_mode)
     if report_run.loc['run_cropcon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_cropcon"], 'cropcon', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_cropcon"], 'cropcon', df_settings, option=xl_display_mode)
     if report_run.loc['run_cropcon', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_cropcon_available"], 'cropcon_avail', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_cropcon_available"], 'cropcon_avail', df_settings, option=xl_display_mode)
     if report_run.loc['run_mvf', 'Run']:
-        df_settings = rfun.f_df2xl(writer, reports["stacked_mvf"], 'mvf', df_settings, option=xl_display_mode)
+        df_settings = df2out(writer, reports["stacked_mvf"], 'mvf', df_settings, option=xl_display_mode)
 
 
-    df_settings.to_excel(writer, 'df_settings')
-    writer.save()
+    if report_format == 'csv':
+        df_settings.to_csv(os.path.join(writer, 'df_settings.csv'))
+    else:
+        df_settings.to_excel(writer, 'df_settings')
+        writer.save()
 
     print("Report complete. Processor: {0}".format(processor))
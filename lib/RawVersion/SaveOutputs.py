@@ -9,10 +9,13 @@ import warnings
 from ..AfoLogic import Functions as fun
 from ..AfoLogic import PropertyInputs as pinp
 from ..AfoLogic import FeedSupplyStock as fsstk
+from ..AfoLogic import ModelSize as msize
+from ..AfoLogic import ResultsStore as rstore
+from ..AfoLogic import SolutionDump as sdump
 from ..AfoLogic import relativeFile
 from lib.RawVersion import LoadExcelInputs as dxl
 
-def f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info):
+def f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasible, lp_vars, r_vals, pkl_fs_info, d_rot_info, write_model_size=False, write_solution_txt=False):
     ##check Output folders exist for outputs. If not create.
     output_path = relativeFile.find(__file__, "../../Output", "")
     output_infeasible_path = relativeFile.find(__file__, "../../Output/infeasible", "")
@@ -29,6 +32,10 @@ def f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasi
     ##This writes variable summary each iteration with generic file name - it is overwritten each iteration and is created so the run progress can be monitored
     fun.write_variablesummary(model, row, exp_data, profit, 1, property_id=pinp.general['i_property_id'])
 
+    ##write the size and construction time of each model component if requested - compare trials with ModelSize.f_diff_model_size
+    if write_model_size:
+        msize.f_model_size(model).to_csv('Output/Model size - %s.csv' %trial_name)
+
     ##check if user wants full solution
     if exp_data.index[row][1] == True and not trial_infeasible:
         ##make lp file
@@ -37,50 +44,20 @@ def f_save_trial_outputs(exp_data, row, trial_name, model, profit, trial_infeasi
         ##This writes variable summary for full solution (same file as the temporary version created above)
         fun.write_variablesummary(model, row, exp_data, profit, property_id=pinp.general['i_property_id'])
 
-        ##prints what you see from pprint to txt file - you can see the slack on constraints but not the rc or dual
-        with open('Output/Full model - %s.txt' %trial_name, 'w') as f:  #file name has to have capital
-            f.write("My description of the instance!\n")
-            model.display(ostream=f)
-
-        ##write rc, duals and slacks to txt file. Duals are slow to write so that option must be turn on
-        write_duals = True
-        with open('Output/Rc Slacks and Duals - %s.txt' %trial_name,'w') as f:  #file name has to have capital
-            f.write('RC\n')
-            for v in model.component_objects(pe.Var, active=True):
-                f.write("Variable %s\n" %v)
-                for index in v:
-                    try: #in case variable has no index
-                        print("      ", index, model.rc[v[index]], file=f)
-                    except: pass
-            f.write('Slacks (no entry means no slack)\n')  # this can be used in search to find the start of this in the txt file
-            for c in model.component_objects(pe.Constraint,active=True):
-                f.write("Constraint %s\n" % c)
-                for index in c:
-                    if c[index].lslack() != 0 and c[index].lslack() != np.inf:
-                        print("  L   ",index,c[index].lslack(),file=f)
-                    if c[index].uslack() != 0 and c[index].lslack() != np.inf:
-                        print("  U   ",index,c[index].uslack(),file=f)
-            if write_duals:
-                f.write('Dual\n')   #this can be used in search to find the start of this in the txt file
-                for c in model.component_objects(pe.Constraint, active=True):
-                    f.write("Constraint %s\n" %c)
-                    for index in c:
-                        print("      ", index, model.dual[c[index]], file=f)
-
-    ##pickle lp info
-    pkl_lp_vars_path = relativeFile.find(__file__, "../../pkl", "pkl_lp_vars_{0}.pkl".format(trial_name))
-    with open(pkl_lp_vars_path, "wb") as f:
-        pkl.dump(lp_vars,f,protocol=pkl.HIGHEST_PROTOCOL)
+        ##write the value, rc, slack and dual of every variable and constraint to one table (see SolutionDump).
+        ## The text version is optional (write_solution_txt) because it is much larger and slower to write than the table.
+        solution = sdump.f_solution_df(model)
+        solution.to_pickle('Output/Solution - %s.pkl' %trial_name)  #file name has to have capital
+        if write_solution_txt:
+            sdump.f_write_solution_txt(solution, 'Output/Rc Slacks and Duals - %s.txt' %trial_name)
 
     ##call function to store optimal feedsupply - do this before r_vals since completion of r_vals trigger successful completion.
     ###Note: A feed supply optimisation can not be carried out with Exp1.py because the trials aren't carried out sequentially
     fsstk.f1_pkl_feedsupply(lp_vars,r_vals,pkl_fs_info)
 
-    ##pickle report values - every time a trial is run (even if pyomo not run)
+    ##save lp info and report values - every time a trial is run (even if pyomo not run)
     ## This has to be last because it controls if the trial needs to be run next time the exp is run (f_run_required)
-    pkl_r_vals_path = relativeFile.find(__file__, "../../pkl", "pkl_r_vals_{0}.pkl".format(trial_name))
-    with open(pkl_r_vals_path, "wb") as f:
-        pkl.dump(r_vals,f,protocol=pkl.HIGHEST_PROTOCOL)
+    rstore.f_save_results(trial_name, lp_vars, r_vals)
 
 
     ############################################################################################################################################################################################